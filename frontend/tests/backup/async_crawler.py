@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Asyncio crawl engine for the skincare scrapers
+Keeps many page fetches in flight at once, optionally capping concurrent requests per host;
+request pacing is left to the session's per-host rate limiter. The caps hold across every crawl
+running on one engine, so sources streamed side by side share them
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class AsyncCrawlEngine:
+    """Runs blocking fetch+parse callables concurrently on an asyncio event loop.
+    At most `concurrency` fetches run at once over all the engine's crawls and streams, and at most
+    `per_host_concurrency` of them against one host; the latter defaults to `concurrency`, so a
+    single-host crawl can use every slot."""
+
+    def __init__(self, concurrency: int = 8, per_host_concurrency: Optional[int] = None):
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency or self.concurrency)
+        # Thread-level slots, since every crawl runs its own event loop in its own thread
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, fetch: Callable[[str], Optional[Any]], url: str) -> Optional[Any]:
+        # The host slot is taken first, so a fetch waiting for its host holds no engine slot
+        host = urlparse(url).netloc
+        with self._lock:
+            host_slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host_concurrency))
+        with host_slot, self._slots:
+            return fetch(url)
+
+    def crawl(self, urls: Iterable[str], fetch: Callable[[str], Optional[Any]],
+              limit: Optional[int] = None) -> List[Any]:
+        """Fetch every URL with `fetch` and return the non-empty results in completion order"""
+        return list(self.stream(urls, fetch, limit))
+
+    def stream(self, urls: Iterable[str], fetch: Callable[[str], Optional[Any]],
+               limit: Optional[int] = None, buffer_size: int = 32) -> Iterator[Any]:
+        """Yield non-empty results as they complete; at most `buffer_size` wait unconsumed"""
+        urls = list(urls)
+        if not urls:
+            return
+        results: queue.Queue = queue.Queue(maxsize=buffer_size)
+        stopped = threading.Event()
+
+        def emit(result: Any) -> bool:
+            # Blocks while the consumer is behind, which holds back the crawl (backpressure)
+            while not stopped.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run() -> None:
+            try:
+                asyncio.run(self._crawl(urls, fetch, limit, emit))
+            except Exception as e:
+                logger.error(f"Crawl engine failed: {e}")
+            finally:
+                emit(_DONE)
+
+        thread = threading.Thread(target=run, name='crawl-engine', daemon=True)
+        thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            # Also reached when the consumer stops early: let the crawl wind down
+            stopped.set()
+
+    async def _crawl(self, urls: List[str], fetch: Callable[[str], Optional[Any]],
+                     limit: Optional[int], emit: Callable[[Any], bool]) -> None:
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue()
+        for url in urls:
+            pending.put_nowait(url)
+
+        emitted = 0
+        stop = False
+
+        async def worker() -> None:
+            nonlocal emitted, stop
+            while not pending.empty() and not stop:
+                url = pending.get_nowait()
+                try:
+                    result = await loop.run_in_executor(executor, self._fetch, fetch, url)
+                except Exception as e:
+                    logger.error(f"Error crawling {url}: {e}")
+                    continue
+                if not result or stop:
+                    continue
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    stop = True
+                if not await loop.run_in_executor(None, emit, result):
+                    stop = True
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            workers = [asyncio.create_task(worker())
+                       for _ in range(min(self.concurrency, len(urls)))]
+            await asyncio.gather(*workers)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+HTML parser micro-benchmark
+Times every installed parsing backend on saved INCIDecoder/Sephora/Ulta pages, running the same
+lookups the scrapers make, so the fastest parser can be chosen per source with --parser;
+BeautifulSoup parsers are also timed with partial parsing ("/partial")
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from html_parser import Regions, available_parsers, parse_html, product_regions
+from rate_limiter import host_key
+
+SOURCES = ('incidecoder', 'sephora', 'ulta')
+
+
+def _incidecoder_lookups(soup) -> None:
+    soup.find('h1')
+    soup.find('a', href=re.compile(r'/brands/'))
+    soup.find_all('a', href=re.compile(r'/products/'))
+    soup.select('div#ingredients a[href*="/ingredients/"]')
+
+
+def _sephora_lookups(soup) -> None:
+    soup.find('span', {'data-at': 'product_name'}) or soup.find('h1')
+    soup.find('span', {'data-at': 'brand_name'}) or soup.find('a', href=re.compile(r'/brand/'))
+    soup.find('span', {'data-at': 'price'})
+    soup.find('div', {'data-at': 'product_description'})
+    soup.find_all('a', href=re.compile(r'/product/'))
+
+
+def _ulta_lookups(soup) -> None:
+    soup.find('h1') or soup.find('span', {'class': 'ProductDetail__title'})
+    soup.find('a', href=re.compile(r'/brand/')) or soup.find('span', {'class': 'ProductDetail__brand'})
+    soup.find('span', {'class': 'ProductPricing__price'})
+    soup.find_all('a', href=re.compile(r'/product/'))
+
+
+LOOKUPS = {
+    'incidecoder': _incidecoder_lookups,
+    'sephora': _sephora_lookups,
+    'ulta': _ulta_lookups,
+}
+
+
+def _source_for(name: str) -> str:
+    for source in SOURCES:
+        if source in name:
+            return source
+    return ''
+
+
+def load_saved_pages(pages_dir: str) -> Dict[str, List[bytes]]:
+    """Saved pages from a directory of HTML files named after their source, e.g. sephora_serum.html"""
+    pages: Dict[str, List[bytes]] = {}
+    for filename in sorted(os.listdir(pages_dir)):
+        source = _source_for(filename.lower())
+        if source and filename.lower().endswith(('.html', '.htm')):
+            with open(os.path.join(pages_dir, filename), 'rb') as f:
+                pages.setdefault(source, []).append(f.read())
+    return pages
+
+
+def load_cached_pages(cache_dir: str) -> Dict[str, List[bytes]]:
+    """Saved pages from the scrapers' persistent HTTP cache"""
+    pages: Dict[str, List[bytes]] = {}
+    db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'))
+    try:
+        rows = db.execute("SELECT url, file FROM entries").fetchall()
+    finally:
+        db.close()
+    for url, filename in rows:
+        source = _source_for(host_key(url))
+        if not source:
+            continue
+        try:
+            with open(os.path.join(cache_dir, filename), 'rb') as f:
+                pages.setdefault(source, []).append(f.read())
+        except OSError:
+            continue
+    return pages
+
+
+def variants(parsers: List[str]) -> List[Tuple[str, str, Optional[Regions]]]:
+    """(label, parser, regions) for every parser, plus partial parsing for the BeautifulSoup ones"""
+    full = [(parser, parser, None) for parser in parsers]
+    partial = [(f'{parser}/partial', parser, product_regions) for parser in parsers if parser != 'selectolax']
+    return full + partial
+
+
+def benchmark(pages: Dict[str, List[bytes]], parsers: List[str], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Mean milliseconds per page (parse + lookups) for each source and parser variant"""
+    results: Dict[str, Dict[str, float]] = {}
+    for source, bodies in pages.items():
+        lookups = LOOKUPS[source]
+        for label, parser, regions in variants(parsers):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for body in bodies:
+                    lookups(parse_html(body, parser, regions))
+            elapsed = time.perf_counter() - start
+            results.setdefault(source, {})[label] = elapsed * 1000 / (repeat * len(bodies))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parsers on saved pages')
+    parser.add_argument('--pages-dir',
+                       help='Directory of saved HTML pages named after their source (e.g. ulta_cleanser.html)')
+    parser.add_argument('--cache-dir', default='.http_cache',
+                       help='HTTP cache directory to read saved pages from when --pages-dir is not given')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Times each page is parsed per parser')
+    args = parser.parse_args()
+
+    pages = load_saved_pages(args.pages_dir) if args.pages_dir else load_cached_pages(args.cache_dir)
+    if not pages:
+        print("No saved INCIDecoder, Sephora or Ulta pages found")
+        return
+
+    parsers = available_parsers()
+    results = benchmark(pages, parsers, args.repeat)
+    labels = [label for label, _, _ in variants(parsers)]
+
+    print("=" * 60)
+    print("HTML PARSER BENCHMARK (ms per page, parse + lookups)")
+    print("=" * 60)
+    print(f"{'source':<14}{'pages':>6}" + ''.join(f"{label:>21}" for label in labels))
+    for source, timings in results.items():
+        row = ''.join(f"{timings[label]:>21.2f}" for label in labels)
+        print(f"{source:<14}{len(pages[source]):>6}{row}")
+        fastest = min(timings, key=timings.get)
+        print(f"  fastest: {fastest}")
+
+
+if __name__ == "__main__":
+    main()
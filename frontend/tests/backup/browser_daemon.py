@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Long-lived headless Chrome for the enhanced scraper
+Starts browsers that outlive a scraper run so runs attach to them over the DevTools port instead
+of cold-starting Chrome, and caches the chromedriver path so startup needs no network lookup
+
+Usage:
+    python browser_daemon.py start --browsers 2
+    python enhanced_scraper.py --attach-daemon ...
+    python browser_daemon.py stop
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = '.browser_daemon.json'
+DEFAULT_DRIVER_CACHE = '.chromedriver_path.json'
+DEFAULT_PORT = 9222
+
+CHROME_CANDIDATES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+
+
+def cached_driver_path(cache_file: str = DEFAULT_DRIVER_CACHE, refresh: bool = False) -> str:
+    """Path of the chromedriver binary, resolved with webdriver_manager only when the cached
+    path is missing, gone from disk, or a refresh is forced (e.g. after a Chrome update)"""
+    if not refresh:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                path = json.load(f)['path']
+            if os.path.exists(path):
+                return path
+        except (OSError, ValueError, KeyError):
+            pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+    except OSError as e:
+        logger.warning(f"Could not cache chromedriver path: {e}")
+    return path
+
+
+def find_chrome() -> Optional[str]:
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def is_alive(port: int) -> bool:
+    """Whether a browser answers on the DevTools port"""
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/json/version', timeout=0.5) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def _read_state(state_file: str) -> List[Dict]:
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('browsers', [])
+    except (OSError, ValueError):
+        return []
+
+
+def daemon_addresses(state_file: str = DEFAULT_STATE_FILE) -> List[str]:
+    """DevTools addresses of the daemon's browsers that are still running"""
+    return [f"127.0.0.1:{browser['port']}" for browser in _read_state(state_file) if is_alive(browser['port'])]
+
+
+def start(browsers: int = 2, port: int = DEFAULT_PORT, state_file: str = DEFAULT_STATE_FILE,
+          chrome: Optional[str] = None) -> List[Dict]:
+    """Launch headless browsers on consecutive DevTools ports and record them in the state file"""
+    running = [browser for browser in _read_state(state_file) if is_alive(browser['port'])]
+    if running:
+        logger.info(f"{len(running)} browsers already running")
+        return running
+
+    chrome = chrome or find_chrome()
+    if not chrome:
+        raise RuntimeError("Chrome not found; pass --chrome with the browser binary")
+
+    started = []
+    for index in range(browsers):
+        browser_port = port + index
+        profile = tempfile.mkdtemp(prefix='scraper-chrome-')
+        command = [
+            chrome, '--headless=new', f'--remote-debugging-port={browser_port}', f'--user-data-dir={profile}',
+            '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1920,1080',
+            '--no-first-run', '--no-default-browser-check', 'about:blank',
+        ]
+        # Detach so the browsers survive the shell that started them
+        if os.name == 'nt':
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       start_new_session=True)
+        started.append({'port': browser_port, 'pid': process.pid, 'profile': profile})
+
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline and not all(is_alive(browser['port']) for browser in started):
+        time.sleep(0.2)
+
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump({'browsers': started}, f, indent=2)
+    logger.info(f"Started {len(started)} browsers on ports {port}-{port + browsers - 1}")
+    return started
+
+
+def stop(state_file: str = DEFAULT_STATE_FILE) -> int:
+    """Terminate the daemon's browsers and remove their profiles and the state file"""
+    browsers = _read_state(state_file)
+    for browser in browsers:
+        try:
+            os.kill(browser['pid'], signal.SIGTERM)
+        except OSError:
+            pass
+        shutil.rmtree(browser.get('profile', ''), ignore_errors=True)
+    try:
+        os.remove(state_file)
+    except OSError:
+        pass
+    return len(browsers)
+
+
+def use_own_tab(driver) -> None:
+    """Give a session attached to a daemon browser its own tab, closed again when the session
+    quits, so several sessions can share one browser without navigating each other's pages"""
+    driver.switch_to.new_window('tab')
+    quit_session = driver.quit
+
+    def quit():
+        try:
+            driver.close()
+        except Exception:
+            pass
+        quit_session()
+
+    driver.quit = quit
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Persistent headless Chrome for the enhanced scraper')
+    parser.add_argument('command', choices=['start', 'stop', 'status'])
+    parser.add_argument('--browsers', type=int, default=2,
+                       help='Number of browsers to keep running (match --drivers)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help='DevTools port of the first browser')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE,
+                       help='File recording the running browsers')
+    parser.add_argument('--chrome', help='Chrome binary (found on PATH by default)')
+    parser.add_argument('--driver-cache', default=DEFAULT_DRIVER_CACHE,
+                       help='File caching the chromedriver path')
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        start(args.browsers, args.port, args.state_file, args.chrome)
+        # Resolve the driver path now so scraper runs never need the network for it
+        print(f"chromedriver: {cached_driver_path(args.driver_cache)}")
+    elif args.command == 'stop':
+        print(f"Stopped {stop(args.state_file)} browsers")
+    else:
+        addresses = daemon_addresses(args.state_file)
+        print(f"{len(addresses)} browsers running" + (f": {', '.join(addresses)}" if addresses else ""))
+        sys.exit(0 if addresses else 1)
+
+
+if __name__ == "__main__":
+    main()
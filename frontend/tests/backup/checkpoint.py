@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for long scraper runs
+Scraped-but-not-ingested products and completed sources are appended to a local JSONL journal,
+so a run that dies halfway can be resumed with --resume instead of starting from zero
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from crawl_frontier import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointJournal:
+    """Append-only journal of scraped products, ingested products and finished sources"""
+
+    def __init__(self, path: str = 'scraper_checkpoint.jsonl', flush_every: int = 10,
+                 flush_interval: float = 30.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        # Terminate a torn final line left by a crash so new entries start on their own line
+        if self._file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def _append(self, entry: Dict, force: bool = False) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._unflushed += 1
+            due = (self._unflushed >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if force or due:
+                self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds the lock
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def _read(self) -> List[Dict]:
+        with self._lock:
+            self._file.flush()
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A crash can leave a torn final line behind
+                    logger.warning("Skipping truncated checkpoint entry")
+        return entries
+
+    def record_scraped(self, source: str, product: Dict) -> None:
+        self._append({'type': 'scraped', 'source': source, 'key': content_hash(product), 'product': product})
+
+    def record_ingested(self, product: Dict) -> None:
+        # Flushed immediately: a lost ingest marker would mean a duplicate insert on resume
+        self._append({'type': 'ingested', 'key': content_hash(product)}, force=True)
+
+    def record_source_done(self, source: str) -> None:
+        self._append({'type': 'source_done', 'source': source}, force=True)
+
+    def _pending_entries(self) -> List[Dict]:
+        scraped: Dict[str, Dict] = {}
+        for entry in self._read():
+            if entry['type'] == 'scraped':
+                scraped[entry['key']] = entry
+            elif entry['type'] == 'ingested':
+                scraped.pop(entry['key'], None)
+        return list(scraped.values())
+
+    def pending(self) -> List[Dict]:
+        """Products that were scraped but never ingested"""
+        return [entry['product'] for entry in self._pending_entries()]
+
+    def completed_sources(self) -> Set[str]:
+        return {entry['source'] for entry in self._read() if entry['type'] == 'source_done'}
+
+    def reset(self) -> None:
+        """Start a fresh journal for a new run"""
+        with self._lock:
+            self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._unflushed = 0
+
+    def compact(self) -> int:
+        """Rewrite the journal with only the products still waiting for ingestion; returns how many"""
+        pending = self._pending_entries()
+        self.reset()
+        for entry in pending:
+            self._append(entry)
+        with self._lock:
+            self._flush()
+        return len(pending)
+
+    def finish(self) -> None:
+        """Compact the journal at the end of a run, warning about products left un-ingested"""
+        pending = self.compact()
+        if pending:
+            logger.warning(f"{pending} products were not ingested; the next run will retry them")
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+
+def checkpointed(journal: Optional[CheckpointJournal], source: str, scrape_product):
+    """Wrap a product scrape function so every scraped product is journaled as soon as it exists.
+    Journal entries that a crash loses before they are flushed cost a re-fetch, not the product:
+    the frontier only marks a URL done after the product's ingested entry is flushed."""
+    if journal is None:
+        return scrape_product
+
+    def journaled(url: str) -> Optional[Dict]:
+        product = scrape_product(url)
+        if product:
+            journal.record_scraped(source, product)
+        return product
+
+    return journaled
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Retry backoff and per-host circuit breakers for the scraper session
+Throttled responses (429/503) are retried after Retry-After or a jittered exponential backoff;
+a host that keeps throttling gets its circuit opened, so requests to it fail fast for a cooldown
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from rate_limiter import host_key
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 503)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(OSError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff: uniform between 0 and min(cap, base * 2**attempt)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Failure state of one host. Opens after `threshold` consecutive failures, then lets a single
+    probe through once the cooldown ends; each re-open doubles the cooldown up to `max_cooldown`."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0, max_cooldown: float = 900.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+
+    def allow(self, now: float) -> bool:
+        if self.state == OPEN and now >= self.opened_until:
+            self.state = HALF_OPEN
+            return True
+        return self.state == CLOSED
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self, now: float, retry_after: Optional[float] = None) -> bool:
+        """Count a failure; returns True if it opened the circuit"""
+        if self.state == OPEN:
+            # Late results of requests sent before the circuit opened
+            return False
+        self.failures += 1
+        if self.state != HALF_OPEN and self.failures < self.threshold:
+            return False
+        cooldown = min(self.max_cooldown, self.cooldown * 2 ** self.trips)
+        self.opened_until = now + max(cooldown, retry_after or 0)
+        self.state = OPEN
+        self.failures = 0
+        self.trips += 1
+        return True
+
+
+class HostCircuitBreakers:
+    """One circuit breaker per host, created lazily; counts trips and rejections in `metrics`"""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0, max_cooldown: float = 900.0,
+                 metrics=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = metrics
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(self.threshold, self.cooldown, self.max_cooldown)
+        return breaker
+
+    def _count(self, name: str, host: str) -> None:
+        if self.metrics:
+            self.metrics.increment(name)
+            self.metrics.increment(f'{name}:{host}')
+
+    def check(self, url: str) -> None:
+        """Raise CircuitOpenError if requests to the URL's host are currently blocked"""
+        host = host_key(url)
+        with self._lock:
+            breaker = self._breaker(host)
+            if breaker.allow(time.monotonic()):
+                return
+            remaining = breaker.opened_until - time.monotonic()
+        self._count('circuit_rejected', host)
+        raise CircuitOpenError(f"Circuit open for {host}" + (f", retrying in {remaining:.0f}s" if remaining > 0 else ""))
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            self._breaker(host_key(url)).record_success()
+
+    def record_failure(self, url: str, retry_after: Optional[float] = None) -> bool:
+        """Count a throttled or failed request; returns True if it opened the host's circuit"""
+        host = host_key(url)
+        with self._lock:
+            breaker = self._breaker(host)
+            opened = breaker.record_failure(time.monotonic(), retry_after)
+            cooldown = breaker.opened_until - time.monotonic()
+        if opened:
+            logger.warning(f"Opening circuit for {host} for {cooldown:.0f}s after repeated throttling")
+            self._count('circuit_opened', host)
+        return opened
+
+    def states(self) -> Dict[str, str]:
+        """Current state of every host's breaker"""
+        with self._lock:
+            return {host: breaker.state for host, breaker in self.breakers.items()}
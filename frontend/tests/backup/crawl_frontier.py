@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Persistent crawl frontier for incremental scraping
+Records every discovered product URL with its status, last fetch time and content hash in SQLite,
+so re-runs only fetch URLs that are new or have gone stale. A URL only counts as done once its
+product has been ingested; scraped-but-not-ingested URLs stay due
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+SCRAPED = 'scraped'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def content_hash(product: Dict) -> str:
+    """Hash the scraped fields that identify a product's content (price is generated, so excluded)"""
+    stable = {key: product.get(key) for key in ('name', 'brand', 'ingredientsList', 'productType')}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class CrawlFrontier:
+    """SQLite-backed record of discovered URLs and when they were last fetched.
+    `content_hash` is the hash of the last ingested content, `scraped_hash` that of content
+    scraped but not ingested yet."""
+
+    def __init__(self, path: str = 'crawl_frontier.sqlite', recrawl_after_hours: float = 24.0):
+        self.path = path
+        self.recrawl_after = recrawl_after_hours * 3600
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                status TEXT NOT NULL,
+                discovered_at REAL NOT NULL,
+                last_fetched REAL,
+                content_hash TEXT,
+                failures INTEGER NOT NULL DEFAULT 0,
+                scraped_hash TEXT
+            )
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(urls)")}
+        if 'scraped_hash' not in columns:
+            # Frontiers written before ingestion was tracked separately
+            self._db.execute("ALTER TABLE urls ADD COLUMN scraped_hash TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_status ON urls (status, last_fetched)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_scraped ON urls (scraped_hash)")
+        self._db.commit()
+
+    def due(self, urls: Iterable[str], source: str) -> List[str]:
+        """Record discovered URLs and return those that are new or stale, new ones first"""
+        now = time.time()
+        stale_before = now - self.recrawl_after
+        new, stale = [], []
+        with self._lock:
+            for url in dict.fromkeys(urls):
+                row = self._db.execute(
+                    "SELECT status, last_fetched FROM urls WHERE url = ?", (url,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO urls (url, source, status, discovered_at) VALUES (?, ?, ?, ?)",
+                        (url, source, PENDING, now)
+                    )
+                    new.append(url)
+                elif row[0] != DONE or (row[1] or 0) < stale_before:
+                    stale.append(url)
+            self._db.commit()
+        logger.info(f"Frontier: {len(new)} new and {len(stale)} stale {source} URLs due")
+        return new + stale
+
+    def seed(self, entries: Iterable[Tuple[str, Optional[float]]], source: str,
+             batch_size: int = 5000) -> List[str]:
+        """Record (url, lastmod) sitemap entries in bulk and return the URLs to fetch: new ones first,
+        then those modified since their last fetch (or, without a lastmod, unfinished or stale ones)"""
+        now = time.time()
+        stale_before = now - self.recrawl_after
+        new, changed = [], []
+        batch = []
+
+        def flush():
+            with self._lock:
+                self._db.execute("CREATE TEMP TABLE IF NOT EXISTS seed (url TEXT PRIMARY KEY, lastmod REAL)")
+                self._db.execute("DELETE FROM seed")
+                self._db.executemany("INSERT OR REPLACE INTO seed (url, lastmod) VALUES (?, ?)", batch)
+                new.extend(url for url, in self._db.execute(
+                    "SELECT seed.url FROM seed LEFT JOIN urls ON urls.url = seed.url WHERE urls.url IS NULL"
+                ))
+                changed.extend(url for url, in self._db.execute("""
+                    SELECT seed.url FROM seed JOIN urls ON urls.url = seed.url
+                    WHERE urls.status != ?
+                       OR (seed.lastmod IS NOT NULL AND seed.lastmod > COALESCE(urls.last_fetched, 0))
+                       OR (seed.lastmod IS NULL AND COALESCE(urls.last_fetched, 0) < ?)
+                """, (DONE, stale_before)))
+                self._db.execute(
+                    "INSERT OR IGNORE INTO urls (url, source, status, discovered_at) "
+                    "SELECT url, ?, ?, ? FROM seed", (source, PENDING, now)
+                )
+                self._db.commit()
+            batch.clear()
+
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        logger.info(f"Frontier: {len(new)} new and {len(changed)} changed {source} URLs due from the sitemap")
+        return new + changed
+
+    def mark_scraped(self, url: str, digest: str) -> bool:
+        """Record a successful fetch whose product still has to be ingested; returns False, and marks
+        the URL done again, if the content is unchanged since it was last ingested"""
+        with self._lock:
+            row = self._db.execute("SELECT content_hash FROM urls WHERE url = ?", (url,)).fetchone()
+            if row and row[0] == digest:
+                self._db.execute(
+                    "UPDATE urls SET status = ?, last_fetched = ?, scraped_hash = NULL, failures = 0 WHERE url = ?",
+                    (DONE, time.time(), url)
+                )
+                self._db.commit()
+                return False
+            self._db.execute(
+                "UPDATE urls SET status = ?, scraped_hash = ?, failures = 0 WHERE url = ?",
+                (SCRAPED, digest, url)
+            )
+            self._db.commit()
+        return True
+    
+    def mark_ingested(self, digest: str) -> None:
+        """Mark the URLs whose scraped content has this hash as done"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE urls SET status = ?, last_fetched = ?, content_hash = scraped_hash, scraped_hash = NULL "
+                "WHERE scraped_hash = ?", (DONE, time.time(), digest)
+            )
+            self._db.commit()
+    
+    def mark_failed(self, url: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE urls SET status = ?, last_fetched = ?, failures = failures + 1 WHERE url = ?",
+                (FAILED, time.time(), url)
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of URLs per status"""
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def track(frontier: Optional[CrawlFrontier], scrape_product):
+    """Wrap a product scrape function so results are recorded in the frontier. Re-fetched products whose
+    content has not changed since they were ingested are dropped so they are not ingested twice;
+    the URL is only marked done once the product is ingested (see CrawlFrontier.mark_ingested)."""
+    if frontier is None:
+        return scrape_product
+
+    def tracked(url: str) -> Optional[Dict]:
+        product = scrape_product(url)
+        if not product:
+            frontier.mark_failed(url)
+            return None
+        if not frontier.mark_scraped(url, content_hash(product)):
+            logger.debug(f"Unchanged since last ingested: {url}")
+            return None
+        return product
+
+    return tracked
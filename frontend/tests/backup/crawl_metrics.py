@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Run metrics for the skincare scrapers
+Thread-safe counters and timings collected during a crawl and logged when the run ends
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlMetrics:
+    """Named counters and observed values (e.g. latencies) for a single scraper run"""
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.observations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self.observations.setdefault(name, []).append(value)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Counters as-is, observations reduced to count/mean/p50/p95/max"""
+        with self._lock:
+            result = {'counters': dict(self.counters)}
+            for name, values in self.observations.items():
+                ordered = sorted(values)
+                result[name] = {
+                    'count': len(ordered),
+                    'mean': sum(ordered) / len(ordered),
+                    'p50': ordered[len(ordered) // 2],
+                    'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    'max': ordered[-1],
+                }
+            return result
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        for name, value in sorted(summary.pop('counters').items()):
+            logger.info(f"Metric {name}: {value:g}")
+        for name, stats in sorted(summary.items()):
+            logger.info(
+                f"Metric {name}: n={stats['count']} mean={stats['mean']:.3f} "
+                f"p50={stats['p50']:.3f} p95={stats['p95']:.3f} max={stats['max']:.3f}"
+            )
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Bounded pool of Selenium WebDrivers for parallel page rendering
+Drivers are health-checked on checkout and recycled after a number of pages to cap memory growth
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """Hands out at most `size` WebDrivers, creating them lazily with `factory`"""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages: int = 50):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pages: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create(self) -> Any:
+        driver = self.factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+        logger.info(f"Started WebDriver ({len(self._pages)}/{self.size} in pool)")
+        return driver
+
+    def _discard(self, driver: Any) -> None:
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting WebDriver: {e}")
+
+    @staticmethod
+    def _is_healthy(driver: Any) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def checkout(self, timeout: Optional[float] = None) -> Any:
+        """Take a healthy driver from the pool, starting one if a slot is free"""
+        if self._closed:
+            raise RuntimeError("WebDriver pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a WebDriver")
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if self._is_healthy(driver):
+                return driver
+            logger.warning("Replacing unresponsive WebDriver")
+            self._discard(driver)
+            return self._create()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver: Any, broken: bool = False) -> None:
+        """Return a driver, recycling it if it is broken or has rendered max_pages pages"""
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0) + 1
+                self._pages[id(driver)] = pages
+            if broken or self._closed or pages >= self.max_pages:
+                if not broken and not self._closed:
+                    logger.info(f"Recycling WebDriver after {pages} pages")
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Check out a driver for the duration of a with-block"""
+        driver = self.checkout(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not self._is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+    def close(self) -> None:
+        """Quit every idle driver; drivers still checked out are quit on checkin"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
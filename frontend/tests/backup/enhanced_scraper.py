@@ -4,27 +4,40 @@ Enhanced Skincare Product Web Scraper
 Uses Selenium for better scraping capabilities and more sophisticated data extraction
 """
 
-import requests
 import json
 import time
 import random
 import re
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import mysql.connector
-from mysql.connector import Error
 import logging
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 import argparse
+import itertools
 import sys
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from fake_useragent import UserAgent
+import threading
+from async_crawler import AsyncCrawlEngine
+from browser_daemon import DEFAULT_DRIVER_CACHE, DEFAULT_STATE_FILE, cached_driver_path, daemon_addresses, use_own_tab
+from pipeline import StreamingPipeline, merge_streams
+from checkpoint import CheckpointJournal, checkpointed
+from circuit_breaker import HostCircuitBreakers
+from crawl_frontier import CrawlFrontier, content_hash, track
+from crawl_metrics import CrawlMetrics
+from driver_pool import WebDriverPool
+from fetch_strategy import FetchStrategy, REQUESTS, SELENIUM
+from html_parser import HTMLParsers, listing_regions, parse_source_parser, product_regions, region_texts
+from http_cache import HTTPCache
+from page_archive import PageArchive
+from page_extraction import INCIDECODER_PRODUCT_FIELDS, SEPHORA_PRODUCT_FIELDS, extract_fields, link_fields
+from page_readiness import scroll_until_stable, wait_until_ready
+from rate_limiter import HostRateLimiter, host_key, parse_host_rate
+from resource_blocking import DEFAULT_BLOCKED_TYPES, ResourceBlocker, page_weight
+from scraper_session import ScraperSession
+from sitemap import sitemap_entries, sitemap_locations
+from sources import ProductSource, SourceRegistry
+from structured_data import structured_product
+from transport import DEFAULT_POOL_SIZE, configure_transport, connection_stats, parse_pool_size
+from url_dedup import SeenSet, canonicalize_url, dedupe_urls
 
 # Configure logging
 logging.basicConfig(
@@ -37,9 +50,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sources this scraper can crawl; the plugins are registered below the scraper class
+SOURCES = SourceRegistry()
+
+def random_user_agent() -> str:
+    """A random browser User-Agent; fake_useragent is only imported once a request is made"""
+    from fake_useragent import UserAgent
+    return UserAgent().random
+
 class EnhancedSkincareScraper:
     def __init__(self, api_base_url: str = "http://localhost:8080/api", 
-                 db_config: Optional[Dict] = None, use_selenium: bool = True):
+                 db_config: Optional[Dict] = None, use_selenium: bool = True,
+                 concurrency: int = 8,
+                 host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 cache_dir: Optional[str] = None, cache_max_mb: int = 500,
+                 drivers: int = 2, driver_max_pages: int = 50,
+                 strategy_file: Optional[str] = None,
+                 frontier_path: Optional[str] = None, recrawl_after_hours: float = 24.0,
+                 checkpoint_path: Optional[str] = None, buffer_size: int = 32,
+                 parsers: Optional[Dict[str, str]] = None, partial_parse: bool = True,
+                 in_browser_extraction: bool = True, block_resources: bool = True,
+                 blocked_types: Optional[List[str]] = None, blocked_domains: Optional[List[str]] = None,
+                 allowed_domains: Optional[List[str]] = None, daemon_state: Optional[str] = None,
+                 driver_cache: str = DEFAULT_DRIVER_CACHE, discovery: str = 'brands',
+                 sitemap_urls: Optional[List[str]] = None, max_retries: int = 3,
+                 breaker_threshold: int = 5, breaker_cooldown: float = 60.0, pool_size: Optional[int] = None,
+                 host_pool_sizes: Optional[Dict[str, int]] = None, archive_dir: Optional[str] = None,
+                 replay_dir: Optional[str] = None, per_host_concurrency: Optional[int] = None):
         self.api_base_url = api_base_url
         self.db_config = db_config or {
             'host': 'localhost',
@@ -48,53 +85,281 @@ class EnhancedSkincareScraper:
             'user': 'root',
             'password': ''
         }
+        # A replay re-parses archived pages: nothing is fetched or rendered and the crawl state is left untouched
+        self.replay = PageArchive(replay_dir) if replay_dir else None
+        if self.replay:
+            use_selenium = False
+            frontier_path = checkpoint_path = None
         self.use_selenium = use_selenium
+        self.in_browser_extraction = in_browser_extraction
         
         # Setup requests session
-        self.session = requests.Session()
-        ua = UserAgent()
+        # Our own API gets a generous budget so ingestion is never the bottleneck
+        host_rates = dict(host_rates or {})
+        host_rates.setdefault(host_key(api_base_url), (20.0, 10))
+        self.rate_limiter = HostRateLimiter(host_rates)
+        self.cache = HTTPCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+        self.metrics = CrawlMetrics()
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        # Throttling hosts are retried with backoff and, if they keep at it, paused
+        self.session = ScraperSession(
+            self.rate_limiter, self.cache, user_agent=random_user_agent,
+            breakers=HostCircuitBreakers(breaker_threshold, breaker_cooldown, metrics=self.metrics),
+            max_retries=max_retries, metrics=self.metrics, archive=self.archive, replay=self.replay
+        )
+        self.frontier = CrawlFrontier(frontier_path, recrawl_after_hours) if frontier_path else None
+        self.checkpoint = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        # Canonical product URLs already scheduled this run, shared by every source
+        self.seen_urls = SeenSet()
         self.session.headers.update({
-            'User-Agent': ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+        # One set of keep-alive pools serves every source, sized so fetch threads never queue for a socket
+        configure_transport(self.session, pool_size or max(concurrency, DEFAULT_POOL_SIZE), host_pool_sizes)
+        
+        # Remembers which pages need a browser render
+        self.fetch_strategy = FetchStrategy(strategy_file)
+        
+        # Images, fonts, media and trackers are not needed to read product data
+        self.resource_blocker = (ResourceBlocker(blocked_types, blocked_domains, allowed_domains)
+                                 if block_resources else None)
+        
+        # Attach to long-lived daemon browsers instead of starting Chrome, if any are running
+        self.daemon_state = daemon_state
+        self.driver_cache = driver_cache
         
-        # Setup Selenium driver if needed
-        self.driver = None
+        # Setup Selenium driver pool if needed
+        self.driver_pool = None
         if use_selenium:
-            self._setup_selenium()
+            self._setup_selenium(drivers, driver_max_pages)
+        
+        # Requests-first fetches run at full concurrency; renders queue for a pooled driver
+        self.crawl_engine = AsyncCrawlEngine(concurrency=concurrency, per_host_concurrency=per_host_concurrency)
+        self.buffer_size = buffer_size
+        self.parsers = HTMLParsers(parsers, partial=partial_parse)
+        self.discovery = discovery
+        self.sitemap_urls = sitemap_urls
+        self.sources = SOURCES.create(self)
     
-    def _setup_selenium(self):
-        """Setup Selenium WebDriver"""
+    def _setup_selenium(self, drivers: int = 2, driver_max_pages: int = 50):
+        """Setup a pool of Selenium WebDrivers"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+            addresses = daemon_addresses(self.daemon_state) if self.daemon_state else []
+            if self.daemon_state and not addresses:
+                logger.warning("No browser daemon running, starting Chrome for this run")
             
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info("Selenium WebDriver initialized successfully")
+            # The driver path is cached, so startup does not look up chromedriver online
+            driver_path = cached_driver_path(self.driver_cache)
+            try:
+                self.driver_pool = self._start_driver_pool(driver_path, addresses, drivers, driver_max_pages)
+            except Exception as e:
+                # A Chrome update can leave the cached chromedriver incompatible
+                logger.warning(f"Cached chromedriver failed to start ({e}), resolving it again")
+                driver_path = cached_driver_path(self.driver_cache, refresh=True)
+                self.driver_pool = self._start_driver_pool(driver_path, addresses, drivers, driver_max_pages)
+            target = f"attached to {len(addresses)} daemon browsers" if addresses else f"{drivers} drivers"
+            logger.info(f"Selenium WebDriver pool initialized successfully ({target})")
         except Exception as e:
             logger.error(f"Failed to initialize Selenium: {e}")
+            self.driver_pool = None
             self.use_selenium = False
     
+    def _start_driver_pool(self, driver_path: str, addresses: List[str], drivers: int,
+                           driver_max_pages: int) -> WebDriverPool:
+        """Create the driver pool and start one driver up front, so a broken Chrome install
+        falls back to requests"""
+        if addresses:
+            next_address = itertools.cycle(addresses)
+            lock = threading.Lock()
+            
+            def factory():
+                with lock:
+                    address = next(next_address)
+                return self._attach_driver(driver_path, address)
+        else:
+            factory = lambda: self._create_driver(driver_path)
+        
+        pool = WebDriverPool(factory, size=drivers, max_pages=driver_max_pages)
+        try:
+            pool.checkin(pool.checkout())
+        except Exception:
+            pool.close()
+            raise
+        return pool
+    
+    def _attach_driver(self, driver_path: str, address: str):
+        """Attach a WebDriver session to a running daemon browser, in a tab of its own"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
+        chrome_options = Options()
+        chrome_options.debugger_address = address
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        use_own_tab(driver)
+        if self.resource_blocker:
+            self.resource_blocker.apply(driver)
+        return driver
+    
+    def _create_driver(self, driver_path: str):
+        """Start a headless Chrome WebDriver"""
+        # Selenium is only imported once a browser is actually needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        if self.resource_blocker:
+            chrome_options.add_experimental_option('prefs', self.resource_blocker.chrome_prefs())
+        
+        service = Service(driver_path)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        if self.resource_blocker:
+            self.resource_blocker.apply(driver)
+        return driver
+    
+    def close(self):
+        """Quit all pooled Selenium drivers and save the learned fetch strategy"""
+        if getattr(self, 'fetch_strategy', None):
+            self.fetch_strategy.save()
+        if getattr(self, 'driver_pool', None):
+            self.driver_pool.close()
+            self.driver_pool = None
+    
     def __del__(self):
-        """Cleanup Selenium driver"""
-        if self.driver:
-            self.driver.quit()
+        """Cleanup Selenium drivers"""
+        self.close()
+    
+    def _fetch_result(self, url: str, source: str, parse, is_complete, regions=product_regions,
+                      structured=None):
+        """Fetch a page with requests; use its embedded structured data when that is complete,
+        otherwise parse its HTML"""
+        response = self.session.get(url)
+        if response.status_code != 200:
+            return None
+        if structured:
+            result = structured(response.text)
+            if is_complete(result):
+                self.metrics.increment('structured_data_pages')
+                return result
+        return parse(self.parsers.parse(response.content, source, regions))
+    
+    def _render_page(self, url: str, wait_selectors: List[str], scroll_selector: Optional[str] = None,
+                     fields: Optional[Dict] = None):
+        """Render a page with a pooled WebDriver; returns the given fields read inside the page,
+        or the serialized DOM when no fields are given"""
+        with self.driver_pool.driver() as driver:
+            self.rate_limiter.acquire(url)
+            start = time.monotonic()
+            driver.get(url)
+            
+            # Wait for the content we are after to appear and the page to go quiet
+            if not wait_until_ready(driver, wait_selectors):
+                self.metrics.increment('pages_not_ready')
+            
+            # Infinite-scroll listings: keep scrolling while new product anchors show up
+            if scroll_selector:
+                scroll_until_stable(driver, scroll_selector)
+            self.metrics.observe('page_ready_seconds', time.monotonic() - start)
+            
+            # What the page cost to load, to compare runs with and without resource blocking
+            weight = page_weight(driver)
+            if weight:
+                self.metrics.observe('page_kb', weight['bytes'] / 1024)
+                self.metrics.observe('page_load_seconds', weight['loadMs'] / 1000)
+            
+            if fields:
+                return extract_fields(driver, fields)
+            return driver.page_source
+    
+    def _scrape_adaptive(self, url: str, source: str, parse, is_complete, wait_selectors: List[str],
+                         scroll_selector: Optional[str] = None, regions=product_regions,
+                         structured=None, fields: Optional[Dict] = None, extract=None):
+        """Fetch with requests first and only render with Selenium when the result is incomplete"""
+        if not (self.use_selenium and self.driver_pool):
+            return self._fetch_result(url, source, parse, is_complete, regions, structured)
+        
+        if self.fetch_strategy.choose(url) == REQUESTS:
+            result = self._fetch_result(url, source, parse, is_complete, regions, structured)
+            complete = is_complete(result)
+            self.fetch_strategy.record(url, REQUESTS, complete)
+            if complete:
+                return result
+            logger.debug(f"Escalating {url} to Selenium")
+        
+        if fields and self.in_browser_extraction:
+            # One script call returns just the fields, instead of serializing and re-parsing the DOM
+            result = extract(self._render_page(url, wait_selectors, scroll_selector, fields))
+        else:
+            page_source = self._render_page(url, wait_selectors, scroll_selector)
+            result = parse(self.parsers.parse(page_source, source, regions))
+        self.fetch_strategy.record(url, SELENIUM, is_complete(result))
+        return result
+    
+    @staticmethod
+    def _is_complete_product(product: Optional[Dict]) -> bool:
+        """A product is complete once it has a name and an ingredient list"""
+        return bool(product and product.get('name') and product.get('ingredientsList'))
+    
+    def _get_incidecoder_brand_links(self, brand_url: str, base_url: str) -> List[str]:
+        """Collect product links from an INCIDecoder brand page"""
+        try:
+            logger.info(f"Scraping brand: {brand_url}")
+            
+            product_links = self._scrape_adaptive(
+                brand_url, 'incidecoder',
+                lambda soup: [urljoin(base_url, elem['href'])
+                              for elem in soup.find_all('a', href=re.compile(r'/products/'))],
+                bool,
+                ["a[href*='/products/']"],
+                regions=listing_regions,
+                fields=link_fields('/products/'),
+                extract=lambda fields: [urljoin(base_url, href) for href in fields.get('links', [])]
+            )
+            
+            # Limit products per brand, counting each product once
+            return dedupe_urls(product_links or [])[:10]
+            
+        except Exception as e:
+            logger.error(f"Error scraping brand {brand_url}: {e}")
+            return []
     
     def scrape_incidecoder_enhanced(self, max_products: int = 50) -> List[Dict]:
         """Enhanced scraping from INCIDecoder using Selenium"""
-        products = []
-        base_url = "https://incidecoder.com"
+        return list(self.iter_incidecoder_enhanced(max_products))
+    
+    def iter_incidecoder_enhanced(self, max_products: int = 50) -> Iterator[Dict]:
+        """Stream products from INCIDecoder as they are scraped"""
+        for product in self._crawl_source(self.sources['incidecoder'], max_products):
+            logger.info(f"Added product: {product['name']}")
+            yield product
+    
+    def _crawl_source(self, source: ProductSource, max_products: Optional[int] = None) -> Iterator[Dict]:
+        """Stream up to `max_products` products of a source; a replay re-parses its archived pages
+        instead of discovering them"""
+        if self.replay:
+            product_links = self._replay_product_links(source.name, source.base_url, source.product_path)
+        else:
+            product_links = source.discover()
         
+        # max_products counts new work: unchanged re-fetches are not returned
+        return self.crawl_engine.stream(
+            product_links,
+            checkpointed(self.checkpoint, source.name, track(self.frontier, source.scrape)),
+            limit=max_products,
+            buffer_size=self.buffer_size
+        )
+    
+    def _incidecoder_brand_product_links(self, base_url: str) -> List[str]:
+        """Product links found on the brand pages of a fixed list of popular brands"""
         # Popular brands with more comprehensive list
         brands = [
             "the-ordinary", "cerave", "la-roche-posay", "neutrogena", 
@@ -104,149 +369,158 @@ class EnhancedSkincareScraper:
             "aveeno", "eucerin", "cetaphil", "dermalogica"
         ]
         
-        for brand in brands:
-            if len(products) >= max_products:
-                break
-                
-            try:
-                logger.info(f"Scraping brand: {brand}")
-                brand_url = f"{base_url}/brands/{brand}"
-                
-                if self.use_selenium and self.driver:
-                    self.driver.get(brand_url)
-                    time.sleep(random.uniform(2, 4))
-                    
-                    # Wait for products to load
-                    try:
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/products/']"))
-                        )
-                    except:
-                        pass
-                    
-                    # Get all product links
-                    product_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/products/']")
-                    product_links = [elem.get_attribute('href') for elem in product_elements]
-                else:
-                    response = self.session.get(brand_url)
-                    if response.status_code != 200:
-                        continue
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    product_elements = soup.find_all('a', href=re.compile(r'/products/'))
-                    product_links = [urljoin(base_url, elem['href']) for elem in product_elements]
-                
-                # Limit products per brand
-                for link in product_links[:10]:
-                    if len(products) >= max_products:
-                        break
-                        
-                    product_data = self._scrape_incidecoder_product_enhanced(link)
-                    if product_data:
-                        products.append(product_data)
-                        logger.info(f"Added product: {product_data['name']}")
-                        time.sleep(random.uniform(1, 3))
-                        
-            except Exception as e:
-                logger.error(f"Error scraping brand {brand}: {e}")
-                
-        return products
+        brand_urls = [f"{base_url}/brands/{brand}" for brand in brands]
+        link_lists = self.crawl_engine.crawl(
+            brand_urls, lambda url: self._get_incidecoder_brand_links(url, base_url)
+        )
+        return self.seen_urls.claim(link for links in link_lists for link in links)
+    
+    def _replay_product_links(self, source: str, base_url: str, path: str) -> List[str]:
+        """Product links of a source held by the replay archive, in the order they were archived"""
+        host = host_key(base_url)
+        product_links = [url for url in self.replay.urls(path) if host_key(url) == host]
+        logger.info(f"Replaying {len(product_links)} archived {source} product pages")
+        return product_links
+    
+    def _sitemap_product_links(self, source: str, base_url: str, url_pattern: str) -> List[str]:
+        """New or changed product links from the site's sitemaps, without visiting listing pages"""
+        sitemaps = self.sitemap_urls or sitemap_locations(self.session, base_url)
+        logger.info(f"Reading {source} sitemaps: {', '.join(sitemaps)}")
+        entries = ((canonicalize_url(url), lastmod)
+                   for url, lastmod in sitemap_entries(self.session, sitemaps, re.compile(url_pattern))
+                   if self.seen_urls.add(url))
+        if self.frontier:
+            return self.frontier.seed(entries, source)
+        return [url for url, _ in entries]
     
     def _scrape_incidecoder_product_enhanced(self, url: str) -> Optional[Dict]:
         """Enhanced scraping of individual product from INCIDecoder"""
         try:
-            if self.use_selenium and self.driver:
-                self.driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                
-                # Wait for page to load
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                    )
-                except:
-                    pass
-                
-                page_source = self.driver.page_source
-                soup = BeautifulSoup(page_source, 'html.parser')
-            else:
-                response = self.session.get(url)
-                if response.status_code != 200:
-                    return None
-                soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            name_elem = soup.find('h1')
-            if not name_elem:
-                return None
-            name = name_elem.get_text(strip=True)
-            
-            # Extract brand
-            brand_elem = soup.find('a', href=re.compile(r'/brands/'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-            
-            # Extract ingredients with better parsing
-            ingredients_list = ""
-            star_ingredients = ""
-            
-            # Try multiple selectors for ingredients
-            ingredients_selectors = [
-                'div#ingredients a[href*="/ingredients/"]',
-                '.ingredients-list a[href*="/ingredients/"]',
-                'div[class*="ingredient"] a[href*="/ingredients/"]'
-            ]
-            
-            for selector in ingredients_selectors:
-                ingredients = soup.select(selector)
-                if ingredients:
-                    ingredients_list = ", ".join([ing.get_text(strip=True) for ing in ingredients])
-                    break
-            
-            # If no ingredients found, try alternative method
-            if not ingredients_list:
-                # Look for ingredients in text content
-                ingredients_text = soup.get_text()
+            return self._scrape_adaptive(
+                url, 'incidecoder', self._parse_incidecoder_product_enhanced, self._is_complete_product,
+                ["h1"],
+                fields=INCIDECODER_PRODUCT_FIELDS,
+                extract=self._extract_incidecoder_product_enhanced
+            )
+        except Exception as e:
+            logger.error(f"Error scraping product {url}: {e}")
+            return None
+    
+    def _parse_incidecoder_product_enhanced(self, soup: BeautifulSoup) -> Optional[Dict]:
+        """Extract product fields from an INCIDecoder product page"""
+        # Extract product name
+        name_elem = soup.find('h1')
+        if not name_elem:
+            return None
+        name = name_elem.get_text(strip=True)
+        
+        # Extract brand
+        brand_elem = soup.find('a', href=re.compile(r'/brands/'))
+        brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
+        
+        # Try multiple selectors for ingredients
+        ingredients = []
+        ingredients_selectors = [
+            'div#ingredients a[href*="/ingredients/"]',
+            '.ingredients-list a[href*="/ingredients/"]',
+            'div[class*="ingredient"] a[href*="/ingredients/"]'
+        ]
+        
+        for selector in ingredients_selectors:
+            ingredient_elems = soup.select(selector)
+            if ingredient_elems:
+                ingredients = [ing.get_text(strip=True) for ing in ingredient_elems]
+                break
+        
+        return self._build_incidecoder_product(name, brand, ingredients, region_texts(soup))
+    
+    def _extract_incidecoder_product_enhanced(self, fields: Dict) -> Optional[Dict]:
+        """Build an INCIDecoder product from the fields read inside the rendered page"""
+        if 'name' not in fields:
+            return None
+        return self._build_incidecoder_product(
+            fields['name'], fields.get('brand') or "Unknown",
+            fields.get('ingredients', []), fields.get('ingredient_regions', [])
+        )
+    
+    def _build_incidecoder_product(self, name: str, brand: str, ingredients: List[str],
+                                   ingredient_texts) -> Dict:
+        """Assemble an INCIDecoder product; `ingredient_texts` are only searched when no
+        ingredient links were found"""
+        ingredients_list = ", ".join(ingredients)
+        star_ingredients = ""
+        
+        # If no ingredients found, try alternative method
+        if not ingredients_list:
+            # Look for ingredients in the text of ingredient regions, not the whole document
+            for ingredients_text in ingredient_texts:
                 ingredients_match = re.search(r'Ingredients[:\s]*(.*?)(?:\n|$)', ingredients_text, re.IGNORECASE)
                 if ingredients_match:
                     ingredients_list = ingredients_match.group(1).strip()
+                    break
+        
+        # Extract star ingredients (first 5-8 ingredients)
+        if ingredients_list:
+            all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
+            # Filter out common filler ingredients for star ingredients
+            star_ingredients_list = []
+            for ing in all_ingredients[:8]:
+                ing_lower = ing.lower()
+                if not any(filler in ing_lower for filler in ['water', 'aqua', 'glycerin', 'propylene glycol']):
+                    star_ingredients_list.append(ing)
+                if len(star_ingredients_list) >= 5:
+                    break
+            star_ingredients = ", ".join(star_ingredients_list)
+        
+        # Determine product type with enhanced logic
+        product_type = self._determine_product_type_enhanced(name, ingredients_list)
+        
+        # Generate realistic price based on brand and product type
+        price = self._generate_realistic_price(brand, product_type)
+        
+        return {
+            'name': name,
+            'brand': brand,
+            'ingredientsList': ingredients_list,
+            'starIngredients': star_ingredients,
+            'productType': product_type,
+            'price': price
+        }
+    
+    def _get_sephora_category_links(self, category_url: str, base_url: str) -> List[str]:
+        """Collect product links from a Sephora category page"""
+        try:
+            logger.info(f"Scraping Sephora category: {category_url}")
             
-            # Extract star ingredients (first 5-8 ingredients)
-            if ingredients_list:
-                all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
-                # Filter out common filler ingredients for star ingredients
-                star_ingredients_list = []
-                for ing in all_ingredients[:8]:
-                    ing_lower = ing.lower()
-                    if not any(filler in ing_lower for filler in ['water', 'aqua', 'glycerin', 'propylene glycol']):
-                        star_ingredients_list.append(ing)
-                    if len(star_ingredients_list) >= 5:
-                        break
-                star_ingredients = ", ".join(star_ingredients_list)
-            
-            # Determine product type with enhanced logic
-            product_type = self._determine_product_type_enhanced(name, ingredients_list)
-            
-            # Generate realistic price based on brand and product type
-            price = self._generate_realistic_price(brand, product_type)
+            # Scroll rendered pages to load more products
+            product_links = self._scrape_adaptive(
+                category_url, 'sephora',
+                lambda soup: [urljoin(base_url, elem['href'])
+                              for elem in soup.find_all('a', href=re.compile(r'/product/'))],
+                bool,
+                ["a[href*='/product/']"],
+                scroll_selector="a[href*='/product/']",
+                regions=listing_regions,
+                fields=link_fields('/product/'),
+                extract=lambda fields: [urljoin(base_url, href) for href in fields.get('links', [])]
+            )
             
-            return {
-                'name': name,
-                'brand': brand,
-                'ingredientsList': ingredients_list,
-                'starIngredients': star_ingredients,
-                'productType': product_type,
-                'price': price
-            }
+            return dedupe_urls(product_links or [])[:8]
             
         except Exception as e:
-            logger.error(f"Error scraping product {url}: {e}")
-            return None
+            logger.error(f"Error scraping Sephora category {category_url}: {e}")
+            return []
     
     def scrape_sephora_enhanced(self, max_products: int = 30) -> List[Dict]:
         """Enhanced scraping from Sephora"""
-        products = []
-        base_url = "https://www.sephora.com"
-        
+        return list(self.iter_sephora_enhanced(max_products))
+    
+    def iter_sephora_enhanced(self, max_products: int = 30) -> Iterator[Dict]:
+        """Stream products from Sephora as they are scraped"""
+        return self._crawl_source(self.sources['sephora'], max_products)
+    
+    def _sephora_category_product_links(self, base_url: str) -> List[str]:
+        """Product links found on the Sephora skincare category pages"""
         # Sephora skincare categories with more specific URLs
         categories = [
             "/shop/skincare-cleansers",
@@ -257,132 +531,107 @@ class EnhancedSkincareScraper:
             "/shop/skincare-masks"
         ]
         
-        for category in categories:
-            if len(products) >= max_products:
-                break
-                
-            try:
-                logger.info(f"Scraping Sephora category: {category}")
-                category_url = base_url + category
-                
-                if self.use_selenium and self.driver:
-                    self.driver.get(category_url)
-                    time.sleep(random.uniform(3, 5))
-                    
-                    # Scroll to load more products
-                    self._scroll_page()
-                    
-                    # Get product links
-                    product_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/product/']")
-                    product_links = [elem.get_attribute('href') for elem in product_elements]
-                else:
-                    response = self.session.get(category_url)
-                    if response.status_code != 200:
-                        continue
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    product_elements = soup.find_all('a', href=re.compile(r'/product/'))
-                    product_links = [urljoin(base_url, elem['href']) for elem in product_elements]
-                
-                for link in product_links[:8]:
-                    if len(products) >= max_products:
-                        break
-                        
-                    product_data = self._scrape_sephora_product_enhanced(link)
-                    if product_data:
-                        products.append(product_data)
-                        time.sleep(random.uniform(2, 4))
-                        
-            except Exception as e:
-                logger.error(f"Error scraping Sephora category {category}: {e}")
-                
-        return products
+        category_urls = [base_url + category for category in categories]
+        link_lists = self.crawl_engine.crawl(
+            category_urls, lambda url: self._get_sephora_category_links(url, base_url)
+        )
+        return self.seen_urls.claim(link for links in link_lists for link in links)
     
     def _scrape_sephora_product_enhanced(self, url: str) -> Optional[Dict]:
         """Enhanced scraping of individual product from Sephora"""
         try:
-            if self.use_selenium and self.driver:
-                self.driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                
-                # Wait for product info to load
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "[data-at='product_name']"))
-                    )
-                except:
-                    pass
-                
-                page_source = self.driver.page_source
-                soup = BeautifulSoup(page_source, 'html.parser')
-            else:
-                response = self.session.get(url)
-                if response.status_code != 200:
-                    return None
-                soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            name_elem = soup.find('span', {'data-at': 'product_name'}) or soup.find('h1')
-            if not name_elem:
-                return None
-            name = name_elem.get_text(strip=True)
-            
-            # Extract brand
-            brand_elem = soup.find('span', {'data-at': 'brand_name'}) or soup.find('a', href=re.compile(r'/brand/'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-            
-            # Extract price
-            price = 0
-            price_elem = soup.find('span', {'data-at': 'price'})
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price_match = re.search(r'\$?(\d+(?:\.\d{2})?)', price_text)
-                if price_match:
-                    price = int(float(price_match.group(1)) * 100)
-            
-            # Extract ingredients from product description
-            ingredients_list = ""
-            description_elem = soup.find('div', {'data-at': 'product_description'}) or soup.find('div', class_='description')
-            if description_elem:
-                description_text = description_elem.get_text()
-                # Look for ingredients in description
-                ingredients_match = re.search(r'Ingredients[:\s]*(.*?)(?:\n|$)', description_text, re.IGNORECASE)
-                if ingredients_match:
-                    ingredients_list = ingredients_match.group(1).strip()
-            
-            # Extract star ingredients
-            star_ingredients = ""
-            if ingredients_list:
-                all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
-                star_ingredients = ", ".join(all_ingredients[:5])
-            
-            product_type = self._determine_product_type_enhanced(name, ingredients_list)
-            
-            return {
-                'name': name,
-                'brand': brand,
-                'ingredientsList': ingredients_list,
-                'starIngredients': star_ingredients,
-                'productType': product_type,
-                'price': price
-            }
-            
+            return self._scrape_adaptive(
+                url, 'sephora', self._parse_sephora_product_enhanced, self._is_complete_product,
+                ["[data-at='product_name']"],
+                structured=self._parse_structured_product_enhanced,
+                fields=SEPHORA_PRODUCT_FIELDS,
+                extract=self._extract_sephora_product_enhanced
+            )
         except Exception as e:
             logger.error(f"Error scraping Sephora product {url}: {e}")
             return None
     
-    def _scroll_page(self):
-        """Scroll page to load more content"""
-        if not self.driver:
-            return
-            
-        try:
-            # Scroll down gradually
-            for i in range(3):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-        except Exception as e:
-            logger.warning(f"Error scrolling page: {e}")
+    def _parse_structured_product_enhanced(self, markup: str) -> Optional[Dict]:
+        """Build a product from the page's embedded JSON-LD or app state, without the DOM"""
+        data = structured_product(markup)
+        if not data:
+            return None
+        ingredients_list = data['ingredientsList']
+        star_ingredients = ""
+        if ingredients_list:
+            all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
+            star_ingredients = ", ".join(all_ingredients[:5])
+        return {
+            'name': data['name'],
+            'brand': data['brand'],
+            'ingredientsList': ingredients_list,
+            'starIngredients': star_ingredients,
+            'productType': self._determine_product_type_enhanced(data['name'], ingredients_list),
+            'price': data['price']
+        }
+    
+    def _parse_sephora_product_enhanced(self, soup: BeautifulSoup) -> Optional[Dict]:
+        """Extract product fields from a Sephora product page"""
+        # Extract product name
+        name_elem = soup.find('span', {'data-at': 'product_name'}) or soup.find('h1')
+        if not name_elem:
+            return None
+        name = name_elem.get_text(strip=True)
+        
+        # Extract brand
+        brand_elem = soup.find('span', {'data-at': 'brand_name'}) or soup.find('a', href=re.compile(r'/brand/'))
+        brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
+        
+        price_elem = soup.find('span', {'data-at': 'price'})
+        description_elem = soup.find('div', {'data-at': 'product_description'}) or soup.find('div', class_='description')
+        return self._build_sephora_product(
+            name, brand,
+            price_elem.get_text(strip=True) if price_elem else "",
+            description_elem.get_text() if description_elem else ""
+        )
+    
+    def _extract_sephora_product_enhanced(self, fields: Dict) -> Optional[Dict]:
+        """Build a Sephora product from the fields read inside the rendered page"""
+        if 'name' not in fields:
+            return None
+        return self._build_sephora_product(
+            fields['name'], fields.get('brand') or "Unknown",
+            fields.get('price', ""), fields.get('description', "")
+        )
+    
+    def _build_sephora_product(self, name: str, brand: str, price_text: str, description_text: str) -> Dict:
+        """Assemble a Sephora product from its price text and description"""
+        # Extract price
+        price = 0
+        if price_text:
+            price_match = re.search(r'\$?(\d+(?:\.\d{2})?)', price_text)
+            if price_match:
+                price = int(float(price_match.group(1)) * 100)
+        
+        # Extract ingredients from product description
+        ingredients_list = ""
+        if description_text:
+            # Look for ingredients in description
+            ingredients_match = re.search(r'Ingredients[:\s]*(.*?)(?:\n|$)', description_text, re.IGNORECASE)
+            if ingredients_match:
+                ingredients_list = ingredients_match.group(1).strip()
+        
+        # Extract star ingredients
+        star_ingredients = ""
+        if ingredients_list:
+            all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
+            star_ingredients = ", ".join(all_ingredients[:5])
+        
+        product_type = self._determine_product_type_enhanced(name, ingredients_list)
+        
+        return {
+            'name': name,
+            'brand': brand,
+            'ingredientsList': ingredients_list,
+            'starIngredients': star_ingredients,
+            'productType': product_type,
+            'price': price
+        }
     
     def _determine_product_type_enhanced(self, name: str, ingredients: str = "") -> str:
         """Enhanced product type determination"""
@@ -472,6 +721,10 @@ class EnhancedSkincareScraper:
     
     def add_product_via_database(self, product: Dict) -> bool:
         """Add product directly to database"""
+        # Imported on first use so API-only runs never load the MySQL driver
+        import mysql.connector
+        from mysql.connector import Error
+        
         try:
             connection = mysql.connector.connect(**self.db_config)
             cursor = connection.cursor()
@@ -504,52 +757,167 @@ class EnhancedSkincareScraper:
                 cursor.close()
                 connection.close()
     
-    def run_scraper(self, sources: List[str] = None, method: str = 'api', max_products: int = 100) -> None:
-        """Run the scraper with specified sources and method"""
+    def _classify_product(self, product: Dict, seen: Set[str]) -> Optional[Dict]:
+        """Decide whether a scraped product should be ingested: drop nameless products
+        and duplicates already seen in this run"""
+        if not product.get('name'):
+            return None
+        key = content_hash(product)
+        if key in seen:
+            return None
+        seen.add(key)
+        return product
+    
+    def _ingest_product(self, product: Dict, method: str) -> bool:
+        """Add a product with the chosen method and mark it ingested in the checkpoint journal and frontier"""
+        if method == 'api':
+            added = self.add_product_via_api(product)
+        elif method == 'database':
+            added = self.add_product_via_database(product)
+        else:
+            added = False
+        if added and self.checkpoint:
+            self.checkpoint.record_ingested(product)
+        # Only ingested products mark their URLs done, so failed or skipped ingests are fetched again
+        if added and self.frontier:
+            self.frontier.mark_ingested(content_hash(product))
+        return added
+    
+    def run_scraper(self, sources: List[str] = None, method: Optional[str] = None, max_products: int = 100,
+                    resume: bool = False) -> None:
+        """Run the scraper with specified sources and method (default 'api', or 'none' for a replay)"""
+        method = method or ('none' if self.replay else 'api')
+        if self.replay and method != 'none':
+            raise ValueError(f"A replay does not ingest products, got method {method!r}")
         if sources is None:
             sources = ['incidecoder']
+        started = time.monotonic()
         
-        all_products = []
+        pending = []
+        completed_sources = set()
+        if self.checkpoint:
+            pending = self.checkpoint.pending()
+        if self.checkpoint and resume:
+            completed_sources = self.checkpoint.completed_sources()
+            logger.info(f"Resuming: {len(pending)} products pending ingestion, "
+                        f"sources already scraped: {sorted(completed_sources) or 'none'}")
+        elif self.checkpoint:
+            # A fresh run crawls every source again, but still ingests what the last run left behind
+            if pending:
+                logger.info(f"Ingesting {len(pending)} products left un-ingested by a previous run")
+            self.checkpoint.compact()
         
+        streams = {}
         for source in sources:
-            logger.info(f"Starting to scrape from {source}")
-            
-            if source == 'incidecoder':
-                products = self.scrape_incidecoder_enhanced(max_products // len(sources))
-            elif source == 'sephora':
-                products = self.scrape_sephora_enhanced(max_products // len(sources))
-            else:
+            if source not in self.sources:
                 logger.warning(f"Unknown source: {source}")
-                continue
-            
-            all_products.extend(products)
-            logger.info(f"Scraped {len(products)} products from {source}")
-        
-        logger.info(f"Total products scraped: {len(all_products)}")
-        
-        # Add products to database
-        success_count = 0
-        for product in all_products:
-            if method == 'api':
-                if self.add_product_via_api(product):
-                    success_count += 1
-            elif method == 'database':
-                if self.add_product_via_database(product):
-                    success_count += 1
-            
-            time.sleep(random.uniform(0.5, 1.5))  # Rate limiting
+            elif source in completed_sources:
+                logger.info(f"Skipping {source}, already scraped before the interruption")
+            else:
+                logger.info(f"Starting to scrape from {source}")
+                streams[source] = (lambda source=self.sources[source]:
+                                   self._crawl_source(source, max_products // len(sources)))
+        
+        def source_done(source: str, count: int) -> None:
+            logger.info(f"Scraped {count} products from {source}")
+            if self.checkpoint:
+                self.checkpoint.record_source_done(source)
+        
+        def scraped_products():
+            """Products left over from an interrupted run, then those of every source as they are crawled"""
+            yield from pending
+            # Sources crawl side by side on their own hosts' budgets, so the run lasts as long as the slowest
+            yield from merge_streams(streams, self.buffer_size, source_done)
         
-        logger.info(f"Successfully added {success_count} products to database")
+        # Products are classified and ingested while later pages are still being fetched
+        seen = set()
+        counts = StreamingPipeline(self.buffer_size).run(scraped_products(), [
+            ('classify', lambda product: self._classify_product(product, seen)),
+            ('ingest', lambda product: self._ingest_product(product, method)),
+        ])
+        
+        logger.info(f"Total products scraped: {counts['source']}")
+        logger.info(f"Successfully added {counts['ingest']} products to database")
+        if self.replay:
+            elapsed = time.monotonic() - started
+            logger.info(f"Replayed {counts['source']} products in {elapsed:.1f}s "
+                        f"({counts['source'] / max(elapsed, 1e-9):.1f} products/s)")
+        if self.frontier:
+            logger.info(f"Frontier status: {self.frontier.stats()}")
+        if self.checkpoint:
+            self.checkpoint.finish()
+        if self.archive:
+            self.archive.flush()
+            logger.info(f"Page archive: {self.archive.stats()}")
+        open_hosts = {host: state for host, state in self.session.breakers.states().items() if state != 'closed'}
+        if open_hosts:
+            logger.warning(f"Circuit breakers not closed at the end of the run: {open_hosts}")
+        for name, value in connection_stats(self.session).items():
+            self.metrics.increment(name, value)
+        self.metrics.log_summary()
+
+@SOURCES.register
+class INCIDecoderSource(ProductSource):
+    """INCIDecoder products, found on popular brands' pages or in the site's sitemaps"""
+    
+    name = 'incidecoder'
+    base_url = 'https://incidecoder.com'
+    product_path = '/products/'
+    
+    def discover(self) -> List[str]:
+        scraper = self.scraper
+        if scraper.discovery == 'sitemap':
+            return scraper._sitemap_product_links(self.name, self.base_url, r'/products/')
+        product_links = scraper._incidecoder_brand_product_links(self.base_url)
+        if scraper.frontier:
+            product_links = scraper.frontier.due(product_links, self.name)
+        return product_links
+    
+    def parse(self, url: str, markup: bytes) -> Optional[Dict]:
+        return self.scraper._parse_incidecoder_product_enhanced(
+            self.scraper.parsers.parse(markup, self.name, product_regions))
+    
+    def scrape(self, url: str) -> Optional[Dict]:
+        # Requests first, rendering with Selenium only when the page comes back incomplete
+        return self.scraper._scrape_incidecoder_product_enhanced(url)
+
+
+@SOURCES.register
+class SephoraSource(ProductSource):
+    """Sephora products, found on its skincare category pages"""
+    
+    name = 'sephora'
+    base_url = 'https://www.sephora.com'
+    product_path = '/product/'
+    
+    def discover(self) -> List[str]:
+        scraper = self.scraper
+        product_links = scraper._sephora_category_product_links(self.base_url)
+        if scraper.frontier:
+            product_links = scraper.frontier.due(product_links, self.name)
+        return product_links
+    
+    def parse(self, url: str, markup: bytes) -> Optional[Dict]:
+        product = self.scraper._parse_structured_product_enhanced(markup.decode('utf-8', 'replace'))
+        if self.scraper._is_complete_product(product):
+            return product
+        return self.scraper._parse_sephora_product_enhanced(
+            self.scraper.parsers.parse(markup, self.name, product_regions))
+    
+    def scrape(self, url: str) -> Optional[Dict]:
+        # Requests first, rendering with Selenium only when the page comes back incomplete
+        return self.scraper._scrape_sephora_product_enhanced(url)
 
 def main():
     parser = argparse.ArgumentParser(description='Enhanced Skincare Product Scraper')
     parser.add_argument('--sources', nargs='+', 
-                       choices=['incidecoder', 'sephora'],
+                       choices=SOURCES.names(),
                        default=['incidecoder'],
                        help='Sources to scrape from')
-    parser.add_argument('--method', choices=['api', 'database'],
-                       default='api',
-                       help='Method to add products (api or database)')
+    parser.add_argument('--method', choices=['api', 'database', 'none'],
+                       default=None,
+                       help='Method to add products (api or database; none only scrapes and classifies). '
+                            'Default: api, or none with --replay, which cannot ingest')
     parser.add_argument('--api-url', default='http://localhost:8080/api',
                        help='API base URL')
     parser.add_argument('--db-host', default='localhost',
@@ -566,8 +934,78 @@ def main():
                        help='Maximum number of products to scrape')
     parser.add_argument('--no-selenium', action='store_true',
                        help='Disable Selenium and use requests only')
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='HOST=RATE[:BURST]',
+                       help='Requests per second and burst for a host (repeatable)')
+    parser.add_argument('--cache-dir', default='.http_cache',
+                       help='Directory for the persistent HTTP cache')
+    parser.add_argument('--cache-max-mb', type=int, default=500,
+                       help='Size budget of the HTTP cache in megabytes')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the persistent HTTP cache')
+    parser.add_argument('--frontier', default='crawl_frontier.sqlite',
+                       help='SQLite file tracking discovered product URLs across runs')
+    parser.add_argument('--no-frontier', action='store_true',
+                       help='Fetch every discovered product URL, even if fetched recently')
+    parser.add_argument('--recrawl-after', type=float, default=24.0,
+                       help='Hours after which an already fetched product URL is due again')
+    parser.add_argument('--checkpoint', default='scraper_checkpoint.jsonl',
+                       help='Journal of scraped-but-not-ingested products, which the next run ingests first')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted run, skipping the sources it finished')
+    parser.add_argument('--parser', action='append', default=[], metavar='SOURCE=PARSER',
+                       help='HTML parser for a source: html.parser, lxml or selectolax (repeatable, default lxml)')
+    parser.add_argument('--no-block-resources', action='store_true',
+                       help='Let Chrome download images, fonts, media and third-party trackers')
+    parser.add_argument('--block-types', default=','.join(DEFAULT_BLOCKED_TYPES),
+                       help='Comma-separated resource types to block: image, font, media, stylesheet')
+    parser.add_argument('--block-domain', action='append', default=None, metavar='DOMAIN',
+                       help='Block requests to this domain instead of the built-in tracker list (repeatable)')
+    parser.add_argument('--allow-domain', action='append', default=[], metavar='DOMAIN',
+                       help='Never block this domain, even if it is on the blocked domain list (repeatable)')
+    parser.add_argument('--attach-daemon', action='store_true',
+                       help='Render with the browsers started by browser_daemon.py instead of launching Chrome')
+    parser.add_argument('--daemon-state', default=DEFAULT_STATE_FILE,
+                       help='State file written by browser_daemon.py')
+    parser.add_argument('--driver-cache', default=DEFAULT_DRIVER_CACHE,
+                       help='File caching the chromedriver path so startup needs no network lookup')
+    parser.add_argument('--page-source', action='store_true',
+                       help='Serialize and re-parse rendered pages instead of extracting fields inside the browser')
+    parser.add_argument('--full-parse', action='store_true',
+                       help='Build the whole document tree instead of only the regions the scraper reads')
+    parser.add_argument('--buffer-size', type=int, default=32,
+                       help='Products buffered between the scrape, classify and ingest stages')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Maximum number of page requests in flight at once')
+    parser.add_argument('--per-host-concurrency', type=int, default=None,
+                       help='Maximum number of page requests in flight to one host (default: --concurrency)')
+    parser.add_argument('--drivers', type=int, default=2,
+                       help='Number of pooled Selenium WebDrivers rendering pages concurrently')
+    parser.add_argument('--driver-max-pages', type=int, default=50,
+                       help='Pages a WebDriver renders before it is recycled')
+    parser.add_argument('--strategy-file', default='fetch_strategy.json',
+                       help='File where the learned requests/Selenium choice per site is kept')
+    parser.add_argument('--archive', metavar='DIR',
+                       help='Also write every fetched page to a compressed WARC archive in this directory')
+    parser.add_argument('--replay', metavar='DIR',
+                       help='Re-parse the product pages stored in an --archive directory instead of fetching any')
+    parser.add_argument('--pool-size', type=int, default=None,
+                       help='Keep-alive connections per host (default: --concurrency, at least 10)')
+    parser.add_argument('--host-pool-size', action='append', default=[], metavar='HOST=SIZE',
+                       help='Keep-alive connections for one host, overriding --pool-size (repeatable)')
+    parser.add_argument('--max-retries', type=int, default=3,
+                       help='Retries of a request answered with 429 or 503, after Retry-After or an exponential backoff')
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                       help='Consecutive throttled or failed requests after which a host is paused')
+    parser.add_argument('--breaker-cooldown', type=float, default=60.0,
+                       help='Seconds a paused host gets before it is probed again (doubles each time it re-trips)')
+    parser.add_argument('--discovery', choices=['brands', 'sitemap'], default='brands',
+                       help='Find INCIDecoder products from brand pages or from the site\'s sitemaps')
+    parser.add_argument('--sitemap', action='append', default=[], metavar='URL',
+                       help='Sitemap to read with --discovery sitemap (repeatable, default: those listed in robots.txt)')
     
     args = parser.parse_args()
+    if args.replay and args.method not in (None, 'none'):
+        parser.error("--replay never writes to the backend; drop --method or use --method none")
     
     # Configure database connection
     db_config = {
@@ -582,7 +1020,37 @@ def main():
     scraper = EnhancedSkincareScraper(
         api_base_url=args.api_url,
         db_config=db_config,
-        use_selenium=not args.no_selenium
+        use_selenium=not args.no_selenium,
+        concurrency=args.concurrency,
+        host_rates=dict(parse_host_rate(spec) for spec in args.rate_limit),
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        drivers=args.drivers,
+        driver_max_pages=args.driver_max_pages,
+        strategy_file=args.strategy_file,
+        frontier_path=None if args.no_frontier else args.frontier,
+        recrawl_after_hours=args.recrawl_after,
+        checkpoint_path=args.checkpoint,
+        buffer_size=args.buffer_size,
+        parsers=dict(parse_source_parser(spec) for spec in args.parser),
+        partial_parse=not args.full_parse,
+        in_browser_extraction=not args.page_source,
+        block_resources=not args.no_block_resources,
+        blocked_types=[kind for kind in args.block_types.split(',') if kind],
+        blocked_domains=args.block_domain,
+        allowed_domains=args.allow_domain,
+        daemon_state=args.daemon_state if args.attach_daemon else None,
+        driver_cache=args.driver_cache,
+        archive_dir=args.archive,
+        replay_dir=args.replay,
+        per_host_concurrency=args.per_host_concurrency,
+        pool_size=args.pool_size,
+        host_pool_sizes=dict(parse_pool_size(spec) for spec in args.host_pool_size),
+        max_retries=args.max_retries,
+        breaker_threshold=args.breaker_threshold,
+        breaker_cooldown=args.breaker_cooldown,
+        discovery=args.discovery,
+        sitemap_urls=args.sitemap or None
     )
     
     try:
@@ -590,12 +1058,12 @@ def main():
         scraper.run_scraper(
             sources=args.sources, 
             method=args.method,
-            max_products=args.max_products
+            max_products=args.max_products,
+            resume=args.resume
         )
     finally:
         # Cleanup
-        if scraper.driver:
-            scraper.driver.quit()
+        scraper.close()
 
 if __name__ == "__main__":
     main()
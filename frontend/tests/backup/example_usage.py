@@ -57,9 +57,8 @@ def example_enhanced_scraper():
             max_products=10
         )
     finally:
-        # Cleanup Selenium driver
-        if scraper.driver:
-            scraper.driver.quit()
+        # Cleanup Selenium drivers
+        scraper.close()
 
 def example_custom_scraping():
     """Example of custom scraping with manual product processing"""
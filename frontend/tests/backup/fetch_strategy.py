@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Adaptive fetch strategy for the enhanced scraper
+Remembers, per domain and per URL pattern, whether a plain requests fetch yields a complete
+result or the page has to be rendered with Selenium, so later fetches skip the wasted attempt.
+Only each method's most recent outcomes are kept, so what a site does now outweighs its history
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from rate_limiter import host_key
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = 'requests'
+SELENIUM = 'selenium'
+
+
+def url_pattern(url: str) -> str:
+    """Group URLs by host and first path segment, e.g. incidecoder.com/products/*"""
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    first = segments[0] if segments else ''
+    # Numeric or id-like first segments vary per page, so they do not form a pattern
+    if re.fullmatch(r'[\d\-_]+|[A-Z]\d+', first):
+        first = '*'
+    return f"{host_key(url)}/{first}/*" if segments else f"{host_key(url)}/"
+
+
+class FetchStrategy:
+    """Learns which fetch method produces complete results for each kind of page.
+    `stats` keeps, per domain and URL pattern, the last `window` outcomes of each method (1 for a
+    complete result, 0 for an incomplete one); while pages are rendered, every `reprobe_every`-th
+    fetch of a key tries requests again"""
+
+    def __init__(self, state_file: Optional[str] = None, min_failures: int = 2,
+                 reprobe_every: int = 50, window: int = 20):
+        self.state_file = state_file
+        self.min_failures = min_failures
+        self.reprobe_every = reprobe_every
+        self.window = window
+        self.stats: Dict[str, Dict[str, List[int]]] = {}
+        self._rendered_since_probe: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.stats = {key: self._upgrade(stats) for key, stats in json.load(f).items()}
+            logger.info(f"Loaded fetch strategy for {len(self.stats)} domains and URL patterns")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fetch strategy file {self.state_file}: {e}")
+
+    def _upgrade(self, stats: Dict) -> Dict[str, List[int]]:
+        # Older state files kept lifetime ok/failed counts; keep their ratio over one window
+        for method in (REQUESTS, SELENIUM):
+            ok, failed = stats.pop(f"{method}_ok", 0), stats.pop(f"{method}_failed", 0)
+            if ok or failed:
+                size = min(ok + failed, self.window)
+                kept_ok = round(size * ok / (ok + failed))
+                stats[method] = [1] * kept_ok + [0] * (size - kept_ok)
+        return stats
+
+    def save(self) -> None:
+        """Persist what has been learned so the next run starts with it"""
+        if not self.state_file:
+            return
+        with self._lock:
+            data = json.dumps(self.stats, sort_keys=True)
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.state_file)
+
+    def _needs_rendering(self, key: str) -> Optional[bool]:
+        # Caller holds the lock. None means nothing has been learned about this key yet
+        stats = self.stats.get(key)
+        if not stats:
+            return None
+        outcomes = stats.get(REQUESTS, [])
+        ok, failed = sum(outcomes), len(outcomes) - sum(outcomes)
+        if failed < self.min_failures or ok >= failed:
+            return False if ok or failed else None
+        return True
+
+    def choose(self, url: str) -> str:
+        """Pick the fetch method to try first for a URL"""
+        with self._lock:
+            pattern = url_pattern(url)
+            needs_rendering = self._needs_rendering(pattern)
+            if needs_rendering is None:
+                needs_rendering = self._needs_rendering(host_key(url))
+            if not needs_rendering:
+                return REQUESTS
+
+            # Pages change over time, so occasionally check whether requests works again. The
+            # counter is taken under the lock, so concurrent fetches send exactly one probe
+            key = pattern if pattern in self.stats else host_key(url)
+            rendered = self._rendered_since_probe.get(key, 0) + 1
+            if self.reprobe_every and rendered >= self.reprobe_every:
+                self._rendered_since_probe[key] = 0
+                return REQUESTS
+            self._rendered_since_probe[key] = rendered
+            return SELENIUM
+
+    def record(self, url: str, method: str, complete: bool) -> None:
+        """Record whether a fetch with `method` produced a complete result"""
+        with self._lock:
+            for key in (url_pattern(url), host_key(url)):
+                outcomes = self.stats.setdefault(key, {}).setdefault(method, [])
+                outcomes.append(1 if complete else 0)
+                del outcomes[:-self.window]
+                # A probe that worked is followed straight away by another, so a site that no
+                # longer needs rendering is switched back within a few fetches
+                if method == REQUESTS and complete and key in self._rendered_since_probe:
+                    self._rendered_since_probe[key] = self.reprobe_every
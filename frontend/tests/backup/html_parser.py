@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+HTML parsing backends for the skincare scrapers
+Lets each source pick between BeautifulSoup's html.parser, BeautifulSoup on lxml, and the
+C-based selectolax engine behind the small part of the BeautifulSoup API the scrapers use.
+BeautifulSoup parses can be restricted to the page regions a scraper reads (partial parsing)
+"""
+
+import logging
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from pagination import PAGE_PARAM
+
+logger = logging.getLogger(__name__)
+
+PARSERS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_PARSER = 'lxml'
+
+# Decides from a start tag's name and attributes whether its subtree is built
+Regions = Callable[[str, Dict], bool]
+
+REGION_MARKERS = re.compile(r'ingredient|description|ProductDetail__|ProductPricing__', re.IGNORECASE)
+INGREDIENT_REGION = re.compile(r'ingredient', re.IGNORECASE)
+
+
+def _attr_text(value) -> str:
+    # Multi-valued attributes such as class may arrive as a list or a string
+    if isinstance(value, (list, tuple)):
+        return ' '.join(value)
+    return value or ''
+
+
+def product_regions(name: str, attrs: Dict) -> bool:
+    """Subtrees a product page parse reads: title, brand links, data-at blocks,
+    ingredient/description containers and the retailer title and price spans"""
+    if name == 'h1' or attrs.get('data-at'):
+        return True
+    if name == 'a' and '/brand' in _attr_text(attrs.get('href')):
+        return True
+    return bool(REGION_MARKERS.search(_attr_text(attrs.get('id')) + ' ' + _attr_text(attrs.get('class'))))
+
+
+def listing_regions(name: str, attrs: Dict) -> bool:
+    """Subtrees a listing page parse reads: the product links and the pager links"""
+    href = _attr_text(attrs.get('href'))
+    return name == 'a' and ('/product' in href or bool(PAGE_PARAM.search(href)))
+
+
+def region_texts(soup, pattern=INGREDIENT_REGION, limit: int = 5000) -> Iterator[str]:
+    """Text of the elements whose id, class or data-at matches `pattern`, each capped at `limit`
+    characters; a bounded stand-in for searching the text of the whole document"""
+    for attr in ('id', 'class', 'data-at'):
+        for region in soup.find_all(attrs={attr: pattern}):
+            yield region.get_text()[:limit]
+
+
+def _parser_available(parser: str) -> bool:
+    if parser == 'html.parser':
+        return True
+    try:
+        if parser == 'lxml':
+            import lxml  # noqa: F401
+        elif parser == 'selectolax':
+            import selectolax  # noqa: F401
+        else:
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def available_parsers() -> List[str]:
+    """Parsers that can be used with the installed packages"""
+    return [parser for parser in PARSERS if _parser_available(parser)]
+
+
+class SelectolaxNode:
+    """Wraps a selectolax document or node with the BeautifulSoup calls the scrapers make"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        attributes = getattr(self._node, 'attributes', None) or {}
+        return {key: value or '' for key, value in attributes.items()}
+
+    def get(self, key: str, default=None):
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> str:
+        return self.attrs[key]
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find_all(self, name: Optional[str] = None, attrs: Optional[Dict] = None,
+                 class_: Optional[str] = None, **kwargs) -> List['SelectolaxNode']:
+        """find_all(name, attrs, class_=..., attr=...) with string or compiled-regex values"""
+        attrs = dict(attrs or {}, **kwargs)
+        if class_ is not None:
+            attrs['class'] = class_
+
+        # Plain strings become part of the CSS query; regexes are matched afterwards, like bs4 does
+        selector = name or '*'
+        patterns = {}
+        for key, value in attrs.items():
+            if isinstance(value, re.Pattern):
+                selector += f'[{key}]'
+                patterns[key] = value
+            elif key == 'class':
+                selector += ''.join(f'.{token}' for token in value.split())
+            else:
+                selector += f'[{key}="{value}"]'
+
+        nodes = self.select(selector)
+        if patterns:
+            nodes = [node for node in nodes
+                     if all(pattern.search(node.get(key, '')) for key, pattern in patterns.items())]
+        return nodes
+
+    def find(self, name: Optional[str] = None, attrs: Optional[Dict] = None,
+             class_: Optional[str] = None, **kwargs) -> Optional['SelectolaxNode']:
+        nodes = self.find_all(name, attrs, class_, **kwargs)
+        return nodes[0] if nodes else None
+
+
+def parse_html(markup, parser: str = DEFAULT_PARSER, regions: Optional[Regions] = None):
+    """Parse a page with the given backend; every backend answers find/find_all/select/get_text.
+    With `regions`, BeautifulSoup only builds the matching subtrees (selectolax always parses in full)."""
+    if parser == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(markup))
+    if regions is not None:
+        return BeautifulSoup(markup, parser, parse_only=SoupStrainer(regions))
+    return BeautifulSoup(markup, parser)
+
+
+def parse_source_parser(value: str) -> Tuple[str, str]:
+    """Parse a 'SOURCE=PARSER' command line value"""
+    source, sep, parser = value.partition('=')
+    if not sep or not source:
+        raise ValueError(f"Expected SOURCE=PARSER, got {value!r}")
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser {parser!r}, expected one of {', '.join(PARSERS)}")
+    return source, parser
+
+
+class HTMLParsers:
+    """Chooses the parsing backend per source, falling back to html.parser if one is not installed"""
+
+    def __init__(self, source_parsers: Optional[Dict[str, str]] = None, default: str = DEFAULT_PARSER,
+                 partial: bool = True):
+        self.partial = partial
+        self.source_parsers = {}
+        self.default = self._usable(default)
+        for source, parser in (source_parsers or {}).items():
+            self.source_parsers[source] = self._usable(parser)
+
+    @staticmethod
+    def _usable(parser: str) -> str:
+        if _parser_available(parser):
+            return parser
+        logger.warning(f"HTML parser {parser} is not installed, using html.parser instead")
+        return 'html.parser'
+
+    def parser_for(self, source: str) -> str:
+        return self.source_parsers.get(source, self.default)
+
+    def parse(self, markup, source: str, regions: Optional[Regions] = None):
+        """Parse a page for a source, building only `regions` when partial parsing is on"""
+        return parse_html(markup, self.parser_for(source), regions if self.partial else None)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk HTTP cache for scraped pages
+Stores validators (ETag / Last-Modified) so recrawls can use conditional GETs,
+with least-recently-used eviction once the cache exceeds its size budget.
+A 304 refreshes an entry's validators; a 200 that cannot be revalidated replaces it with nothing
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    """A cached response body and the headers needed to revalidate it"""
+
+    def __init__(self, url: str, body: bytes, headers: Dict[str, str]):
+        self.url = url
+        self.body = body
+        self.headers = headers
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET for this URL into a conditional GET"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """URL-keyed response cache: bodies on disk, metadata in a SQLite index"""
+
+    # Headers kept with the body; everything else is re-sent by the server on a 304 anyway
+    STORED_HEADERS = ('Content-Type', 'Date', 'ETag', 'Last-Modified')
+    # Headers a 304 may update (RFC 9111 section 4.3.4); Content-Type describes the body and is kept
+    REFRESHED_HEADERS = ('Date', 'ETag', 'Last-Modified')
+
+    def __init__(self, cache_dir: str = '.http_cache', max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                file TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self._db.commit()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a URL, or None if it is not cached"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT file, headers FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+            filename, headers = row
+            try:
+                with open(self._path(filename), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                # Body went missing underneath us; forget the entry
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        return CacheEntry(url, body, json.loads(headers))
+
+    def refresh(self, url: str, headers) -> None:
+        """Update a cached entry with the validators and date of a 304 that confirmed it,
+        so the next conditional GET sends what the server handed out last"""
+        with self._lock:
+            row = self._db.execute("SELECT headers FROM entries WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return
+            stored = json.loads(row[0])
+            stored.update({name: headers[name] for name in self.REFRESHED_HEADERS if headers.get(name)})
+            self._db.execute("UPDATE entries SET headers = ?, last_access = ? WHERE url = ?",
+                             (json.dumps(stored), time.time(), url))
+            self._db.commit()
+
+    def store(self, url: str, body: bytes, headers) -> bool:
+        """Cache a response body if it carries a validator; returns whether it was stored.
+        A body that cannot be cached drops any older entry for the URL, which no longer matches it"""
+        kept = {name: headers[name] for name in self.STORED_HEADERS if headers.get(name)}
+        if ('ETag' not in kept and 'Last-Modified' not in kept
+                or 'no-store' in headers.get('Cache-Control', '') or len(body) > self.max_bytes):
+            self.delete(url)
+            return False
+
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.body'
+        tmp_path = self._path(filename + f'.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, self._path(filename))
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, file, headers, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (url, filename, json.dumps(kept), len(body), time.time())
+            )
+            self._db.commit()
+            self._evict()
+        return True
+
+    def delete(self, url: str) -> None:
+        """Forget a URL's cached entry, if there is one"""
+        with self._lock:
+            row = self._db.execute("SELECT file FROM entries WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+            try:
+                os.remove(self._path(row[0]))
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for url, filename, size in self._db.execute(
+                "SELECT url, file, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            try:
+                os.remove(self._path(filename))
+            except OSError:
+                pass
+            total -= size
+            evicted += 1
+        self._db.commit()
+        logger.debug(f"HTTP cache evicted {evicted} entries, now {total} bytes")
+
+    def size(self) -> int:
+        """Total bytes of cached bodies"""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Append-only archive of fetched pages
+Every page the scrapers fetch is kept as a gzip-compressed WARC response record in rotating
+segment files, with a SQLite index of each URL's latest record for random access
+"""
+
+import gzip
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# The body is stored decoded, so the headers describing its transfer encoding no longer apply
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+_SEGMENT = re.compile(r'^pages-(\d{5})\.warc\.gz$')
+
+
+class ArchivedPage:
+    """A stored response: status, headers and decoded body of a URL at fetch time"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, fetched_at: float):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.fetched_at = fetched_at
+
+
+def _warc_record(url: str, status: int, reason: str, headers, body: bytes, fetched_at: float) -> bytes:
+    http_head = f"HTTP/1.1 {status} {reason}\r\n" + ''.join(
+        f"{name}: {value}\r\n" for name, value in headers.items() if name.lower() not in DROPPED_HEADERS
+    ) + "\r\n"
+    payload = http_head.encode('utf-8', errors='replace') + body
+    date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    warc_head = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {date}\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        "Content-Type: application/http; msgtype=response\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n"
+    )
+    return warc_head.encode('utf-8') + payload + b"\r\n\r\n"
+
+
+def _parse_headers(block: bytes) -> Dict[str, str]:
+    headers = {}
+    for line in block.decode('utf-8', errors='replace').split('\r\n'):
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+class PageArchive:
+    """Compressed WARC archive in `directory`. Each record is its own gzip member, so a record can be
+    read by offset without decompressing its neighbours; segments rotate at `segment_bytes`."""
+
+    def __init__(self, directory: str = 'page_archive', segment_bytes: int = 1024 * 1024 * 1024,
+                 compresslevel: int = 6, commit_every: int = 200):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.compresslevel = compresslevel
+        self.commit_every = commit_every
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self._pending = 0
+
+        segments = sorted(name for name in os.listdir(directory) if _SEGMENT.match(name))
+        self._segment_number = int(_SEGMENT.match(segments[-1]).group(1)) if segments else 1
+        self._segment = None
+
+    def _segment_name(self) -> str:
+        return f'pages-{self._segment_number:05d}.warc.gz'
+
+    def _writable_segment(self):
+        # Caller holds the lock
+        if self._segment is None:
+            self._segment = open(os.path.join(self.directory, self._segment_name()), 'ab')
+        if self._segment.tell() >= self.segment_bytes:
+            self._segment.close()
+            self._segment_number += 1
+            self._segment = open(os.path.join(self.directory, self._segment_name()), 'ab')
+        return self._segment
+
+    def store(self, url: str, status: int, headers, body: bytes, fetched_at: Optional[float] = None,
+              reason: str = '') -> None:
+        """Append a response record and point the URL's index entry at it"""
+        fetched_at = fetched_at or time.time()
+        # Compress outside the lock; zlib releases the GIL, so fetch threads compress in parallel
+        record = gzip.compress(_warc_record(url, status, reason, headers, body, fetched_at), self.compresslevel)
+        with self._lock:
+            segment = self._writable_segment()
+            offset = segment.tell()
+            segment.write(record)
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, segment, offset, length, status, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, self._segment_name(), offset, len(record), status, fetched_at)
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._flush()
+
+    def flush(self) -> None:
+        """Make every stored record durable and visible in the index"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds the lock; segment data must be on disk before the index points at it
+        if self._segment is not None:
+            self._segment.flush()
+        self._db.commit()
+        self._pending = 0
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """The latest archived response for a URL, or None if it was never archived"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segment, offset, length, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row and self._segment is not None and row[0] == self._segment_name():
+                self._segment.flush()
+        if not row:
+            return None
+        segment, offset, length, fetched_at = row
+        with open(os.path.join(self.directory, segment), 'rb') as f:
+            f.seek(offset)
+            record = gzip.decompress(f.read(length))
+
+        warc_head, _, rest = record.partition(b"\r\n\r\n")
+        payload = rest[:int(_parse_headers(warc_head)['Content-Length'])]
+        http_head, _, body = payload.partition(b"\r\n\r\n")
+        status_line, _, header_block = http_head.partition(b"\r\n")
+        status = int(status_line.split()[1])
+        return ArchivedPage(url, status, _parse_headers(header_block), body, fetched_at)
+
+    def urls(self, contains: Optional[str] = None) -> Iterator[str]:
+        """Archived URLs in index order, optionally only those containing `contains`"""
+        with self._lock:
+            self._flush()
+            if contains:
+                rows = self._db.execute("SELECT url FROM pages WHERE instr(url, ?) > 0 ORDER BY rowid",
+                                        (contains,)).fetchall()
+            else:
+                rows = self._db.execute("SELECT url FROM pages ORDER BY rowid").fetchall()
+        return (url for url, in rows)
+
+    def stats(self) -> Dict[str, int]:
+        """Indexed pages and compressed bytes on disk"""
+        with self._lock:
+            self._flush()
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        size = sum(os.path.getsize(os.path.join(self.directory, name))
+                   for name in os.listdir(self.directory) if _SEGMENT.match(name))
+        return {'pages': pages, 'bytes': size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._db.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+In-browser field extraction for the Selenium paths
+Runs one script inside the rendered page and returns only the fields a scraper reads,
+instead of serializing the whole DOM with page_source and re-parsing it
+"""
+
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# For each field, tries its selectors in order and returns the first that matches: the text
+# (whitespace-collapsed, or innerText with line breaks for `lines`), an attribute, or for `all`
+# the list of values of every match.
+EXTRACT_FIELDS_SCRIPT = """
+const fields = arguments[0];
+const clean = s => (s || '').replace(/\\s+/g, ' ').trim();
+const read = (el, spec) => {
+    if (spec.attr) { return el.getAttribute(spec.attr); }
+    if (spec.lines) { return (el.innerText || '').slice(0, spec.limit || 5000); }
+    return clean(el.textContent);
+};
+const out = {};
+for (const [key, spec] of Object.entries(fields)) {
+    for (const selector of spec.selectors) {
+        if (spec.all) {
+            const values = Array.from(document.querySelectorAll(selector), el => read(el, spec)).filter(v => v);
+            if (values.length) { out[key] = values; break; }
+        } else {
+            const el = document.querySelector(selector);
+            if (el) { out[key] = read(el, spec); break; }
+        }
+    }
+}
+return out;
+"""
+
+INGREDIENT_REGIONS = "[id*='ingredient' i], [class*='ingredient' i], [data-at*='ingredient' i]"
+
+INCIDECODER_PRODUCT_FIELDS = {
+    'name': {'selectors': ['h1']},
+    'brand': {'selectors': ["a[href*='/brands/']"]},
+    'ingredients': {'selectors': ['div#ingredients a[href*="/ingredients/"]',
+                                  '.ingredients-list a[href*="/ingredients/"]',
+                                  'div[class*="ingredient"] a[href*="/ingredients/"]'], 'all': True},
+    'ingredient_regions': {'selectors': [INGREDIENT_REGIONS], 'all': True, 'lines': True, 'limit': 5000},
+}
+
+SEPHORA_PRODUCT_FIELDS = {
+    'name': {'selectors': ["span[data-at='product_name']", 'h1']},
+    'brand': {'selectors': ["span[data-at='brand_name']", "a[href*='/brand/']"]},
+    'price': {'selectors': ["span[data-at='price']"]},
+    'description': {'selectors': ["div[data-at='product_description']", 'div.description'], 'lines': True},
+}
+
+
+def link_fields(href_fragment: str) -> Dict[str, Dict]:
+    """Fields for a listing page: the href of every anchor linking to `href_fragment`"""
+    return {'links': {'selectors': [f"a[href*='{href_fragment}']"], 'all': True, 'attr': 'href'}}
+
+
+def extract_fields(driver, fields: Dict[str, Dict]) -> Dict:
+    """Read the given fields from the rendered page in a single script call"""
+    try:
+        return driver.execute_script(EXTRACT_FIELDS_SCRIPT, fields) or {}
+    except Exception as e:
+        logger.warning(f"In-browser extraction failed: {e}")
+        return {}
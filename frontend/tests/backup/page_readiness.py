@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Event-driven page readiness for the Selenium paths
+Waits on DOM mutations and network activity inside the page instead of sleeping for a fixed time
+"""
+
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Resolves once a target selector matches and neither the DOM nor the resource list
+# has changed for idleMs, or after timeoutMs. Network idle is approximated by the
+# number of performance resource entries holding still.
+WAIT_FOR_READY_SCRIPT = """
+const [selectors, idleMs, maxSettleMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let lastChange = start;
+let foundAt = null;
+let resources = performance.getEntriesByType('resource').length;
+const observer = new MutationObserver(() => { lastChange = performance.now(); });
+observer.observe(document, {childList: true, subtree: true});
+const check = () => {
+    const now = performance.now();
+    const count = performance.getEntriesByType('resource').length;
+    if (count !== resources) { resources = count; lastChange = now; }
+    if (foundAt === null && selectors.some(s => document.querySelector(s))) { foundAt = now; }
+    const settled = foundAt !== null && (now - lastChange >= idleMs || now - foundAt >= maxSettleMs);
+    if (settled || now - start >= timeoutMs) {
+        observer.disconnect();
+        done(foundAt !== null);
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+# Scrolls to the bottom once and resolves with the anchor count once new anchors have
+# stopped arriving for idleMs, or after timeoutMs without any new anchors.
+SCROLL_ONCE_SCRIPT = """
+const [selector, idleMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let count = document.querySelectorAll(selector).length;
+let lastChange = start;
+window.scrollTo(0, document.body.scrollHeight);
+const check = () => {
+    const now = performance.now();
+    const current = document.querySelectorAll(selector).length;
+    if (current !== count) { count = current; lastChange = now; }
+    const grew = lastChange > start;
+    if ((grew && now - lastChange >= idleMs) || (!grew && now - start >= timeoutMs)) {
+        done(count);
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+
+def wait_until_ready(driver, selectors: List[str], timeout: float = 10.0,
+                     idle: float = 0.3, max_settle: float = 2.0) -> bool:
+    """Block until one of the CSS selectors matches and the page has gone quiet"""
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(
+            WAIT_FOR_READY_SCRIPT, selectors, idle * 1000, max_settle * 1000, timeout * 1000
+        ))
+    except Exception as e:
+        logger.warning(f"Error waiting for page readiness: {e}")
+        return False
+
+
+def scroll_until_stable(driver, anchor_selector: str, max_rounds: int = 10,
+                        idle: float = 0.5, timeout: float = 3.0) -> int:
+    """Scroll an infinite-scroll listing until no new anchors appear; returns the anchor count"""
+    count = 0
+    try:
+        driver.set_script_timeout(timeout + 5)
+        count = driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;", anchor_selector
+        )
+        for _ in range(max_rounds):
+            current = driver.execute_async_script(
+                SCROLL_ONCE_SCRIPT, anchor_selector, idle * 1000, timeout * 1000
+            )
+            if current <= count:
+                break
+            count = current
+    except Exception as e:
+        logger.warning(f"Error scrolling page: {e}")
+    return count
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Listing page pagination
+Finds the other pages of a brand or category listing so they can be fetched side by side,
+filling in the page numbers a pager skips ("1 2 3 ... 12") instead of walking next links one by one
+"""
+
+import re
+from typing import Iterable, List
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters listings use for the page number or item offset
+PAGE_PARAM = re.compile(r'(?:^|[?&])(page|offset|start|p)=(\d+)', re.IGNORECASE)
+
+# Page numbers count from 1, offsets from 0
+FIRST_PAGE = {'page': 1, 'p': 1}
+
+
+def _same_listing(url: str, listing_url: str) -> bool:
+    parts, listing = urlsplit(url), urlsplit(listing_url)
+    return (parts.netloc.lower(), parts.path.rstrip('/')) == (listing.netloc.lower(), listing.path.rstrip('/'))
+
+
+def _is_first_page(url: str) -> bool:
+    """Whether a page URL names the listing's first page, which is the listing URL itself"""
+    match = PAGE_PARAM.search(urlsplit(url).query)
+    return bool(match) and int(match.group(2)) <= FIRST_PAGE.get(match.group(1).lower(), 0)
+
+
+def _with_param(url: str, name: str, value: int) -> str:
+    parts = urlsplit(url)
+    query = [(key, val) for key, val in parse_qsl(parts.query) if key != name] + [(name, str(value))]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def fill_page_range(page_urls: Iterable[str]) -> List[str]:
+    """Every page between the lowest and highest page linked, stepping by the smallest gap
+    between linked page numbers (1 for page indexes, the page size for item offsets)"""
+    page_urls = list(dict.fromkeys(page_urls))
+    numbered = [(match.group(1), int(match.group(2)), url)
+                for url in page_urls for match in [PAGE_PARAM.search(urlsplit(url).query)] if match]
+    names = {name for name, _, _ in numbered}
+    if len(names) != 1 or len(numbered) < 2:
+        return page_urls
+    name = names.pop()
+    values = sorted({value for _, value, _ in numbered})
+    step = min(b - a for a, b in zip(values, values[1:]))
+    template = numbered[0][2]
+    filled = [_with_param(template, name, value) for value in range(values[0], values[-1] + 1, step)]
+    return list(dict.fromkeys(page_urls + filled))
+
+
+def page_links(soup, listing_url: str) -> List[str]:
+    """Links to other pages of the same listing: same host and path, with a page or offset parameter.
+    The first page (page=1, offset=0) is left out, since it is the listing URL already fetched"""
+    pages = []
+    for anchor in soup.select('a[href]'):
+        url = urljoin(listing_url, anchor.get('href')).split('#', 1)[0]
+        if url != listing_url and _same_listing(url, listing_url) and PAGE_PARAM.search(urlsplit(url).query):
+            pages.append(url)
+    return [url for url in fill_page_range(pages) if not _is_first_page(url)]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Process-pool parsing for the basic scraper
+Fetch threads hand raw page bytes to worker processes that parse them and return compact
+product records, so HTML parsing runs on every core instead of contending for the GIL
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from html_parser import parse_html, product_regions
+from structured_data import structured_product
+
+logger = logging.getLogger(__name__)
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity where the platform exposes it)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _price_cents(soup, attrs: Dict) -> int:
+    price_elem = soup.find('span', attrs)
+    if price_elem:
+        price_match = re.search(r'\$?(\d+(?:\.\d{2})?)', price_elem.get_text(strip=True))
+        if price_match:
+            return int(float(price_match.group(1)) * 100)
+    return 0
+
+
+# Parse functions run inside the worker processes, so they are module-level and take and
+# return only plain values. Each returns name, brand, ingredient list and, for retailers, price.
+
+def parse_incidecoder_product(markup: bytes, parser: str, partial: bool) -> Optional[Dict]:
+    soup = parse_html(markup, parser, product_regions if partial else None)
+    name_elem = soup.find('h1')
+    if not name_elem:
+        return None
+    brand_elem = soup.find('a', href=re.compile(r'/brands/'))
+    ingredients_section = soup.find('div', {'id': 'ingredients'})
+    ingredients = ingredients_section.find_all('a', href=re.compile(r'/ingredients/')) if ingredients_section else []
+    return {
+        'name': name_elem.get_text(strip=True),
+        'brand': brand_elem.get_text(strip=True) if brand_elem else "Unknown",
+        'ingredientsList': ", ".join(ing.get_text(strip=True) for ing in ingredients),
+    }
+
+
+def parse_sephora_product(markup: bytes, parser: str, partial: bool) -> Optional[Dict]:
+    # Embedded JSON-LD / app state answers without walking the DOM
+    record = structured_product(markup.decode('utf-8', errors='replace'))
+    if record:
+        return record
+    soup = parse_html(markup, parser, product_regions if partial else None)
+    name_elem = soup.find('h1') or soup.find('span', {'data-at': 'product_name'})
+    if not name_elem:
+        return None
+    brand_elem = soup.find('a', href=re.compile(r'/brand/')) or soup.find('span', {'data-at': 'brand_name'})
+    return {
+        'name': name_elem.get_text(strip=True),
+        'brand': brand_elem.get_text(strip=True) if brand_elem else "Unknown",
+        'price': _price_cents(soup, {'data-at': 'price'}),
+        'ingredientsList': "",
+    }
+
+
+def parse_ulta_product(markup: bytes, parser: str, partial: bool) -> Optional[Dict]:
+    record = structured_product(markup.decode('utf-8', errors='replace'))
+    if record:
+        return record
+    soup = parse_html(markup, parser, product_regions if partial else None)
+    name_elem = soup.find('h1') or soup.find('span', {'class': 'ProductDetail__title'})
+    if not name_elem:
+        return None
+    brand_elem = soup.find('a', href=re.compile(r'/brand/')) or soup.find('span', {'class': 'ProductDetail__brand'})
+    return {
+        'name': name_elem.get_text(strip=True),
+        'brand': brand_elem.get_text(strip=True) if brand_elem else "Unknown",
+        'price': _price_cents(soup, {'class': 'ProductPricing__price'}),
+        'ingredientsList': "",
+    }
+
+
+def _worker_context():
+    """Start method for the workers. The pool starts while fetch, pipeline and rate-limiter threads are
+    running, and forking such a process copies locks those threads hold (logging, sqlite, the import
+    lock) into children that can then deadlock; a fork server or fresh interpreters avoid that."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _importing_main() -> bool:
+    """Whether this process is a worker still importing the parent's main module, as forkserver and
+    spawn workers do before they run any task (the flag multiprocessing's own check uses)"""
+    return getattr(multiprocessing.current_process(), '_inheriting', False)
+
+
+class ParsePool:
+    """Runs parse functions in a process pool sized to the available cores. With 0 workers, or
+    once the pool has broken (e.g. a worker was killed), parsing happens in the calling thread.
+
+    Workers re-import the script that created the pool, so its entry point must sit under
+    `if __name__ == '__main__':`. Without the guard every worker would start the crawl again;
+    instead, creating a pool while a worker imports the script raises, the worker exits, and the
+    parent falls back to parsing in-process."""
+
+    def __init__(self, workers: Optional[int] = None):
+        if _importing_main():
+            raise RuntimeError("Parse worker is re-running the main script; "
+                               "guard the script's entry point with if __name__ == '__main__':")
+        self.workers = available_cores() if workers is None else workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def parse(self, parse_fn: Callable, markup: bytes, *args) -> Optional[Dict]:
+        """Parse one page, blocking the calling fetch thread until a worker returns the record"""
+        if self.workers <= 0:
+            return parse_fn(markup, *args)
+        with self._lock:
+            if self._executor is None:
+                # Started on first use so runs that never parse a page never spawn workers
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_worker_context())
+                logger.info(f"Parsing pages in {self.workers} worker processes")
+            executor = self._executor
+        try:
+            return executor.submit(parse_fn, markup, *args).result()
+        except BrokenProcessPool as e:
+            logger.error(f"Parse worker pool broke, parsing in-process from now on "
+                         f"(is the script's entry point guarded by if __name__ == '__main__'?): {e}")
+            self.workers = 0
+            return parse_fn(markup, *args)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
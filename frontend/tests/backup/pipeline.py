@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Streaming scrape -> classify -> ingest pipeline
+Each stage runs in its own thread with a bounded buffer in front of it, so products are ingested
+while later pages are still being fetched and memory stays constant regardless of crawl size.
+Several sources can feed the pipeline at once through merge_streams
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+Stage = Tuple[str, Callable[[Any], Optional[Any]]]
+
+
+class StreamingPipeline:
+    """Feeds items from a source iterable through a chain of stages over bounded queues"""
+
+    def __init__(self, buffer_size: int = 32):
+        self.buffer_size = buffer_size
+
+    def run(self, source: Iterable[Any], stages: List[Stage]) -> Dict[str, int]:
+        """Run the pipeline to completion and return how many items each stage passed on.
+        A stage drops an item by returning None or False."""
+        buffers = [queue.Queue(maxsize=self.buffer_size) for _ in range(len(stages) + 1)]
+        counts = {'source': 0}
+        counts.update({name: 0 for name, _ in stages})
+
+        def produce() -> None:
+            try:
+                for item in source:
+                    buffers[0].put(item)
+                    counts['source'] += 1
+            except Exception as e:
+                logger.error(f"Pipeline source failed: {e}")
+            finally:
+                buffers[0].put(_DONE)
+
+        def process(index: int, name: str, fn: Callable[[Any], Optional[Any]]) -> None:
+            inbox, outbox = buffers[index], buffers[index + 1]
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    outbox.put(_DONE)
+                    return
+                try:
+                    result = fn(item)
+                except Exception as e:
+                    logger.error(f"Pipeline stage {name} failed: {e}")
+                    continue
+                if result is None or result is False:
+                    continue
+                counts[name] += 1
+                outbox.put(result)
+
+        threads = [threading.Thread(target=produce, name='pipeline-source', daemon=True)]
+        threads += [threading.Thread(target=process, args=(index, name, fn),
+                                     name=f'pipeline-{name}', daemon=True)
+                    for index, (name, fn) in enumerate(stages)]
+        for thread in threads:
+            thread.start()
+
+        # Drain the last buffer so the final stage never blocks
+        while buffers[-1].get() is not _DONE:
+            pass
+        for thread in threads:
+            thread.join()
+        return counts
+
+
+def merge_streams(streams: Dict[str, Callable[[], Iterable[Any]]], buffer_size: int = 32,
+                  on_done: Optional[Callable[[str, int], None]] = None) -> Iterator[Any]:
+    """Run each named stream in its own thread and yield their items as they arrive, so the streams
+    take as long as the slowest of them. `on_done(name, count)` is called, from the consuming thread,
+    once every item of a stream has been yielded."""
+    if not streams:
+        return
+    merged: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def put(entry: Tuple[str, Any]) -> bool:
+        # Blocks while the consumer is behind, holding back every stream (backpressure)
+        while not stopped.is_set():
+            try:
+                merged.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(name: str, stream: Callable[[], Iterable[Any]]) -> None:
+        items = None
+        try:
+            items = iter(stream())
+            for item in items:
+                if not put((name, item)):
+                    break
+        except Exception as e:
+            logger.error(f"Stream {name} failed: {e}")
+        finally:
+            close = getattr(items, 'close', None)
+            if close:
+                close()
+            put((name, _DONE))
+
+    threads = [threading.Thread(target=drain, args=(name, stream), name=f'stream-{name}', daemon=True)
+               for name, stream in streams.items()]
+    for thread in threads:
+        thread.start()
+
+    counts = {name: 0 for name in streams}
+    running = len(threads)
+    try:
+        while running:
+            name, item = merged.get()
+            if item is _DONE:
+                running -= 1
+                if on_done:
+                    on_done(name, counts[name])
+                continue
+            counts[name] += 1
+            yield item
+    finally:
+        # Also reached when the consumer stops early: let the streams wind down
+        stopped.set()
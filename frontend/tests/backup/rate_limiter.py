@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting for the skincare scrapers
+Every fetch path acquires a token before hitting a host, so a crawl runs at exactly the allowed rate
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size for each scraped host
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'incidecoder.com': (1.0, 3),
+    'sephora.com': (0.5, 2),
+    'ulta.com': (0.5, 2),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills at `rate` tokens per second up to `burst`.
+    `clock` returns the current time in seconds (time.monotonic unless a test fixes it)."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens may go negative: each waiting caller owns a distinct future slot
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least `seconds`, e.g. to honor a Retry-After"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time spent waiting"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def host_key(url: str) -> str:
+    """Normalize a URL or bare host name to the key used for rate limiting"""
+    host = urlparse(url).hostname if '//' in url else url.split(':')[0]
+    host = (host or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def parse_host_rate(spec: str) -> Tuple[str, Tuple[float, int]]:
+    """Parse a HOST=RATE[:BURST] command line value"""
+    try:
+        host, limits = spec.split('=', 1)
+        rate, _, burst = limits.partition(':')
+        return host_key(host), (float(rate), int(burst) if burst else 1)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit '{spec}', expected HOST=RATE[:BURST]")
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host, created lazily from the configured rates"""
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_rate: float = 2.0, default_burst: int = 2):
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        for host, limits in (host_rates or {}).items():
+            self.host_rates[host_key(host)] = limits
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, host: str) -> Tuple[float, int]:
+        # Subdomains share their parent's budget (m.sephora.com -> sephora.com)
+        for configured, limits in self.host_rates.items():
+            if host == configured or host.endswith('.' + configured):
+                return limits
+        return self.default_rate, self.default_burst
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the token bucket governing requests to the URL's host"""
+        host = host_key(url)
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self._limits_for(host)
+                bucket = self.buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Stop all requests to the URL's host for `seconds`"""
+        self.bucket_for(url).pause(seconds)
+        logger.debug(f"Pausing {host_key(url)} for {seconds:.2f}s")
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL's host is allowed"""
+        waited = self.bucket_for(url).acquire()
+        if waited > 1:
+            logger.debug(f"Rate limiter held {host_key(url)} for {waited:.2f}s")
+        return waited
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session for the skincare scrapers
+Every request made through the session passes through the per-host rate limiter,
+and GETs are revalidated against the on-disk HTTP cache when one is configured.
+In replay mode GETs are answered from a page archive and nothing reaches the network
+"""
+
+import logging
+import sqlite3
+from http.client import responses
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from circuit_breaker import RETRY_STATUSES, HostCircuitBreakers, backoff_delay, retry_after_seconds
+from http_cache import CacheEntry, HTTPCache
+from page_archive import PageArchive
+from rate_limiter import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayError(OSError):
+    """Raised instead of sending a request that a replay cannot answer from its archive"""
+
+
+class ScraperSession(requests.Session):
+    """requests.Session that waits for a rate-limit token before each request.
+    `user_agent` is called once, on the first request, to pick the User-Agent header.
+    Throttled (429/503) responses are retried up to `max_retries` times, waiting at most
+    `max_retry_wait` seconds each, and hosts that keep throttling are cut off by `breakers`.
+    With an `archive`, every page fetched with GET (cached or not) is also written to it.
+    With `replay`, GETs are served from that archive instead (404 for pages it does not hold)
+    and any other request raises ReplayError."""
+
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None,
+                 cache: Optional[HTTPCache] = None, user_agent: Optional[Callable[[], str]] = None,
+                 breakers: Optional[HostCircuitBreakers] = None, max_retries: int = 3,
+                 max_retry_wait: float = 120.0, metrics=None, archive: Optional[PageArchive] = None,
+                 replay: Optional[PageArchive] = None):
+        super().__init__()
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.cache = cache
+        self.breakers = breakers or HostCircuitBreakers(metrics=metrics)
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.metrics = metrics
+        self.archive = archive
+        self.replay = replay
+        self._user_agent = user_agent
+        self._user_agent_lock = threading.Lock()
+
+    def _resolve_user_agent(self) -> None:
+        with self._user_agent_lock:
+            if self._user_agent:
+                self.headers['User-Agent'] = self._user_agent()
+                self._user_agent = None
+
+    def request(self, method, url, *args, **kwargs):
+        if self.replay is not None:
+            if method.upper() != 'GET':
+                raise ReplayError(f"Replay does not send {method.upper()} requests: {url}")
+            return self._replayed_response(url)
+        if self._user_agent:
+            self._resolve_user_agent()
+        if method.upper() != 'GET' or kwargs.get('stream'):
+            return self._send(method, url, *args, **kwargs)
+        response = self._get(url, *args, **kwargs)
+        if self.archive is not None:
+            try:
+                self.archive.store(url, response.status_code, response.headers, response.content,
+                                   time.time(), response.reason or '')
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Could not archive {url}: {e}")
+        return response
+
+    def _get(self, url, *args, **kwargs) -> requests.Response:
+        """GET through the HTTP cache, if one is configured"""
+        if self.cache is None:
+            return self._send('GET', url, *args, **kwargs)
+
+        entry = self.cache.get(url)
+        if entry:
+            kwargs['headers'] = {**entry.conditional_headers(), **(kwargs.get('headers') or {})}
+
+        response = self._send('GET', url, *args, **kwargs)
+
+        if response.status_code == 304 and entry:
+            logger.debug(f"Cache revalidated {url}")
+            self.cache.refresh(url, response.headers)
+            return self._cached_response(entry, response)
+        if response.status_code == 200:
+            self.cache.store(url, response.content, response.headers)
+        return response
+
+    def _send(self, method, url, *args, **kwargs) -> requests.Response:
+        """Send a rate-limited request, retrying throttled responses after Retry-After or a
+        jittered exponential backoff. Raises CircuitOpenError while the host's circuit is open."""
+        attempt = 0
+        while True:
+            self.breakers.check(url)
+            self.rate_limiter.acquire(url)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException:
+                self.breakers.record_failure(url)
+                raise
+            if response.status_code not in RETRY_STATUSES:
+                self.breakers.record_success(url)
+                return response
+
+            self._count('http_throttled')
+            retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            opened = self.breakers.record_failure(url, retry_after)
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            if opened or attempt >= self.max_retries or delay > self.max_retry_wait:
+                return response
+            # Every request to the host waits, not only this retry
+            self.rate_limiter.pause(url, delay)
+            self._count('http_retries')
+            self._count('http_retry_wait_seconds', delay)
+            logger.debug(f"{response.status_code} from {url}, retrying in {delay:.1f}s")
+            response.close()
+            attempt += 1
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        if self.metrics:
+            self.metrics.increment(name, amount)
+
+    def _replayed_response(self, url: str) -> requests.Response:
+        """Build the response to a GET from the replay archive"""
+        page = self.replay.get(url)
+        self._count('replay_hits' if page else 'replay_misses')
+        response = requests.Response()
+        response.url = url
+        if page is None:
+            response.status_code = 404
+            response.reason = 'Not Archived'
+            response._content = b''
+            return response
+        response.status_code = page.status
+        response.reason = responses.get(page.status, '')
+        response.headers = CaseInsensitiveDict(page.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = page.body
+        response.from_archive = True
+        return response
+
+    @staticmethod
+    def _cached_response(entry: CacheEntry, not_modified: requests.Response) -> requests.Response:
+        """Build a 200 response from a cache entry confirmed by a 304"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry.url
+        # Only the validators of a 304 describe the cached body; its framing headers do not
+        response.headers = CaseInsensitiveDict(entry.headers)
+        for name in HTTPCache.REFRESHED_HEADERS:
+            if not_modified.headers.get(name):
+                response.headers[name] = not_modified.headers[name]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response._content = entry.body
+        response.from_cache = True
+        return response
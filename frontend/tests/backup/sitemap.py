@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Sitemap-driven product discovery
+Streams a site's sitemap XML (following sitemap indexes and gzipped files) and yields every page
+URL with its lastmod, without holding the documents in memory
+"""
+
+import gzip
+import io
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """W3C datetime ('2024-05-01' or '2024-05-01T10:00:00+00:00') as a Unix timestamp"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iter_sitemap(stream) -> Iterator[Tuple[str, str, Optional[float]]]:
+    """(kind, loc, lastmod) for each <url> or <sitemap> entry of a sitemap or sitemap index.
+    Entries are dropped from the tree as soon as they are read, so memory stays flat."""
+    root = None
+    loc = lastmod = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end':
+            continue
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if tag == 'loc':
+            loc = (elem.text or '').strip()
+        elif tag == 'lastmod':
+            lastmod = parse_lastmod(elem.text)
+        elif tag in ('url', 'sitemap'):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            root.clear()
+
+
+def sitemap_locations(session, base_url: str) -> List[str]:
+    """Sitemaps the site declares in robots.txt, or /sitemap.xml if it declares none"""
+    try:
+        response = session.get(urljoin(base_url, '/robots.txt'), timeout=30)
+        if response.status_code == 200:
+            declared = [line.split(':', 1)[1].strip() for line in response.text.splitlines()
+                        if line.lower().startswith('sitemap:')]
+            if declared:
+                return declared
+    except OSError as e:
+        logger.warning(f"Could not read robots.txt of {base_url}: {e}")
+    return [urljoin(base_url, '/sitemap.xml')]
+
+
+def _open_sitemap(session, url: str):
+    """Streaming response for a sitemap and a reader over its XML, gunzipping .xml.gz files"""
+    response = session.get(url, stream=True, timeout=60)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    # Keep the raw stream open at EOF so the buffered reader can still drain what it read ahead
+    response.raw.auto_close = False
+    reader = io.BufferedReader(response.raw)
+    if reader.peek(2)[:2] == b'\x1f\x8b':
+        reader = gzip.GzipFile(fileobj=reader)
+    return response, reader
+
+
+def sitemap_entries(session, sitemap_urls: Iterable[str],
+                    url_pattern: Optional[Pattern] = None) -> Iterator[Tuple[str, Optional[float]]]:
+    """Stream (url, lastmod) for every page listed in the sitemaps, following sitemap indexes.
+    Only URLs matching `url_pattern` are yielded; unreadable sitemaps are logged and skipped."""
+    pending = list(sitemap_urls)
+    read = set()
+    while pending:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in read:
+            continue
+        read.add(sitemap_url)
+        try:
+            response, reader = _open_sitemap(session, sitemap_url)
+            with response:
+                for kind, loc, lastmod in iter_sitemap(reader):
+                    if kind == 'sitemap':
+                        pending.append(loc)
+                    elif url_pattern is None or url_pattern.search(loc):
+                        yield loc, lastmod
+        except (OSError, ET.ParseError) as e:
+            logger.error(f"Error reading sitemap {sitemap_url}: {e}")
@@ -4,19 +4,32 @@ Skincare Product Web Scraper
 Scrapes skincare products from multiple sources and injects them into the database via API
 """
 
-import requests
 import json
 import time
 import random
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import mysql.connector
-from mysql.connector import Error
 import logging
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 import argparse
 import sys
+from async_crawler import AsyncCrawlEngine
+from pipeline import StreamingPipeline, merge_streams
+from checkpoint import CheckpointJournal, checkpointed
+from circuit_breaker import HostCircuitBreakers
+from crawl_frontier import CrawlFrontier, content_hash, track
+from crawl_metrics import CrawlMetrics
+from html_parser import HTMLParsers, listing_regions, parse_source_parser
+from http_cache import HTTPCache
+from page_archive import PageArchive
+from pagination import page_links
+from parse_pool import ParsePool, parse_incidecoder_product, parse_sephora_product, parse_ulta_product
+from rate_limiter import HostRateLimiter, host_key, parse_host_rate
+from scraper_session import ScraperSession
+from sitemap import sitemap_entries, sitemap_locations
+from sources import ProductSource, SourceRegistry
+from transport import DEFAULT_POOL_SIZE, configure_transport, connection_stats, parse_pool_size
+from url_dedup import SeenSet, canonicalize_url, dedupe_urls
 
 # Configure logging
 logging.basicConfig(
@@ -29,9 +42,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sources this scraper can crawl; the plugins are registered below the scraper class
+SOURCES = SourceRegistry()
+
 class SkincareScraper:
     def __init__(self, api_base_url: str = "http://localhost:8080/api", 
-                 db_config: Optional[Dict] = None):
+                 db_config: Optional[Dict] = None, concurrency: int = 8,
+                 host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 cache_dir: Optional[str] = None, cache_max_mb: int = 500,
+                 frontier_path: Optional[str] = None, recrawl_after_hours: float = 24.0,
+                 checkpoint_path: Optional[str] = None, buffer_size: int = 32,
+                 parsers: Optional[Dict[str, str]] = None, partial_parse: bool = True,
+                 brand_budget: int = 100, brand_pages: int = 10, parse_workers: Optional[int] = None,
+                 discovery: str = 'brands', sitemap_urls: Optional[List[str]] = None,
+                 max_retries: int = 3, breaker_threshold: int = 5, breaker_cooldown: float = 60.0,
+                 pool_size: Optional[int] = None, host_pool_sizes: Optional[Dict[str, int]] = None,
+                 archive_dir: Optional[str] = None, replay_dir: Optional[str] = None,
+                 per_host_concurrency: Optional[int] = None):
+        # Created first: in a parse worker re-running an unguarded script it raises before any
+        # state (cache, frontier, archive) is opened
+        self.parse_pool = ParsePool(parse_workers)
         self.api_base_url = api_base_url
         self.db_config = db_config or {
             'host': 'localhost',
@@ -40,268 +70,189 @@ class SkincareScraper:
             'user': 'root',
             'password': ''
         }
-        self.session = requests.Session()
+        # Our own API gets a generous budget so ingestion is never the bottleneck
+        host_rates = dict(host_rates or {})
+        host_rates.setdefault(host_key(api_base_url), (20.0, 10))
+        self.rate_limiter = HostRateLimiter(host_rates)
+        self.cache = HTTPCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+        self.metrics = CrawlMetrics()
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        # A replay re-parses archived pages: nothing is fetched and the crawl state is left untouched
+        self.replay = PageArchive(replay_dir) if replay_dir else None
+        if self.replay:
+            frontier_path = checkpoint_path = None
+        # Throttling hosts are retried with backoff and, if they keep at it, paused
+        self.session = ScraperSession(
+            self.rate_limiter, self.cache,
+            breakers=HostCircuitBreakers(breaker_threshold, breaker_cooldown, metrics=self.metrics),
+            max_retries=max_retries, metrics=self.metrics, archive=self.archive, replay=self.replay
+        )
+        self.frontier = CrawlFrontier(frontier_path, recrawl_after_hours) if frontier_path else None
+        self.checkpoint = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+        # Canonical product URLs already scheduled this run, shared by every source
+        self.seen_urls = SeenSet()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # One set of keep-alive pools serves every source, sized so fetch threads never queue for a socket
+        configure_transport(self.session, pool_size or max(concurrency, DEFAULT_POOL_SIZE), host_pool_sizes)
+        self.crawl_engine = AsyncCrawlEngine(concurrency=concurrency, per_host_concurrency=per_host_concurrency)
+        self.buffer_size = buffer_size
+        self.parsers = HTMLParsers(parsers, partial=partial_parse)
+        self.brand_budget = brand_budget
+        self.brand_pages = brand_pages
+        self.discovery = discovery
+        self.sitemap_urls = sitemap_urls
+        self.sources = SOURCES.create(self)
         
-    def scrape_incidecoder(self, max_pages: int = 10) -> List[Dict]:
-        """Scrape products from INCIDecoder"""
-        products = []
-        base_url = "https://incidecoder.com"
-        
-        # Popular brands to scrape
-        brands = [
-            "the-ordinary", "cerave", "la-roche-posay", "neutrogena", 
-            "paulas-choice", "skinceuticals", "clinique", "kiehls",
-            "innisfree", "cosrx", "laneige", "etude-house", "numbuzin",
-            "vt-cosmetics", "aprilskin", "the-saem", "neogen", "amplen"
-        ]
-        
-        for brand in brands:
-            try:
-                logger.info(f"Scraping brand: {brand}")
-                brand_url = f"{base_url}/brands/{brand}"
-                
-                response = self.session.get(brand_url)
-                if response.status_code != 200:
-                    continue
-                    
-                soup = BeautifulSoup(response.content, 'html.parser')
-                product_links = soup.find_all('a', href=re.compile(r'/products/'))
-                
-                for link in product_links[:20]:  # Limit per brand
-                    product_url = urljoin(base_url, link['href'])
-                    product_data = self._scrape_incidecoder_product(product_url)
-                    if product_data:
-                        products.append(product_data)
-                        time.sleep(random.uniform(1, 3))  # Be respectful
-                        
-            except Exception as e:
-                logger.error(f"Error scraping brand {brand}: {e}")
-                
-        return products
-    
-    def _scrape_incidecoder_product(self, url: str) -> Optional[Dict]:
-        """Scrape individual product from INCIDecoder"""
+    def _scrape_listing_page(self, source: str, page_url: str, base_url: str,
+                             href_pattern: str) -> Tuple[str, List[str], List[str]]:
+        """Product links and links to further pages from one page of a brand or category listing"""
         try:
-            response = self.session.get(url)
+            response = self.session.get(page_url)
             if response.status_code != 200:
-                return None
+                return page_url, [], []
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            name_elem = soup.find('h1')
-            if not name_elem:
-                return None
-            name = name_elem.get_text(strip=True)
-            
-            # Extract brand
-            brand_elem = soup.find('a', href=re.compile(r'/brands/'))
-            brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-            
-            # Extract ingredients
-            ingredients_section = soup.find('div', {'id': 'ingredients'})
-            ingredients_list = ""
-            if ingredients_section:
-                ingredients = ingredients_section.find_all('a', href=re.compile(r'/ingredients/'))
-                ingredients_list = ", ".join([ing.get_text(strip=True) for ing in ingredients])
-            
-            # Extract star ingredients (first 3-5 ingredients)
-            star_ingredients = ""
-            if ingredients_list:
-                all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
-                star_ingredients = ", ".join(all_ingredients[:5])
-            
-            # Determine product type from name
-            product_type = self._determine_product_type(name)
-            
-            # Generate random price (you can modify this logic)
-            price = random.randint(500, 5000)
-            
-            return {
-                'name': name,
-                'brand': brand,
-                'ingredientsList': ingredients_list,
-                'starIngredients': star_ingredients,
-                'productType': product_type,
-                'price': price
-            }
+            soup = self.parsers.parse(response.content, source, listing_regions)
+            product_links = soup.find_all('a', href=re.compile(href_pattern))
+            return (page_url, dedupe_urls(urljoin(base_url, link['href']) for link in product_links),
+                    page_links(soup, page_url))
             
         except Exception as e:
-            logger.error(f"Error scraping product {url}: {e}")
-            return None
+            logger.error(f"Error scraping listing {page_url}: {e}")
+            return page_url, [], []
+    
+    def _discover_product_links(self, source: str, listing_urls: List[str], base_url: str,
+                                href_pattern: str, limit: int, max_pages: int = 1) -> List[List[str]]:
+        """Product links of each listing, up to `limit` per listing. Pages are fetched in waves:
+        every listing's first page, then all further pages their pagers link to, concurrently,
+        until a listing reaches its budget of links or `max_pages` pages"""
+        links = {url: [] for url in listing_urls}
+        visited = {url: {url} for url in listing_urls}
+        owner = {url: url for url in listing_urls}
+        wave = list(listing_urls)
+        while wave:
+            results = self.crawl_engine.crawl(
+                wave, lambda url: self._scrape_listing_page(source, url, base_url, href_pattern)
+            )
+            wave, scheduled = [], {}
+            for page_url, product_links, next_pages in results:
+                listing = owner[page_url]
+                links[listing] = dedupe_urls(links[listing] + product_links)
+                # Schedule only as many pages as the links seen per page suggest the budget needs
+                per_page = max(1, len(product_links))
+                needed = -(-(limit - len(links[listing])) // per_page) - scheduled.get(listing, 0)
+                for next_page in next_pages:
+                    if needed <= 0 or len(visited[listing]) >= max_pages:
+                        break
+                    if next_page not in visited[listing]:
+                        visited[listing].add(next_page)
+                        owner[next_page] = listing
+                        wave.append(next_page)
+                        scheduled[listing] = scheduled.get(listing, 0) + 1
+                        needed -= 1
+        pages = sum(len(pages) for pages in visited.values())
+        logger.info(f"Read {pages} listing pages for {len(listing_urls)} {source} listings")
+        return [links[url][:limit] for url in listing_urls]
+    
+    def _listing_product_urls(self, source: str, listing_urls: List[str], base_url: str,
+                              href_pattern: str, limit: int, max_pages: int = 1) -> List[str]:
+        """Crawl listing pages for the product pages that are new or stale"""
+        link_lists = self._discover_product_links(source, listing_urls, base_url, href_pattern, limit, max_pages)
+        found = [url for links in link_lists for url in links]
+        product_urls = self.seen_urls.claim(found)
+        logger.info(f"Found {len(product_urls)} new product links on {len(listing_urls)} listing pages "
+                    f"({len(found) - len(product_urls)} already seen)")
+        if self.frontier:
+            product_urls = self.frontier.due(product_urls, source)
+        return product_urls
+    
+    def _sitemap_product_urls(self, source: str, base_url: str, url_pattern: str) -> List[str]:
+        """Discover product pages from the site's sitemaps, keeping the new or changed ones"""
+        sitemaps = self.sitemap_urls or sitemap_locations(self.session, base_url)
+        logger.info(f"Reading {source} sitemaps: {', '.join(sitemaps)}")
+        entries = ((canonicalize_url(url), lastmod)
+                   for url, lastmod in sitemap_entries(self.session, sitemaps, re.compile(url_pattern))
+                   if self.seen_urls.add(url))
+        if self.frontier:
+            product_urls = self.frontier.seed(entries, source)
+        else:
+            product_urls = [url for url, _ in entries]
+        logger.info(f"Scheduling {len(product_urls)} {source} product pages from the sitemap")
+        return product_urls
+    
+    def _stream_products(self, source: str, product_urls: List[str], scrape_product) -> Iterator[Dict]:
+        """Scrape product pages through the async engine, recording them in the frontier and checkpoint"""
+        return self.crawl_engine.stream(
+            product_urls, checkpointed(self.checkpoint, source, track(self.frontier, scrape_product)),
+            buffer_size=self.buffer_size
+        )
+    
+    def _crawl_source(self, source: ProductSource) -> Iterator[Dict]:
+        """Stream the products of a source; a replay re-parses its archived pages instead of discovering them"""
+        if self.replay:
+            host = host_key(source.base_url)
+            product_urls = [url for url in self.replay.urls(source.product_path) if host_key(url) == host]
+            logger.info(f"Replaying {len(product_urls)} archived {source.name} product pages")
+        else:
+            product_urls = source.discover()
+        return self._stream_products(source.name, product_urls, source.scrape)
+    
+    def scrape_incidecoder(self, max_pages: int = 10) -> List[Dict]:
+        """Scrape products from INCIDecoder"""
+        return list(self.iter_incidecoder())
+    
+    def iter_incidecoder(self) -> Iterator[Dict]:
+        """Stream products from INCIDecoder as they are scraped"""
+        return self._crawl_source(self.sources['incidecoder'])
+    
+    def _scrape_incidecoder_product(self, url: str) -> Optional[Dict]:
+        """Scrape individual product from INCIDecoder"""
+        return self.sources['incidecoder'].scrape(url)
     
     def scrape_sephora(self, max_pages: int = 5) -> List[Dict]:
         """Scrape products from Sephora (basic implementation)"""
-        products = []
-        base_url = "https://www.sephora.com"
-        
-        # Sephora skincare categories
-        categories = [
-            "/shop/skincare-cleansers",
-            "/shop/skincare-moisturizers", 
-            "/shop/skincare-serums",
-            "/shop/skincare-sunscreen"
-        ]
-        
-        for category in categories:
-            try:
-                logger.info(f"Scraping Sephora category: {category}")
-                category_url = base_url + category
-                
-                response = self.session.get(category_url)
-                if response.status_code != 200:
-                    continue
-                    
-                soup = BeautifulSoup(response.content, 'html.parser')
-                product_links = soup.find_all('a', href=re.compile(r'/product/'))
-                
-                for link in product_links[:10]:  # Limit per category
-                    product_url = urljoin(base_url, link['href'])
-                    product_data = self._scrape_sephora_product(product_url)
-                    if product_data:
-                        products.append(product_data)
-                        time.sleep(random.uniform(2, 4))
-                        
-            except Exception as e:
-                logger.error(f"Error scraping Sephora category {category}: {e}")
-                
-        return products
+        return list(self.iter_sephora())
+    
+    def iter_sephora(self) -> Iterator[Dict]:
+        """Stream products from Sephora as they are scraped"""
+        return self._crawl_source(self.sources['sephora'])
     
     def _scrape_sephora_product(self, url: str) -> Optional[Dict]:
         """Scrape individual product from Sephora"""
-        try:
-            response = self.session.get(url)
-            if response.status_code != 200:
-                return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            name_elem = soup.find('h1') or soup.find('span', {'data-at': 'product_name'})
-            if not name_elem:
-                return None
-            name = name_elem.get_text(strip=True)
-            
-            # Extract brand
-            brand_elem = soup.find('a', href=re.compile(r'/brand/')) or soup.find('span', {'data-at': 'brand_name'})
-            brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-            
-            # Extract price
-            price_elem = soup.find('span', {'data-at': 'price'})
-            price = 0
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price_match = re.search(r'\$?(\d+(?:\.\d{2})?)', price_text)
-                if price_match:
-                    price = int(float(price_match.group(1)) * 100)  # Convert to cents
-            
-            # For Sephora, we'll need to get ingredients from product description
-            # This is a simplified version
-            ingredients_list = ""
-            star_ingredients = ""
-            
-            # Determine product type
-            product_type = self._determine_product_type(name)
-            
-            return {
-                'name': name,
-                'brand': brand,
-                'ingredientsList': ingredients_list,
-                'starIngredients': star_ingredients,
-                'productType': product_type,
-                'price': price
-            }
-            
-        except Exception as e:
-            logger.error(f"Error scraping Sephora product {url}: {e}")
-            return None
+        return self.sources['sephora'].scrape(url)
     
     def scrape_ulta(self, max_pages: int = 5) -> List[Dict]:
         """Scrape products from Ulta Beauty"""
-        products = []
-        base_url = "https://www.ulta.com"
-        
-        # Ulta skincare categories
-        categories = [
-            "/shop/skincare/cleansers",
-            "/shop/skincare/moisturizers",
-            "/shop/skincare/serums",
-            "/shop/skincare/sunscreen"
-        ]
-        
-        for category in categories:
-            try:
-                logger.info(f"Scraping Ulta category: {category}")
-                category_url = base_url + category
-                
-                response = self.session.get(category_url)
-                if response.status_code != 200:
-                    continue
-                    
-                soup = BeautifulSoup(response.content, 'html.parser')
-                product_links = soup.find_all('a', href=re.compile(r'/product/'))
-                
-                for link in product_links[:10]:
-                    product_url = urljoin(base_url, link['href'])
-                    product_data = self._scrape_ulta_product(product_url)
-                    if product_data:
-                        products.append(product_data)
-                        time.sleep(random.uniform(2, 4))
-                        
-            except Exception as e:
-                logger.error(f"Error scraping Ulta category {category}: {e}")
-                
-        return products
+        return list(self.iter_ulta())
+    
+    def iter_ulta(self) -> Iterator[Dict]:
+        """Stream products from Ulta Beauty as they are scraped"""
+        return self._crawl_source(self.sources['ulta'])
     
     def _scrape_ulta_product(self, url: str) -> Optional[Dict]:
         """Scrape individual product from Ulta"""
-        try:
-            response = self.session.get(url)
-            if response.status_code != 200:
-                return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            name_elem = soup.find('h1') or soup.find('span', {'class': 'ProductDetail__title'})
-            if not name_elem:
-                return None
-            name = name_elem.get_text(strip=True)
-            
-            # Extract brand
-            brand_elem = soup.find('a', href=re.compile(r'/brand/')) or soup.find('span', {'class': 'ProductDetail__brand'})
-            brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-            
-            # Extract price
-            price_elem = soup.find('span', {'class': 'ProductPricing__price'})
-            price = 0
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price_match = re.search(r'\$?(\d+(?:\.\d{2})?)', price_text)
-                if price_match:
-                    price = int(float(price_match.group(1)) * 100)
-            
-            # Simplified ingredients extraction
-            ingredients_list = ""
-            star_ingredients = ""
-            
-            product_type = self._determine_product_type(name)
-            
-            return {
-                'name': name,
-                'brand': brand,
-                'ingredientsList': ingredients_list,
-                'starIngredients': star_ingredients,
-                'productType': product_type,
-                'price': price
-            }
-            
-        except Exception as e:
-            logger.error(f"Error scraping Ulta product {url}: {e}")
-            return None
+        return self.sources['ulta'].scrape(url)
+    
+    def _parse_product(self, parse_fn, markup: bytes, source: str) -> Optional[Dict]:
+        """Parse a product page in the worker pool into a name/brand/price/ingredients record"""
+        return self.parse_pool.parse(parse_fn, markup, self.parsers.parser_for(source), self.parsers.partial)
+    
+    def _build_product(self, record: Dict) -> Dict:
+        """Complete a parsed record with star ingredients and product type"""
+        ingredients_list = record['ingredientsList']
+        star_ingredients = ""
+        if ingredients_list:
+            all_ingredients = [ing.strip() for ing in ingredients_list.split(',')]
+            star_ingredients = ", ".join(all_ingredients[:5])
+        return {
+            'name': record['name'],
+            'brand': record['brand'],
+            'ingredientsList': ingredients_list,
+            'starIngredients': star_ingredients,
+            'productType': self._determine_product_type(record['name']),
+            'price': record['price']
+        }
     
     def _determine_product_type(self, name: str) -> str:
         """Determine product type based on product name"""
@@ -349,6 +300,10 @@ class SkincareScraper:
     
     def add_product_via_database(self, product: Dict) -> bool:
         """Add product directly to database"""
+        # Imported on first use so API-only runs never load the MySQL driver
+        import mysql.connector
+        from mysql.connector import Error
+        
         try:
             connection = mysql.connector.connect(**self.db_config)
             cursor = connection.cursor()
@@ -381,54 +336,190 @@ class SkincareScraper:
                 cursor.close()
                 connection.close()
     
-    def run_scraper(self, sources: List[str] = None, method: str = 'api') -> None:
-        """Run the scraper with specified sources and method"""
+    def _classify_product(self, product: Dict, seen: Set[str]) -> Optional[Dict]:
+        """Decide whether a scraped product should be ingested: drop nameless products
+        and duplicates already seen in this run"""
+        if not product.get('name'):
+            return None
+        key = content_hash(product)
+        if key in seen:
+            return None
+        seen.add(key)
+        return product
+    
+    def _ingest_product(self, product: Dict, method: str) -> bool:
+        """Add a product with the chosen method and mark it ingested in the checkpoint journal and frontier"""
+        if method == 'api':
+            added = self.add_product_via_api(product)
+        elif method == 'database':
+            added = self.add_product_via_database(product)
+        else:
+            added = False
+        if added and self.checkpoint:
+            self.checkpoint.record_ingested(product)
+        # Only ingested products mark their URLs done, so failed or skipped ingests are fetched again
+        if added and self.frontier:
+            self.frontier.mark_ingested(content_hash(product))
+        return added
+    
+    def run_scraper(self, sources: List[str] = None, method: Optional[str] = None, resume: bool = False) -> None:
+        """Run the scraper with specified sources and method (default 'api', or 'none' for a replay)"""
+        method = method or ('none' if self.replay else 'api')
+        if self.replay and method != 'none':
+            raise ValueError(f"A replay does not ingest products, got method {method!r}")
         if sources is None:
-            sources = ['incidecoder', 'sephora', 'ulta']
+            sources = list(self.sources)
+        started = time.monotonic()
         
-        all_products = []
+        pending = []
+        completed_sources = set()
+        if self.checkpoint:
+            pending = self.checkpoint.pending()
+        if self.checkpoint and resume:
+            completed_sources = self.checkpoint.completed_sources()
+            logger.info(f"Resuming: {len(pending)} products pending ingestion, "
+                        f"sources already scraped: {sorted(completed_sources) or 'none'}")
+        elif self.checkpoint:
+            # A fresh run crawls every source again, but still ingests what the last run left behind
+            if pending:
+                logger.info(f"Ingesting {len(pending)} products left un-ingested by a previous run")
+            self.checkpoint.compact()
         
+        streams = {}
         for source in sources:
-            logger.info(f"Starting to scrape from {source}")
-            
-            if source == 'incidecoder':
-                products = self.scrape_incidecoder()
-            elif source == 'sephora':
-                products = self.scrape_sephora()
-            elif source == 'ulta':
-                products = self.scrape_ulta()
-            else:
+            if source not in self.sources:
                 logger.warning(f"Unknown source: {source}")
-                continue
-            
-            all_products.extend(products)
-            logger.info(f"Scraped {len(products)} products from {source}")
+            elif source in completed_sources:
+                logger.info(f"Skipping {source}, already scraped before the interruption")
+            else:
+                logger.info(f"Starting to scrape from {source}")
+                streams[source] = lambda source=self.sources[source]: self._crawl_source(source)
         
-        logger.info(f"Total products scraped: {len(all_products)}")
+        def source_done(source: str, count: int) -> None:
+            logger.info(f"Scraped {count} products from {source}")
+            if self.checkpoint:
+                self.checkpoint.record_source_done(source)
         
-        # Add products to database
-        success_count = 0
-        for product in all_products:
-            if method == 'api':
-                if self.add_product_via_api(product):
-                    success_count += 1
-            elif method == 'database':
-                if self.add_product_via_database(product):
-                    success_count += 1
-            
-            time.sleep(random.uniform(0.5, 1.5))  # Rate limiting
+        def scraped_products():
+            """Products left over from an interrupted run, then those of every source as they are crawled"""
+            yield from pending
+            # Sources crawl side by side on their own hosts' budgets, so the run lasts as long as the slowest
+            yield from merge_streams(streams, self.buffer_size, source_done)
+        
+        # Products are classified and ingested while later pages are still being fetched
+        seen = set()
+        counts = StreamingPipeline(self.buffer_size).run(scraped_products(), [
+            ('classify', lambda product: self._classify_product(product, seen)),
+            ('ingest', lambda product: self._ingest_product(product, method)),
+        ])
+        self.parse_pool.close()
         
-        logger.info(f"Successfully added {success_count} products to database")
+        logger.info(f"Total products scraped: {counts['source']}")
+        logger.info(f"Successfully added {counts['ingest']} products to database")
+        if self.replay:
+            elapsed = time.monotonic() - started
+            logger.info(f"Replayed {counts['source']} products in {elapsed:.1f}s "
+                        f"({counts['source'] / max(elapsed, 1e-9):.1f} products/s)")
+        if self.frontier:
+            logger.info(f"Frontier status: {self.frontier.stats()}")
+        if self.checkpoint:
+            self.checkpoint.finish()
+        if self.archive:
+            self.archive.flush()
+            logger.info(f"Page archive: {self.archive.stats()}")
+        open_hosts = {host: state for host, state in self.session.breakers.states().items() if state != 'closed'}
+        if open_hosts:
+            logger.warning(f"Circuit breakers not closed at the end of the run: {open_hosts}")
+        for name, value in connection_stats(self.session).items():
+            self.metrics.increment(name, value)
+        self.metrics.log_summary()
+
+@SOURCES.register
+class INCIDecoderSource(ProductSource):
+    """INCIDecoder products, found on popular brands' pages or in the site's sitemaps"""
+    
+    name = 'incidecoder'
+    base_url = 'https://incidecoder.com'
+    product_path = '/products/'
+    
+    # Popular brands to scrape
+    brands = [
+        "the-ordinary", "cerave", "la-roche-posay", "neutrogena", 
+        "paulas-choice", "skinceuticals", "clinique", "kiehls",
+        "innisfree", "cosrx", "laneige", "etude-house", "numbuzin",
+        "vt-cosmetics", "aprilskin", "the-saem", "neogen", "amplen"
+    ]
+    
+    def discover(self) -> List[str]:
+        scraper = self.scraper
+        if scraper.discovery == 'sitemap':
+            return scraper._sitemap_product_urls(self.name, self.base_url, r'/products/')
+        logger.info(f"Scraping {len(self.brands)} brands")
+        brand_urls = [f"{self.base_url}/brands/{brand}" for brand in self.brands]
+        return scraper._listing_product_urls(self.name, brand_urls, self.base_url, r'/products/',
+                                             scraper.brand_budget, max_pages=scraper.brand_pages)
+    
+    def parse(self, url: str, markup: bytes) -> Optional[Dict]:
+        record = self.scraper._parse_product(parse_incidecoder_product, markup, self.name)
+        if not record:
+            return None
+        
+        # Generate random price (you can modify this logic)
+        record['price'] = random.randint(500, 5000)
+        return self.scraper._build_product(record)
+
+
+class CategorySource(ProductSource):
+    """Retailer whose products are found on its skincare category pages, up to 10 per category"""
+    
+    categories: List[str] = []
+    parse_record = None
+    
+    def discover(self) -> List[str]:
+        logger.info(f"Scraping {len(self.categories)} {self.name} categories")
+        category_urls = [self.base_url + category for category in self.categories]
+        return self.scraper._listing_product_urls(self.name, category_urls, self.base_url, r'/product/', 10)
+    
+    def parse(self, url: str, markup: bytes) -> Optional[Dict]:
+        record = self.scraper._parse_product(type(self).parse_record, markup, self.name)
+        return self.scraper._build_product(record) if record else None
+
+
+@SOURCES.register
+class SephoraSource(CategorySource):
+    name = 'sephora'
+    base_url = 'https://www.sephora.com'
+    categories = [
+        "/shop/skincare-cleansers",
+        "/shop/skincare-moisturizers", 
+        "/shop/skincare-serums",
+        "/shop/skincare-sunscreen"
+    ]
+    parse_record = parse_sephora_product
+
+
+@SOURCES.register
+class UltaSource(CategorySource):
+    name = 'ulta'
+    base_url = 'https://www.ulta.com'
+    categories = [
+        "/shop/skincare/cleansers",
+        "/shop/skincare/moisturizers",
+        "/shop/skincare/serums",
+        "/shop/skincare/sunscreen"
+    ]
+    parse_record = parse_ulta_product
 
 def main():
     parser = argparse.ArgumentParser(description='Skincare Product Scraper')
     parser.add_argument('--sources', nargs='+', 
-                       choices=['incidecoder', 'sephora', 'ulta'],
+                       choices=SOURCES.names(),
                        default=['incidecoder'],
                        help='Sources to scrape from')
-    parser.add_argument('--method', choices=['api', 'database'],
-                       default='api',
-                       help='Method to add products (api or database)')
+    parser.add_argument('--method', choices=['api', 'database', 'none'],
+                       default=None,
+                       help='Method to add products (api or database; none only scrapes and classifies). '
+                            'Default: api, or none with --replay, which cannot ingest')
     parser.add_argument('--api-url', default='http://localhost:8080/api',
                        help='API base URL')
     parser.add_argument('--db-host', default='localhost',
@@ -441,8 +532,62 @@ def main():
                        help='Database user')
     parser.add_argument('--db-password', default='',
                        help='Database password')
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='HOST=RATE[:BURST]',
+                       help='Requests per second and burst for a host (repeatable)')
+    parser.add_argument('--cache-dir', default='.http_cache',
+                       help='Directory for the persistent HTTP cache')
+    parser.add_argument('--cache-max-mb', type=int, default=500,
+                       help='Size budget of the HTTP cache in megabytes')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the persistent HTTP cache')
+    parser.add_argument('--frontier', default='crawl_frontier.sqlite',
+                       help='SQLite file tracking discovered product URLs across runs')
+    parser.add_argument('--no-frontier', action='store_true',
+                       help='Fetch every discovered product URL, even if fetched recently')
+    parser.add_argument('--recrawl-after', type=float, default=24.0,
+                       help='Hours after which an already fetched product URL is due again')
+    parser.add_argument('--checkpoint', default='scraper_checkpoint.jsonl',
+                       help='Journal of scraped-but-not-ingested products, which the next run ingests first')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted run, skipping the sources it finished')
+    parser.add_argument('--parser', action='append', default=[], metavar='SOURCE=PARSER',
+                       help='HTML parser for a source: html.parser, lxml or selectolax (repeatable, default lxml)')
+    parser.add_argument('--full-parse', action='store_true',
+                       help='Build the whole document tree instead of only the regions the scraper reads')
+    parser.add_argument('--buffer-size', type=int, default=32,
+                       help='Products buffered between the scrape, classify and ingest stages')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Maximum number of page requests in flight at once')
+    parser.add_argument('--per-host-concurrency', type=int, default=None,
+                       help='Maximum number of page requests in flight to one host (default: --concurrency)')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                       help='Processes parsing product pages (default: one per available core, 0 parses in the fetch threads)')
+    parser.add_argument('--archive', metavar='DIR',
+                       help='Also write every fetched page to a compressed WARC archive in this directory')
+    parser.add_argument('--replay', metavar='DIR',
+                       help='Re-parse the product pages stored in an --archive directory instead of fetching any')
+    parser.add_argument('--pool-size', type=int, default=None,
+                       help='Keep-alive connections per host (default: --concurrency, at least 10)')
+    parser.add_argument('--host-pool-size', action='append', default=[], metavar='HOST=SIZE',
+                       help='Keep-alive connections for one host, overriding --pool-size (repeatable)')
+    parser.add_argument('--max-retries', type=int, default=3,
+                       help='Retries of a request answered with 429 or 503, after Retry-After or an exponential backoff')
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                       help='Consecutive throttled or failed requests after which a host is paused')
+    parser.add_argument('--breaker-cooldown', type=float, default=60.0,
+                       help='Seconds a paused host gets before it is probed again (doubles each time it re-trips)')
+    parser.add_argument('--discovery', choices=['brands', 'sitemap'], default='brands',
+                       help='Find INCIDecoder products from brand pages or from the site\'s sitemaps')
+    parser.add_argument('--sitemap', action='append', default=[], metavar='URL',
+                       help='Sitemap to read with --discovery sitemap (repeatable, default: those listed in robots.txt)')
+    parser.add_argument('--brand-budget', type=int, default=100,
+                       help='Maximum number of products taken from each INCIDecoder brand')
+    parser.add_argument('--brand-pages', type=int, default=10,
+                       help='Maximum number of listing pages read per INCIDecoder brand')
     
     args = parser.parse_args()
+    if args.replay and args.method not in (None, 'none'):
+        parser.error("--replay never writes to the backend; drop --method or use --method none")
     
     # Configure database connection
     db_config = {
@@ -456,11 +601,34 @@ def main():
     # Create scraper instance
     scraper = SkincareScraper(
         api_base_url=args.api_url,
-        db_config=db_config
+        db_config=db_config,
+        concurrency=args.concurrency,
+        host_rates=dict(parse_host_rate(spec) for spec in args.rate_limit),
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        frontier_path=None if args.no_frontier else args.frontier,
+        recrawl_after_hours=args.recrawl_after,
+        checkpoint_path=args.checkpoint,
+        buffer_size=args.buffer_size,
+        parsers=dict(parse_source_parser(spec) for spec in args.parser),
+        partial_parse=not args.full_parse,
+        brand_budget=args.brand_budget,
+        brand_pages=args.brand_pages,
+        parse_workers=args.parse_workers,
+        archive_dir=args.archive,
+        replay_dir=args.replay,
+        per_host_concurrency=args.per_host_concurrency,
+        pool_size=args.pool_size,
+        host_pool_sizes=dict(parse_pool_size(spec) for spec in args.host_pool_size),
+        max_retries=args.max_retries,
+        breaker_threshold=args.breaker_threshold,
+        breaker_cooldown=args.breaker_cooldown,
+        discovery=args.discovery,
+        sitemap_urls=args.sitemap or None
     )
     
     # Run scraper
-    scraper.run_scraper(sources=args.sources, method=args.method)
+    scraper.run_scraper(sources=args.sources, method=args.method, resume=args.resume)
 
 if __name__ == "__main__":
     main()
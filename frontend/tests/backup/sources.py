@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Product source plugins for the skincare scrapers
+A source discovers the product URLs of one site, fetches product pages and parses them into products.
+Each scraper keeps a registry of its sources, and run_scraper crawls the selected ones side by side
+"""
+
+import logging
+from typing import Dict, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+
+class ProductSource:
+    """Base class of a source plugin, bound to the scraper whose session, parsers and crawl state it uses.
+    Subclasses set `name`, `base_url` and `product_path` (what marks a product page in a page archive)
+    and implement discover and parse; scrape may be overridden where fetching and parsing interleave."""
+
+    name = ''
+    base_url = ''
+    product_path = '/product/'
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def discover(self) -> List[str]:
+        """Product URLs to fetch in this run"""
+        raise NotImplementedError
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """Body of a product page, or None if it could not be fetched"""
+        response = self.scraper.session.get(url)
+        if response.status_code != 200:
+            return None
+        return response.content
+
+    def parse(self, url: str, markup: bytes) -> Optional[Dict]:
+        """Product scraped from a page body, or None if the page holds no product"""
+        raise NotImplementedError
+
+    def scrape(self, url: str) -> Optional[Dict]:
+        """Fetch and parse one product page"""
+        try:
+            markup = self.fetch(url)
+            return self.parse(url, markup) if markup else None
+        except Exception as e:
+            logger.error(f"Error scraping {self.name} product {url}: {e}")
+            return None
+
+
+class SourceRegistry:
+    """Source plugin classes by name, in the order they were registered"""
+
+    def __init__(self):
+        self._sources: Dict[str, Type[ProductSource]] = {}
+
+    def register(self, source_class: Type[ProductSource]) -> Type[ProductSource]:
+        """Class decorator adding a source plugin under its `name`"""
+        if not source_class.name:
+            raise ValueError(f"{source_class.__name__} has no source name")
+        self._sources[source_class.name] = source_class
+        return source_class
+
+    def names(self) -> List[str]:
+        return list(self._sources)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sources
+
+    def create(self, scraper) -> Dict[str, ProductSource]:
+        """One instance of every registered source, bound to `scraper`"""
+        return {name: source_class(scraper) for name, source_class in self._sources.items()}
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Structured product data embedded in retailer pages
+Reads JSON-LD and serialized app state (Sephora's linkStore, Next.js/Apollo state) straight from the
+raw HTML, so product fields can be taken without building a DOM or rendering the page in a browser.
+App-state fields are only read from the page's product node, never from navigation or carousels
+"""
+
+import html
+import json
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_JSON_TYPE = re.compile(r'type\s*=\s*["\']?(?:application|text)/json', re.IGNORECASE)
+_LD_JSON_TYPE = re.compile(r'type\s*=\s*["\']?application/ld\+json', re.IGNORECASE)
+_STATE_ASSIGNMENT = re.compile(
+    r'window\.(?:__NEXT_DATA__|__APOLLO_STATE__|__INITIAL_STATE__|__PRELOADED_STATE__)\s*=\s*')
+
+# Keys that mark an app-state object as a product
+PRODUCT_ID_KEYS = ('productId', 'skuId')
+
+# Keys the app states use for each field, most specific first
+NAME_KEYS = ('productName', 'displayName')
+BRAND_KEYS = ('brandName', 'brand')
+PRICE_KEYS = ('listPrice', 'salePrice', 'price')
+INGREDIENT_KEYS = ('ingredientDesc', 'ingredientsList', 'ingredientList', 'ingredients')
+
+
+def json_ld(markup: str) -> List[Any]:
+    """Every JSON-LD document in the page"""
+    documents = []
+    for attrs, body in _SCRIPT.findall(markup):
+        if _LD_JSON_TYPE.search(attrs):
+            try:
+                documents.append(json.loads(body.strip()))
+            except ValueError:
+                logger.debug("Skipping malformed JSON-LD block")
+    return documents
+
+
+def embedded_state(markup: str) -> List[Any]:
+    """Serialized app state: JSON script tags and window.__*_STATE__ style assignments"""
+    states = []
+    for attrs, body in _SCRIPT.findall(markup):
+        if _JSON_TYPE.search(attrs):
+            try:
+                states.append(json.loads(body.strip()))
+            except ValueError:
+                continue
+    decoder = json.JSONDecoder()
+    for match in _STATE_ASSIGNMENT.finditer(markup):
+        try:
+            states.append(decoder.raw_decode(markup, match.end())[0])
+        except ValueError:
+            continue
+    return states
+
+
+def _walk(value: Any) -> Iterator[Dict]:
+    """Every dict nested anywhere in a JSON value, depth first"""
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _walk(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk(child)
+
+
+def _is_declared_product(node: Dict, key: Any = None) -> bool:
+    kind = node.get('@type') or node.get('__typename')
+    if kind == 'Product' or (isinstance(kind, list) and 'Product' in kind):
+        return True
+    # Sephora keeps the page's product under "product", Apollo caches it as "Product:<id>"
+    return isinstance(key, str) and (key == 'product' or key.startswith('Product:'))
+
+
+def _is_product(node: Dict, key: Any = None) -> bool:
+    return _is_declared_product(node, key) or any(node.get(id_key) for id_key in PRODUCT_ID_KEYS)
+
+
+def _product_nodes(value: Any, key: Any = None) -> Iterator[Tuple[bool, Dict]]:
+    """Outermost product objects in a JSON value, depth first, each with whether it is declared a
+    product rather than merely carrying a product id; a product's subtree is not searched further"""
+    if isinstance(value, dict):
+        if _is_product(value, key):
+            yield _is_declared_product(value, key), value
+            return
+        for child_key, child in value.items():
+            yield from _product_nodes(child, child_key)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _product_nodes(child)
+
+
+def _own_parts(node: Dict) -> Iterator[Dict]:
+    """A product object and the objects nested directly in it (details, brand, current SKU);
+    lists, where carousels, variants and other SKUs live, are not entered"""
+    yield node
+    for child in node.values():
+        if isinstance(child, dict):
+            yield from _own_parts(child)
+
+
+def _find(node: Dict, keys) -> Optional[Any]:
+    for key in keys:
+        for part in _own_parts(node):
+            value = part.get(key)
+            if value not in (None, '', [], {}):
+                return value
+    return None
+
+
+def _state_product(states: List[Any]) -> Dict:
+    """The app-state product the page is about: the first named product object, preferring objects
+    declared as products over carousel and recommendation entries that only carry a product id"""
+    products = sorted(_product_nodes(states), key=lambda entry: not entry[0])
+    for _, product in products:
+        if _find(product, NAME_KEYS):
+            return product
+    return products[0][1] if products else {}
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('displayName') or ''
+    if isinstance(value, list):
+        value = ', '.join(_text(item) for item in value)
+    return html.unescape(str(value)).strip()
+
+
+def _cents(value: Any) -> int:
+    if isinstance(value, dict):
+        value = value.get('price') or value.get('lowPrice') or value.get('amount')
+    match = re.search(r'\d+(?:\.\d+)?', str(value or '').replace(',', ''))
+    return int(round(float(match.group(0)) * 100)) if match else 0
+
+
+def _ingredients(value: Any) -> str:
+    """Ingredient list from a plain string, a list, or an HTML blurb with the list in one paragraph"""
+    if isinstance(value, list):
+        return ', '.join(_text(item) for item in value)
+    blocks = re.split(r'<br\s*/?>|</p>|\n', str(value), flags=re.IGNORECASE)
+    blocks = [re.sub(r'\s+', ' ', html.unescape(re.sub(r'<[^>]+>', ' ', block))).strip() for block in blocks]
+    # Retailers put marketing notes around the INCI list; the list is the most comma-separated block
+    return max(blocks, key=lambda block: block.count(','), default='')
+
+
+def _ld_product(documents: List[Any]) -> Optional[Dict]:
+    for node in _walk(documents):
+        kind = node.get('@type')
+        if kind == 'Product' or (isinstance(kind, list) and 'Product' in kind):
+            return node
+    return None
+
+
+def structured_product(markup: str) -> Optional[Dict]:
+    """Name, brand, price (in cents) and ingredient list from the page's embedded data,
+    or None if the page carries no product name"""
+    ld_product = _ld_product(json_ld(markup)) or {}
+    state_product = _state_product(embedded_state(markup))
+
+    name = _text(ld_product.get('name') or _find(state_product, NAME_KEYS) or '')
+    if not name:
+        return None
+    brand = _text(ld_product.get('brand') or _find(state_product, BRAND_KEYS) or '')
+
+    offers = ld_product.get('offers')
+    if isinstance(offers, list):
+        offers = offers[0] if offers else None
+    price = _cents(offers) if offers else _cents(_find(state_product, PRICE_KEYS))
+
+    ingredients = ld_product.get('ingredients') or _find(state_product, INGREDIENT_KEYS)
+    return {
+        'name': name,
+        'brand': brand or "Unknown",
+        'price': price,
+        'ingredientsList': _ingredients(ingredients) if ingredients else "",
+    }
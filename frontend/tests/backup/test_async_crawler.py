@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio crawl engine
+Runs offline; fetch functions sleep instead of making requests
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from async_crawler import AsyncCrawlEngine
+from pipeline import merge_streams
+
+class InFlight:
+    """Fetch stub that records the most requests it saw in flight, overall and per host"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.current = Counter()
+        self.peak = Counter()
+
+    def _enter(self, key):
+        self.current[key] += 1
+        self.peak[key] = max(self.peak[key], self.current[key])
+
+    def __call__(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            self._enter('total')
+            self._enter(host)
+        time.sleep(self.delay)
+        with self.lock:
+            self.current['total'] -= 1
+            self.current[host] -= 1
+        return url
+
+def test_concurrency_is_bounded():
+    """Test that no more than `concurrency` fetches run at once, and that they all get used"""
+    fetch = InFlight()
+    urls = [f'https://incidecoder.com/products/{i}' for i in range(12)]
+    results = AsyncCrawlEngine(concurrency=3).crawl(urls, fetch)
+    assert sorted(results) == sorted(urls)
+    assert fetch.peak['total'] == 3, fetch.peak
+
+def test_single_host_uses_every_slot():
+    """Test that by default one host can use all of the engine's concurrency"""
+    fetch = InFlight()
+    urls = [f'https://incidecoder.com/products/{i}' for i in range(16)]
+    AsyncCrawlEngine(concurrency=8).crawl(urls, fetch)
+    assert fetch.peak['incidecoder.com'] == 8, fetch.peak
+
+def test_per_host_cap():
+    """Test that a per-host cap holds for each host while other hosts keep the engine busy"""
+    fetch = InFlight()
+    urls = [f'https://{host}/product/{i}' for i in range(8) for host in ('www.sephora.com', 'www.ulta.com')]
+    AsyncCrawlEngine(concurrency=6, per_host_concurrency=2).crawl(urls, fetch)
+    assert fetch.peak['www.sephora.com'] == 2 and fetch.peak['www.ulta.com'] == 2, fetch.peak
+    assert fetch.peak['total'] == 4, fetch.peak
+
+def test_results_in_completion_order():
+    """Test that results arrive as fetches complete, skipping empty results and errors"""
+    delays = {'https://a.com/slow': 0.3, 'https://a.com/fast': 0.0, 'https://a.com/medium': 0.1,
+              'https://a.com/empty': 0.0, 'https://a.com/broken': 0.0}
+
+    def fetch(url):
+        time.sleep(delays[url])
+        if url.endswith('broken'):
+            raise ValueError("unexpected markup")
+        return None if url.endswith('empty') else url
+
+    results = AsyncCrawlEngine(concurrency=5).crawl(list(delays), fetch)
+    assert results == ['https://a.com/fast', 'https://a.com/medium', 'https://a.com/slow'], results
+
+def test_stream_limit():
+    """Test that a stream stops after `limit` results"""
+    urls = [f'https://a.com/{i}' for i in range(20)]
+    results = list(AsyncCrawlEngine(concurrency=2).stream(urls, lambda url: url, limit=3, buffer_size=1))
+    assert len(results) == 3, results
+
+def test_streams_share_the_limit():
+    """Test that sources streamed side by side on one engine share its concurrency and host caps"""
+    fetch = InFlight()
+    engine = AsyncCrawlEngine(concurrency=4, per_host_concurrency=3)
+    streams = {
+        host: lambda host=host: engine.stream([f'https://{host}/product/{i}' for i in range(12)], fetch)
+        for host in ('incidecoder.com', 'www.sephora.com', 'www.ulta.com')
+    }
+    assert len(list(merge_streams(streams))) == 36
+    assert fetch.peak['total'] == 4, fetch.peak
+    assert max(fetch.peak[host] for host in streams) <= 3, fetch.peak
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("ASYNC CRAWLER TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Concurrency Is Bounded", test_concurrency_is_bounded),
+        ("Single Host Uses Every Slot", test_single_host_uses_every_slot),
+        ("Per Host Cap", test_per_host_cap),
+        ("Results In Completion Order", test_results_in_completion_order),
+        ("Stream Limit", test_stream_limit),
+        ("Streams Share The Limit", test_streams_share_the_limit)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
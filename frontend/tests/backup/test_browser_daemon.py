@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the long-lived browser daemon helpers
+Runs without Chrome; a fake webdriver_manager resolves the driver path and a local HTTP server
+plays a browser's DevTools endpoint
+"""
+
+import http.server
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import types
+from contextlib import contextmanager
+
+from browser_daemon import cached_driver_path, daemon_addresses, use_own_tab
+
+@contextmanager
+def fake_driver_manager(path):
+    """Install a webdriver_manager whose ChromeDriverManager().install() returns `path`,
+    yielding the list of install calls"""
+    installs = []
+
+    class ChromeDriverManager:
+        def install(self):
+            installs.append(path)
+            return path
+
+    package = types.ModuleType('webdriver_manager')
+    chrome = types.ModuleType('webdriver_manager.chrome')
+    chrome.ChromeDriverManager = ChromeDriverManager
+    package.chrome = chrome
+    saved = {name: sys.modules.get(name) for name in ('webdriver_manager', 'webdriver_manager.chrome')}
+    sys.modules.update({'webdriver_manager': package, 'webdriver_manager.chrome': chrome})
+    try:
+        yield installs
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+class DevToolsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == '/json/version' else 404)
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+def test_driver_path_is_resolved_once():
+    """Test that the first lookup resolves and caches the path and later ones read the cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        driver = os.path.join(tmp, 'chromedriver')
+        open(driver, 'w').close()
+        cache_file = os.path.join(tmp, 'driver.json')
+        with fake_driver_manager(driver) as installs:
+            assert cached_driver_path(cache_file) == driver
+            assert cached_driver_path(cache_file) == driver
+            assert installs == [driver]
+        with open(cache_file, encoding='utf-8') as f:
+            assert json.load(f)['path'] == driver
+
+def test_stale_or_broken_cache_is_re_resolved():
+    """Test that a vanished binary, an unreadable cache or a forced refresh resolves again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        driver = os.path.join(tmp, 'chromedriver')
+        open(driver, 'w').close()
+        cache_file = os.path.join(tmp, 'driver.json')
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': os.path.join(tmp, 'old', 'chromedriver')}, f)
+        with fake_driver_manager(driver) as installs:
+            assert cached_driver_path(cache_file) == driver
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write('{not json')
+            assert cached_driver_path(cache_file) == driver
+            assert cached_driver_path(cache_file, refresh=True) == driver
+            assert len(installs) == 3
+
+def test_daemon_addresses_skip_dead_browsers():
+    """Test that only browsers answering on their DevTools port are attached to"""
+    server = socketserver.TCPServer(('127.0.0.1', 0), DevToolsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        live_port = server.server_address[1]
+        with socketserver.TCPServer(('127.0.0.1', 0), DevToolsHandler) as closed:
+            dead_port = closed.server_address[1]
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = os.path.join(tmp, 'daemon.json')
+            assert daemon_addresses(state_file) == []
+            with open(state_file, 'w', encoding='utf-8') as f:
+                json.dump({'browsers': [{'port': live_port}, {'port': dead_port}]}, f)
+            assert daemon_addresses(state_file) == [f'127.0.0.1:{live_port}']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_own_tab_is_closed_on_quit():
+    """Test that an attached session works in its own tab and closes it when quitting"""
+    events = []
+    driver = types.SimpleNamespace(
+        switch_to=types.SimpleNamespace(new_window=lambda kind: events.append(f'new {kind}')),
+        close=lambda: events.append('close'),
+        quit=lambda: events.append('quit'))
+    use_own_tab(driver)
+    driver.quit()
+    assert events == ['new tab', 'close', 'quit'], events
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("BROWSER DAEMON TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Driver Path Is Resolved Once", test_driver_path_is_resolved_once),
+        ("Stale Or Broken Cache Is Re-resolved", test_stale_or_broken_cache_is_re_resolved),
+        ("Daemon Addresses Skip Dead Browsers", test_daemon_addresses_skip_dead_browsers),
+        ("Own Tab Is Closed On Quit", test_own_tab_is_closed_on_quit)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the checkpoint journal and crash recovery
+Runs offline; a child process plays a scraper run that dies without closing its files
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from checkpoint import CheckpointJournal, checkpointed
+from crawl_frontier import CrawlFrontier, content_hash, track
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+URLS = [f'https://incidecoder.com/products/p{i}' for i in range(3)]
+
+# Scrapes every URL, ingests the first `ingested` products, then dies like a killed process
+CRASHING_RUN = """
+import os
+from checkpoint import CheckpointJournal, checkpointed
+from crawl_frontier import CrawlFrontier, content_hash, track
+
+frontier = CrawlFrontier({frontier!r})
+journal = CheckpointJournal({journal!r})
+urls = {urls!r}
+frontier.due(urls, 'incidecoder')
+scrape = checkpointed(journal, 'incidecoder', track(frontier, lambda url: {{'name': url}}))
+products = [scrape(url) for url in urls]
+for product in products[:{ingested}]:
+    journal.record_ingested(product)
+    frontier.mark_ingested(content_hash(product))
+os._exit(1)
+"""
+
+def product(url):
+    return {'name': url}
+
+def crashed_run(tmp, ingested):
+    frontier_path = os.path.join(tmp, 'frontier.sqlite')
+    journal_path = os.path.join(tmp, 'checkpoint.jsonl')
+    code = CRASHING_RUN.format(frontier=frontier_path, journal=journal_path, urls=URLS, ingested=ingested)
+    result = subprocess.run([sys.executable, '-c', code], cwd=HERE, capture_output=True)
+    assert result.returncode == 1, result.stderr.decode()
+    return CrawlFrontier(frontier_path), CheckpointJournal(journal_path)
+
+def recover(frontier, journal):
+    """What the next run does: ingest the journaled products, then fetch whatever is still due"""
+    ingested = []
+
+    def ingest(item):
+        ingested.append(item['name'])
+        journal.record_ingested(item)
+        frontier.mark_ingested(content_hash(item))
+
+    for item in journal.pending():
+        ingest(item)
+    scrape = checkpointed(journal, 'incidecoder', track(frontier, product))
+    for url in frontier.due(URLS, 'incidecoder'):
+        item = scrape(url)
+        if item:
+            ingest(item)
+    return ingested
+
+def test_crash_after_partial_ingest():
+    """Test that products scraped but not ingested before a crash are ingested by the next run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        frontier, journal = crashed_run(tmp, ingested=1)
+        # The ingested marker's flush took the earlier scraped entries to disk with it
+        assert sorted(item['name'] for item in journal.pending()) == URLS[1:]
+        assert frontier.due(URLS, 'incidecoder') == URLS[1:]
+
+        assert sorted(recover(frontier, journal)) == URLS[1:]
+        assert frontier.due(URLS, 'incidecoder') == []
+        assert journal.pending() == []
+        journal.close()
+        frontier.close()
+
+def test_crash_before_journal_flush():
+    """Test that scraped entries lost with the journal's buffer are fetched again, not skipped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        frontier, journal = crashed_run(tmp, ingested=0)
+        assert journal.pending() == []
+        assert frontier.due(URLS, 'incidecoder') == URLS
+
+        assert sorted(recover(frontier, journal)) == URLS
+        assert frontier.due(URLS, 'incidecoder') == []
+        journal.close()
+        frontier.close()
+
+def test_compact_keeps_pending_products():
+    """Test that compacting drops ingested products and finished sources but keeps pending products"""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = CheckpointJournal(os.path.join(tmp, 'checkpoint.jsonl'))
+        for url in URLS:
+            journal.record_scraped('incidecoder', product(url))
+        journal.record_ingested(product(URLS[0]))
+        journal.record_source_done('incidecoder')
+
+        assert journal.compact() == 2
+        assert [item['name'] for item in journal.pending()] == URLS[1:]
+        assert journal.completed_sources() == set()
+        journal.close()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("CHECKPOINT TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Crash After Partial Ingest", test_crash_after_partial_ingest),
+        ("Crash Before Journal Flush", test_crash_before_journal_flush),
+        ("Compact Keeps Pending Products", test_compact_keeps_pending_products)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for throttling retries and per-host circuit breakers
+Runs offline; a stub transport adapter plays the throttling server
+"""
+
+import sys
+
+import requests
+from requests.adapters import BaseAdapter
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, HostCircuitBreakers, retry_after_seconds
+from crawl_metrics import CrawlMetrics
+from rate_limiter import HostRateLimiter
+from scraper_session import ScraperSession
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers each request with the next status code of a script"""
+
+    def __init__(self, statuses, retry_after='0'):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses[min(self.sent, len(self.statuses) - 1)]
+        response.headers['Retry-After'] = self.retry_after
+        response.request = request
+        response.url = request.url
+        self.sent += 1
+        return response
+
+    def close(self):
+        pass
+
+def scripted_session(statuses, **kwargs):
+    metrics = CrawlMetrics()
+    session = ScraperSession(HostRateLimiter({'example.com': (1000.0, 100)}), metrics=metrics,
+                             breakers=HostCircuitBreakers(threshold=3, cooldown=60, metrics=metrics), **kwargs)
+    adapter = ScriptedAdapter(statuses)
+    session.mount('https://', adapter)
+    return session, adapter, metrics
+
+def test_retry_after_parsing():
+    """Test that Retry-After is read as seconds or as an HTTP date"""
+    assert retry_after_seconds('120') == 120.0
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert retry_after_seconds(None) is None and retry_after_seconds('soon') is None
+
+def test_breaker_states():
+    """Test closed -> open -> half-open probe -> re-open with a longer cooldown -> closed"""
+    breaker = CircuitBreaker(threshold=2, cooldown=10, max_cooldown=100)
+    assert not breaker.record_failure(0) and breaker.record_failure(0) and breaker.state == OPEN
+    assert not breaker.allow(5) and breaker.allow(10) and breaker.state == HALF_OPEN
+    assert not breaker.allow(10), "only one probe while half-open"
+    assert breaker.record_failure(10) and breaker.opened_until == 30
+    assert breaker.allow(30)
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow(31)
+
+def test_throttled_request_is_retried():
+    """Test that a 429 followed by a 200 is retried transparently"""
+    session, adapter, metrics = scripted_session([429, 200])
+    assert session.get('https://example.com/p/1').status_code == 200
+    assert adapter.sent == 2 and metrics.counters['http_retries'] == 1
+
+def test_breaker_stops_requests():
+    """Test that a host that keeps throttling is cut off and later requests fail fast"""
+    session, adapter, metrics = scripted_session([429], max_retries=5)
+    assert session.get('https://example.com/p/1').status_code == 429
+    assert adapter.sent == 3, adapter.sent
+    try:
+        session.get('https://example.com/p/2')
+        assert False, "expected the circuit to be open"
+    except CircuitOpenError:
+        pass
+    assert adapter.sent == 3
+    assert session.breakers.states() == {'example.com': OPEN}
+    assert metrics.counters['circuit_opened:example.com'] == 1
+    assert metrics.counters['circuit_rejected'] == 1
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("CIRCUIT BREAKER TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Retry-After Parsing", test_retry_after_parsing),
+        ("Breaker States", test_breaker_states),
+        ("Throttled Request Is Retried", test_throttled_request_is_retried),
+        ("Breaker Stops Requests", test_breaker_stops_requests)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent crawl frontier
+Runs offline against a temporary SQLite file
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from crawl_frontier import CrawlFrontier, content_hash, track
+
+def make_frontier(recrawl_after_hours=24.0):
+    path = os.path.join(tempfile.mkdtemp(), 'frontier.sqlite')
+    return CrawlFrontier(path, recrawl_after_hours), path
+
+def scrape_and_ingest(frontier, url, digest):
+    """Take a URL through the scraper's path: scraped, then its product ingested"""
+    assert frontier.mark_scraped(url, digest)
+    frontier.mark_ingested(digest)
+
+def test_only_new_urls_are_due():
+    """Test that fetched URLs are not due again within the recrawl window"""
+    frontier, path = make_frontier()
+    assert frontier.due(['https://incidecoder.com/products/a', 'https://incidecoder.com/products/a'],
+                        'incidecoder') == ['https://incidecoder.com/products/a']
+    scrape_and_ingest(frontier, 'https://incidecoder.com/products/a', 'hash-a')
+    frontier.close()
+
+    # A fresh run sees the same database
+    frontier = CrawlFrontier(path)
+    due = frontier.due(['https://incidecoder.com/products/a', 'https://incidecoder.com/products/b'], 'incidecoder')
+    assert due == ['https://incidecoder.com/products/b'], due
+
+def test_stale_and_failed_urls_are_due():
+    """Test that failed URLs and URLs past the recrawl window are fetched again"""
+    frontier, _ = make_frontier(recrawl_after_hours=0.1 / 3600)
+    frontier.due(['https://www.sephora.com/product/a', 'https://www.sephora.com/product/b'], 'sephora')
+    scrape_and_ingest(frontier, 'https://www.sephora.com/product/a', 'hash-a')
+    frontier.mark_failed('https://www.sephora.com/product/b')
+    time.sleep(0.2)
+    due = frontier.due(['https://www.sephora.com/product/a', 'https://www.sephora.com/product/b'], 'sephora')
+    assert sorted(due) == ['https://www.sephora.com/product/a', 'https://www.sephora.com/product/b'], due
+
+def test_unchanged_products_are_not_returned():
+    """Test that a re-fetched product is only dropped once its unchanged content was ingested"""
+    frontier, _ = make_frontier()
+    url = 'https://incidecoder.com/products/n'
+    product = {'name': 'Niacinamide 10% + Zinc 1%', 'brand': 'The Ordinary', 'ingredientsList': 'Aqua, Niacinamide'}
+    scrape = track(frontier, lambda url: dict(product))
+    frontier.due([url], 'incidecoder')
+
+    assert scrape(url) == product
+    # Scraped but never ingested (ingest failed, --method none, a crash): still due and still returned
+    assert frontier.stats() == {'scraped': 1}
+    assert frontier.due([url], 'incidecoder') == [url]
+    assert scrape(url) == product
+
+    frontier.mark_ingested(content_hash(product))
+    assert frontier.stats() == {'done': 1}
+    assert frontier.due([url], 'incidecoder') == []
+    assert scrape(url) is None
+
+    product['ingredientsList'] += ', Zinc PCA'
+    assert scrape(url) == product
+    assert frontier.due([url], 'incidecoder') == [url]
+    frontier.mark_ingested(content_hash(product))
+    assert frontier.stats() == {'done': 1}
+
+def test_legacy_frontier_is_upgraded():
+    """Test that a frontier file written before ingestion was tracked gains the new column"""
+    path = os.path.join(tempfile.mkdtemp(), 'frontier.sqlite')
+    db = sqlite3.connect(path)
+    db.execute("""CREATE TABLE urls (url TEXT PRIMARY KEY, source TEXT NOT NULL, status TEXT NOT NULL,
+                  discovered_at REAL NOT NULL, last_fetched REAL, content_hash TEXT,
+                  failures INTEGER NOT NULL DEFAULT 0)""")
+    db.execute("INSERT INTO urls VALUES ('https://incidecoder.com/products/a', 'incidecoder', 'done', 0, ?, 'h', 0)",
+               (time.time(),))
+    db.commit()
+    db.close()
+
+    frontier = CrawlFrontier(path)
+    assert frontier.due(['https://incidecoder.com/products/a'], 'incidecoder') == []
+    assert frontier.mark_scraped('https://incidecoder.com/products/a', 'h2')
+    assert frontier.stats() == {'scraped': 1}
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("CRAWL FRONTIER TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Only New URLs Are Due", test_only_new_urls_are_due),
+        ("Stale And Failed URLs Are Due", test_stale_and_failed_urls_are_due),
+        ("Unchanged Products Are Not Returned", test_unchanged_products_are_not_returned),
+        ("Legacy Frontier Is Upgraded", test_legacy_frontier_is_upgraded)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
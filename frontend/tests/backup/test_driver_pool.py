@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded WebDriver pool
+Runs without a browser; a fake driver stands in for Selenium's WebDriver
+"""
+
+import sys
+
+from driver_pool import WebDriverPool
+
+class FakeDriver:
+    """Answers the pool's health check and records whether it was quit"""
+
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise ConnectionError("browser crashed")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+def fake_pool(**kwargs):
+    started = []
+
+    def factory():
+        started.append(FakeDriver(len(started)))
+        return started[-1]
+
+    return WebDriverPool(factory, **kwargs), started
+
+def test_drivers_are_reused_up_to_size():
+    """Test that drivers start lazily, are reused, and no more than `size` are checked out"""
+    pool, started = fake_pool(size=2)
+    first = pool.checkout()
+    second = pool.checkout()
+    assert len(started) == 2
+    try:
+        pool.checkout(timeout=0.05)
+        raise AssertionError("expected the pool to be exhausted")
+    except TimeoutError:
+        pass
+    pool.checkin(first)
+    assert pool.checkout(timeout=0.05) is first and len(started) == 2
+    pool.checkin(first)
+    pool.checkin(second)
+
+def test_recycled_after_max_pages():
+    """Test that a driver is quit and replaced once it has rendered max_pages pages"""
+    pool, started = fake_pool(size=1, max_pages=3)
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver is started[0]
+    assert started[0].quit_called
+    with pool.driver() as driver:
+        assert driver is started[1] and not driver.quit_called
+
+def test_unhealthy_driver_is_replaced():
+    """Test that an idle driver that stopped responding is replaced on checkout"""
+    pool, started = fake_pool(size=1)
+    with pool.driver():
+        pass
+    started[0].healthy = False
+    with pool.driver() as driver:
+        assert driver is started[1]
+    assert started[0].quit_called
+
+def test_driver_broken_during_use_is_discarded():
+    """Test that a driver that crashed inside the with-block is not returned to the pool"""
+    pool, started = fake_pool(size=1)
+    try:
+        with pool.driver() as driver:
+            driver.healthy = False
+            raise RuntimeError("page load failed")
+    except RuntimeError:
+        pass
+    assert started[0].quit_called
+    # The slot was released, so a fresh driver can be checked out
+    assert pool.checkout(timeout=0.05) is started[1]
+
+def test_failed_page_keeps_healthy_driver():
+    """Test that an error unrelated to the browser keeps the driver in the pool"""
+    pool, started = fake_pool(size=1)
+    try:
+        with pool.driver():
+            raise ValueError("product not found on page")
+    except ValueError:
+        pass
+    assert not started[0].quit_called
+    assert pool.checkout(timeout=0.05) is started[0]
+
+def test_close_quits_drivers():
+    """Test that closing quits idle drivers now and checked-out drivers on checkin"""
+    pool, started = fake_pool(size=2)
+    idle, busy = pool.checkout(), pool.checkout()
+    pool.checkin(idle)
+    pool.close()
+    assert idle.quit_called and not busy.quit_called
+    pool.checkin(busy)
+    assert busy.quit_called
+    try:
+        pool.checkout()
+        raise AssertionError("expected a closed pool to refuse checkouts")
+    except RuntimeError:
+        pass
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("WEBDRIVER POOL TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Drivers Are Reused Up To Size", test_drivers_are_reused_up_to_size),
+        ("Recycled After Max Pages", test_recycled_after_max_pages),
+        ("Unhealthy Driver Is Replaced", test_unhealthy_driver_is_replaced),
+        ("Driver Broken During Use Is Discarded", test_driver_broken_during_use_is_discarded),
+        ("Failed Page Keeps Healthy Driver", test_failed_page_keeps_healthy_driver),
+        ("Close Quits Drivers", test_close_quits_drivers)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
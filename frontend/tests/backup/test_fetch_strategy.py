@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive requests/Selenium fetch strategy
+Runs offline; fetch outcomes are recorded directly
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from fetch_strategy import REQUESTS, SELENIUM, FetchStrategy, url_pattern
+
+URL = 'https://www.sephora.com/product/cream-P1'
+
+def test_url_patterns():
+    """Test that URLs are grouped by host and first path segment"""
+    assert url_pattern(URL) == 'sephora.com/product/*'
+    assert url_pattern('https://www.ulta.com/12345/cream') == 'ulta.com/*/*'
+    assert url_pattern('https://incidecoder.com') == 'incidecoder.com/'
+
+def test_learns_to_render():
+    """Test that repeated incomplete requests fetches switch a pattern to Selenium"""
+    strategy = FetchStrategy(reprobe_every=0)
+    assert strategy.choose(URL) == REQUESTS
+    strategy.record(URL, REQUESTS, False)
+    assert strategy.choose(URL) == REQUESTS, "one failure is not enough"
+    strategy.record(URL, REQUESTS, False)
+    assert strategy.choose(URL) == SELENIUM
+    # The host's verdict covers patterns that have not been seen yet
+    assert strategy.choose('https://www.sephora.com/shop/cream') == SELENIUM
+
+def test_old_outcomes_expire():
+    """Test that a long record of successes does not outweigh a recent run of failures"""
+    strategy = FetchStrategy(reprobe_every=0, window=20)
+    for _ in range(1000):
+        strategy.record(URL, REQUESTS, True)
+    for _ in range(11):
+        strategy.record(URL, REQUESTS, False)
+    assert strategy.choose(URL) == SELENIUM
+    assert len(strategy.stats['sephora.com/product/*'][REQUESTS]) == 20
+
+def test_reprobe_is_exclusive():
+    """Test that concurrent fetches of a rendered pattern send exactly one requests probe"""
+    strategy = FetchStrategy(reprobe_every=10)
+    for _ in range(5):
+        strategy.record(URL, REQUESTS, False)
+    choices = []
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        barrier.wait()
+        for _ in range(5):
+            choices.append(strategy.choose(URL))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert choices.count(REQUESTS) == 4, choices.count(REQUESTS)
+
+def test_recovers_after_successful_probe():
+    """Test that a site that stops needing rendering is switched back within a few fetches"""
+    strategy = FetchStrategy(reprobe_every=50)
+    for _ in range(10):
+        strategy.record(URL, REQUESTS, False)
+    choices = []
+    for _ in range(60):
+        method = strategy.choose(URL)
+        choices.append(method)
+        strategy.record(URL, method, True)
+    assert choices[:49] == [SELENIUM] * 49 and choices[49] == REQUESTS
+    assert choices[-1] == REQUESTS and choices.count(SELENIUM) == 49, choices
+
+def test_state_survives_restart():
+    """Test that learned outcomes are saved and loaded by the next run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'strategy.json')
+        strategy = FetchStrategy(path, reprobe_every=0)
+        strategy.record(URL, REQUESTS, False)
+        strategy.record(URL, REQUESTS, False)
+        strategy.save()
+        assert FetchStrategy(path, reprobe_every=0).choose(URL) == SELENIUM
+
+def test_legacy_counts_are_upgraded():
+    """Test that state files with lifetime counts keep their verdict"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'strategy.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"sephora.com/product/*": {"requests_ok": 10, "requests_failed": 90}}')
+        strategy = FetchStrategy(path, reprobe_every=0)
+        assert strategy.stats['sephora.com/product/*'] == {REQUESTS: [1, 1] + [0] * 18}
+        assert strategy.choose(URL) == SELENIUM
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("FETCH STRATEGY TEST")
+    print("=" * 50)
+
+    tests = [
+        ("URL Patterns", test_url_patterns),
+        ("Learns To Render", test_learns_to_render),
+        ("Old Outcomes Expire", test_old_outcomes_expire),
+        ("Reprobe Is Exclusive", test_reprobe_is_exclusive),
+        ("Recovers After Successful Probe", test_recovers_after_successful_probe),
+        ("State Survives Restart", test_state_survives_restart),
+        ("Legacy Counts Are Upgraded", test_legacy_counts_are_upgraded)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the HTML parsing backends
+Checks that every installed parser gives the scrapers the same answers
+"""
+
+import re
+import sys
+
+from html_parser import (HTMLParsers, available_parsers, parse_html, parse_source_parser,
+                         listing_regions, product_regions, region_texts)
+
+PAGE = b"""<html><body>
+<h1> Niacinamide 10% + Zinc 1% </h1>
+<a href="/brands/the-ordinary">The Ordinary</a>
+<span data-at="price">$6.50</span>
+<span class="ProductPricing__price sale">$5.90</span>
+<div id="ingredients">
+  <a href="/ingredients/aqua">Aqua</a>, <a href="/ingredients/niacinamide">Niacinamide</a>
+</div>
+<a href="/products/other-serum">Other</a>
+<p>Ingredients: Water, Lots Of Unrelated Text</p>
+</body></html>"""
+
+DESCRIPTION_PAGE = b"""<html><body>
+<h1>Hydrating Serum</h1>
+<nav><a href="/shop">Ingredients: Shop All</a></nav>
+<div class="product-ingredients"><p>Key actives</p>Ingredients: Aqua, Hyaluronic Acid
+</div>
+</body></html>"""
+
+def extract(soup):
+    """The lookups the scrapers make on a product page"""
+    return {
+        'name': soup.find('h1').get_text(strip=True),
+        'brand': soup.find('a', href=re.compile(r'/brands/')).get_text(strip=True),
+        'price': soup.find('span', {'data-at': 'price'}).get_text(strip=True),
+        'sale': soup.find('span', {'class': 'ProductPricing__price'}).get_text(strip=True),
+        'ingredients': [ing.get_text(strip=True) for ing in soup.select('div#ingredients a[href*="/ingredients/"]')],
+        'links': [link['href'] for link in soup.find_all('a', href=re.compile(r'/products/'))],
+        'missing': soup.find('div', class_='description'),
+    }
+
+def test_parsers_agree():
+    """Test that all installed parsers extract the same fields"""
+    expected = extract(parse_html(PAGE, 'html.parser'))
+    assert expected['ingredients'] == ['Aqua', 'Niacinamide'], expected
+    for parser in available_parsers():
+        assert extract(parse_html(PAGE, parser)) == expected, parser
+
+def test_partial_parse():
+    """Test that partial parsing keeps every region the scrapers read and drops the rest"""
+    expected = extract(parse_html(PAGE, 'html.parser'))
+    for parser in available_parsers():
+        if parser == 'selectolax':
+            continue
+        soup = parse_html(PAGE, parser, product_regions)
+        assert dict(extract(soup), links=expected['links']) == expected, parser
+        assert soup.find('p') is None, parser
+        soup = parse_html(PAGE, parser, listing_regions)
+        assert [link['href'] for link in soup.find_all('a')] == expected['links'], parser
+
+def test_region_fallback():
+    """Test that the ingredient text fallback only looks inside ingredient regions"""
+    for parser in available_parsers():
+        soup = parse_html(DESCRIPTION_PAGE, parser, product_regions if parser != 'selectolax' else None)
+        texts = [text for text in region_texts(soup) if 'Ingredients' in text]
+        assert len(texts) == 1 and 'Aqua, Hyaluronic Acid' in texts[0], (parser, texts)
+
+def test_parser_selection():
+    """Test per-source parser selection and command line parsing"""
+    assert parse_source_parser('sephora=html.parser') == ('sephora', 'html.parser')
+    for bad in ('sephora', 'sephora=regex'):
+        try:
+            parse_source_parser(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} was accepted")
+    parsers = HTMLParsers({'sephora': 'html.parser'}, default='html.parser')
+    assert parsers.parser_for('sephora') == 'html.parser'
+    assert parsers.parser_for('ulta') == 'html.parser'
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("HTML PARSER TEST")
+    print("=" * 50)
+    print(f"Installed parsers: {', '.join(available_parsers())}")
+
+    tests = [
+        ("Parsers Agree", test_parsers_agree),
+        ("Partial Parse", test_partial_parse),
+        ("Region Fallback", test_region_fallback),
+        ("Parser Selection", test_parser_selection)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
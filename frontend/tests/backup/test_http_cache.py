@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk HTTP cache and conditional GETs
+Runs offline; a stub transport adapter plays a server that honours validators
+"""
+
+import sys
+import tempfile
+
+import requests
+from requests.adapters import BaseAdapter
+
+from http_cache import HTTPCache
+from rate_limiter import HostRateLimiter
+from scraper_session import ScraperSession
+
+URL = 'https://example.com/p/1'
+
+class ValidatingAdapter(BaseAdapter):
+    """Serves one page, answering 304 when the request's If-None-Match is one of the ETags it
+    accepts (by default only its current one)"""
+
+    def __init__(self, body=b'<h1>Cream</h1>', etag='"v1"', date='Mon, 01 Jan 2024 00:00:00 GMT'):
+        super().__init__()
+        self.body = body
+        self.etag = etag
+        self.date = date
+        self.accepted = {etag}
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers['Date'] = self.date
+        if self.etag:
+            response.headers['ETag'] = self.etag
+        if self.etag and request.headers.get('If-None-Match') in self.accepted:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response.headers['Content-Type'] = 'text/html; charset=utf-8'
+            response._content = self.body
+        return response
+
+    def close(self):
+        pass
+
+def cached_session(cache):
+    session = ScraperSession(HostRateLimiter({'example.com': (1000.0, 100)}), cache=cache)
+    adapter = ValidatingAdapter()
+    session.mount('https://', adapter)
+    return session, adapter
+
+def test_not_modified_is_served_from_cache():
+    """Test that a revalidated page is answered from the cache with a 200"""
+    with tempfile.TemporaryDirectory() as tmp:
+        session, adapter = cached_session(HTTPCache(tmp))
+        assert session.get(URL).text == '<h1>Cream</h1>'
+        response = session.get(URL)
+        assert adapter.requests[1].headers['If-None-Match'] == '"v1"'
+        assert response.status_code == 200 and response.text == '<h1>Cream</h1>'
+        assert response.from_cache and response.headers['Content-Type'] == 'text/html; charset=utf-8'
+        session.cache.close()
+
+def test_not_modified_refreshes_validators():
+    """Test that the validators and date of a 304 replace the stored ones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        session, adapter = cached_session(HTTPCache(tmp))
+        session.get(URL)
+        adapter.date = 'Tue, 02 Jan 2024 00:00:00 GMT'
+        session.get(URL)
+        assert session.cache.get(URL).headers['Date'] == 'Tue, 02 Jan 2024 00:00:00 GMT'
+
+        # The server rotates its ETag; the 304 for the old one hands out the new one
+        adapter.etag = '"v2"'
+        adapter.accepted.add('"v2"')
+        assert session.get(URL).headers['ETag'] == '"v2"'
+        session.cache.close()
+        cache = HTTPCache(tmp)
+        assert cache.get(URL).conditional_headers() == {'If-None-Match': '"v2"'}
+        cache.close()
+
+def test_unvalidated_response_drops_entry():
+    """Test that a 200 without validators deletes the stale cached body"""
+    with tempfile.TemporaryDirectory() as tmp:
+        session, adapter = cached_session(HTTPCache(tmp))
+        session.get(URL)
+        adapter.etag = None
+        adapter.body = b'<h1>Cream, reformulated</h1>'
+        assert session.get(URL).text == '<h1>Cream, reformulated</h1>'
+        assert session.cache.get(URL) is None and session.cache.size() == 0
+        assert 'If-None-Match' not in session.get(URL).request.headers
+        session.cache.close()
+
+def test_least_recently_used_is_evicted():
+    """Test that the cache stays within its budget by dropping the least recently used bodies"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HTTPCache(tmp, max_bytes=250)
+        for name in ('a', 'b'):
+            assert cache.store(f'https://example.com/{name}', b'x' * 100, {'ETag': f'"{name}"'})
+        assert cache.get('https://example.com/a') is not None
+        cache.store('https://example.com/c', b'x' * 100, {'ETag': '"c"'})
+        assert cache.get('https://example.com/b') is None
+        assert cache.get('https://example.com/a') is not None
+        assert cache.get('https://example.com/c') is not None
+        assert cache.size() == 200
+        assert not cache.store('https://example.com/big', b'x' * 300, {'ETag': '"big"'})
+        cache.close()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("HTTP CACHE TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Not Modified Is Served From Cache", test_not_modified_is_served_from_cache),
+        ("Not Modified Refreshes Validators", test_not_modified_refreshes_validators),
+        ("Unvalidated Response Drops Entry", test_unvalidated_response_drops_entry),
+        ("Least Recently Used Is Evicted", test_least_recently_used_is_evicted)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the compressed page archive
+Runs offline against a temporary archive directory
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+
+from page_archive import PageArchive
+
+PAGE = b"<html><body><h1>Hydrating Facial Cleanser</h1>" + b"<p>Water, Glycerin</p>" * 500 + b"</body></html>"
+
+def test_round_trip():
+    """Test that a stored page is read back by URL with its status and headers"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store('https://incidecoder.com/products/a', 200,
+                      {'Content-Type': 'text/html', 'Content-Encoding': 'gzip', 'Content-Length': '99'}, PAGE)
+        archive.store('https://incidecoder.com/products/b', 404, {}, b'missing')
+        page = archive.get('https://incidecoder.com/products/a')
+        assert page.status == 200 and page.body == PAGE
+        assert page.headers == {'Content-Type': 'text/html'}, page.headers
+        assert archive.get('https://incidecoder.com/products/b').body == b'missing'
+        assert archive.get('https://incidecoder.com/products/c') is None
+        archive.close()
+
+def test_records_are_standalone_warc():
+    """Test that each record is a gzip member holding a WARC response record"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store('https://incidecoder.com/products/a', 200, {'Content-Type': 'text/html'}, PAGE)
+        archive.close()
+        with open(os.path.join(tmp, 'pages-00001.warc.gz'), 'rb') as f:
+            record = gzip.decompress(f.read())
+        assert record.startswith(b'WARC/1.0\r\nWARC-Type: response\r\n')
+        assert b'WARC-Target-URI: https://incidecoder.com/products/a\r\n' in record
+        assert record.endswith(PAGE + b'\r\n\r\n')
+
+def test_reopen_and_rotate():
+    """Test that the latest record wins, segments rotate, and a reopened archive keeps its index"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp, segment_bytes=1000)
+        for i in range(5):
+            archive.store(f'https://a.com/p/{i}', 200, {}, PAGE + str(i).encode())
+        archive.store('https://a.com/p/0', 200, {}, b'updated')
+        archive.close()
+
+        archive = PageArchive(tmp, segment_bytes=1000)
+        assert archive.get('https://a.com/p/0').body == b'updated'
+        assert archive.get('https://a.com/p/4').body.endswith(b'4')
+        assert list(archive.urls('/p/3')) == ['https://a.com/p/3']
+        stats = archive.stats()
+        assert stats['pages'] == 5 and stats['bytes'] < len(PAGE) * 5, stats
+        assert len([name for name in os.listdir(tmp) if name.endswith('.warc.gz')]) > 1
+        archive.close()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("PAGE ARCHIVE TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Round Trip", test_round_trip),
+        ("Records Are Standalone WARC", test_records_are_standalone_warc),
+        ("Reopen And Rotate", test_reopen_and_rotate)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
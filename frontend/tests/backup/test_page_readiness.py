@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for event-driven page readiness
+Runs without a browser; a fake driver plays back the in-page scripts' results
+"""
+
+import sys
+
+from page_readiness import SCROLL_ONCE_SCRIPT, WAIT_FOR_READY_SCRIPT, scroll_until_stable, wait_until_ready
+
+class FakeDriver:
+    """Records script calls and answers async scripts from a list of results"""
+
+    def __init__(self, results=(), initial_count=0, error=None):
+        self.results = list(results)
+        self.initial_count = initial_count
+        self.error = error
+        self.calls = []
+        self.script_timeout = None
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_script(self, script, *args):
+        return self.initial_count
+
+    def execute_async_script(self, script, *args):
+        self.calls.append((script, args))
+        if self.error:
+            raise self.error
+        return self.results.pop(0)
+
+def test_wait_passes_milliseconds():
+    """Test that the wait script gets its selectors and timings in milliseconds"""
+    driver = FakeDriver([True])
+    assert wait_until_ready(driver, ['h1', '.product'], timeout=4, idle=0.25, max_settle=1.5)
+    assert driver.calls == [(WAIT_FOR_READY_SCRIPT, (['h1', '.product'], 250.0, 1500.0, 4000))]
+    assert driver.script_timeout > 4, "the script must be allowed to reach its own timeout"
+
+def test_wait_reports_missing_selector():
+    """Test that a page where no selector appeared is reported as not ready"""
+    assert not wait_until_ready(FakeDriver([False]), ['h1'])
+
+def test_wait_survives_driver_errors():
+    """Test that a driver error is reported as not ready instead of raised"""
+    assert not wait_until_ready(FakeDriver(error=TimeoutError("script timeout")), ['h1'])
+
+def test_scroll_stops_when_stable():
+    """Test that scrolling stops at the first round that adds no anchors"""
+    driver = FakeDriver([24, 48, 48, 72], initial_count=12)
+    assert scroll_until_stable(driver, 'a.product') == 48
+    assert len(driver.calls) == 3
+    assert driver.calls[0][0] == SCROLL_ONCE_SCRIPT and driver.calls[0][1][0] == 'a.product'
+
+def test_scroll_is_bounded():
+    """Test that an endless listing stops after max_rounds"""
+    driver = FakeDriver(range(10, 1000, 10))
+    assert scroll_until_stable(driver, 'a', max_rounds=4) == 40
+    assert len(driver.calls) == 4
+
+def test_scroll_keeps_count_on_error():
+    """Test that a driver error returns the anchors counted so far"""
+    driver = FakeDriver(initial_count=7, error=TimeoutError("script timeout"))
+    assert scroll_until_stable(driver, 'a') == 7
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("PAGE READINESS TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Wait Passes Milliseconds", test_wait_passes_milliseconds),
+        ("Wait Reports Missing Selector", test_wait_reports_missing_selector),
+        ("Wait Survives Driver Errors", test_wait_survives_driver_errors),
+        ("Scroll Stops When Stable", test_scroll_stops_when_stable),
+        ("Scroll Is Bounded", test_scroll_is_bounded),
+        ("Scroll Keeps Count On Error", test_scroll_keeps_count_on_error)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for listing pagination discovery
+Runs offline against a small INCIDecoder-style brand page
+"""
+
+import sys
+
+from html_parser import parse_html, listing_regions
+from pagination import fill_page_range, page_links
+
+BRAND_PAGE = """<html><body>
+<a href="/products/cerave-foaming-cleanser">Foaming Cleanser</a>
+<a href="/products/cerave-pm-lotion">PM Lotion</a>
+<div class="pager">
+  <a href="/brands/cerave?offset=1">2</a>
+  <a href="/brands/cerave?offset=2">3</a>
+  <a href="/brands/cerave?offset=5#top">6</a>
+  <a href="/brands/the-ordinary?offset=1">Other brand</a>
+  <a href="https://example.com/brands/cerave?offset=3">Elsewhere</a>
+</div>
+</body></html>"""
+
+def test_fill_page_range():
+    """Test that pages skipped by the pager are filled in using the smallest gap"""
+    urls = ['https://a.com/c?start=0', 'https://a.com/c?start=24', 'https://a.com/c?start=96']
+    assert fill_page_range(urls) == urls + ['https://a.com/c?start=48', 'https://a.com/c?start=72']
+    assert fill_page_range(['https://a.com/c?page=2']) == ['https://a.com/c?page=2']
+
+def test_page_links():
+    """Test that only pages of the same listing are returned, with the gaps filled"""
+    soup = parse_html(BRAND_PAGE, 'html.parser', listing_regions)
+    pages = page_links(soup, 'https://incidecoder.com/brands/cerave')
+    assert pages == ['https://incidecoder.com/brands/cerave?offset=%d' % n for n in (1, 2, 5, 3, 4)], pages
+
+def test_first_page_is_not_refetched():
+    """Test that pager links back to the first page are dropped, as the listing URL is that page"""
+    pager = """<div class="pager"><a href="?page=1">1</a><a href="?page=2">2</a><a href="?page=4">4</a>
+    <a href="?sort=new&page=1">1</a></div>"""
+    pages = page_links(parse_html(pager, 'html.parser'), 'https://www.ulta.com/shop/skin-care')
+    assert pages == ['https://www.ulta.com/shop/skin-care?page=%d' % n for n in (2, 4, 3)], pages
+    pager = '<a href="?offset=0">1</a><a href="?offset=1">2</a><a href="?offset=3">4</a>'
+    pages = page_links(parse_html(pager, 'html.parser'), 'https://incidecoder.com/brands/cerave')
+    assert pages == ['https://incidecoder.com/brands/cerave?offset=%d' % n for n in (1, 3, 2)], pages
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("PAGINATION TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Fill Page Range", test_fill_page_range),
+        ("Page Links", test_page_links),
+        ("First Page Is Not Refetched", test_first_page_is_not_refetched)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
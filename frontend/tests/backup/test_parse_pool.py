@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the process-pool parse stage
+Runs offline; checks that worker processes return the same records as in-process parsing
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+from parse_pool import ParsePool, _worker_context, parse_incidecoder_product, parse_ulta_product
+
+INCIDECODER_PAGE = b"""<html><body><h1>Hydrating Facial Cleanser</h1>
+<a href="/brands/cerave">CeraVe</a>
+<div id="ingredients"><a href="/ingredients/water">Water</a>, <a href="/ingredients/glycerin">Glycerin</a></div>
+</body></html>"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# A caller script without an if __name__ == '__main__' guard; its workers re-run it on import
+UNGUARDED_SCRIPT = """
+from parse_pool import ParsePool, parse_incidecoder_product
+print('run started', flush=True)
+pool = ParsePool(workers=2)
+record = pool.parse(parse_incidecoder_product, {page!r}, 'html.parser', True)
+pool.close()
+print('parsed', record['name'], 'workers', pool.workers, flush=True)
+"""
+
+ULTA_PAGE = b"""<html><body><h1>Hydro Boost Water Gel</h1>
+<span class="ProductDetail__brand">Neutrogena</span><span class="ProductPricing__price">$19.99</span>
+</body></html>"""
+
+def test_incidecoder_record():
+    """Test that a product page is reduced to a compact record"""
+    record = parse_incidecoder_product(INCIDECODER_PAGE, 'html.parser', True)
+    assert record == {'name': 'Hydrating Facial Cleanser', 'brand': 'CeraVe',
+                      'ingredientsList': 'Water, Glycerin'}, record
+    assert parse_incidecoder_product(b'<html><body></body></html>', 'html.parser', True) is None
+
+def test_pool_matches_inline():
+    """Test that worker processes and in-process parsing produce identical records"""
+    inline = ParsePool(workers=0)
+    pool = ParsePool(workers=2)
+    try:
+        for parse_fn, page in ((parse_incidecoder_product, INCIDECODER_PAGE), (parse_ulta_product, ULTA_PAGE)):
+            expected = inline.parse(parse_fn, page, 'html.parser', True)
+            assert expected and pool.parse(parse_fn, page, 'html.parser', True) == expected
+    finally:
+        pool.close()
+
+def test_pool_starts_from_busy_thread():
+    """Test that workers are not forked, so a pool started from a fetch thread while other threads
+    hold locks cannot inherit those locks"""
+    assert _worker_context().get_start_method() != 'fork'
+    held = threading.Lock()
+    held.acquire()
+    pool = ParsePool(workers=1)
+    records = []
+    fetch_thread = threading.Thread(target=lambda: records.append(
+        pool.parse(parse_incidecoder_product, INCIDECODER_PAGE, 'html.parser', True)))
+    try:
+        fetch_thread.start()
+        fetch_thread.join(60)
+        assert not fetch_thread.is_alive(), "parse pool did not start"
+        assert records and records[0]['name'] == 'Hydrating Facial Cleanser', records
+    finally:
+        held.release()
+        pool.close()
+
+def test_unguarded_script_falls_back_in_process():
+    """Test that a caller script without a main guard is not re-run by the workers, and its pages
+    are parsed in-process once the workers fail to start"""
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, 'unguarded.py')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(UNGUARDED_SCRIPT.format(page=INCIDECODER_PAGE))
+        env = dict(os.environ, PYTHONPATH=HERE)
+        result = subprocess.run([sys.executable, script], cwd=tmp, env=env, capture_output=True,
+                                text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    # Workers get as far as the pool, which stops them before they crawl or parse anything
+    lines = result.stdout.splitlines()
+    assert lines[-1] == 'parsed Hydrating Facial Cleanser workers 0' and lines.count(lines[-1]) == 1, lines
+    assert "if __name__ == '__main__'" in result.stderr
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("PARSE POOL TEST")
+    print("=" * 50)
+
+    tests = [
+        ("IncideCoder Record", test_incidecoder_record),
+        ("Pool Matches Inline", test_pool_matches_inline),
+        ("Pool Starts From Busy Thread", test_pool_starts_from_busy_thread),
+        ("Unguarded Script Falls Back In Process", test_unguarded_script_falls_back_in_process)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming scrape -> classify -> ingest pipeline
+Runs offline; sources and stages are plain Python callables
+"""
+
+import itertools
+import sys
+import threading
+import time
+
+from pipeline import StreamingPipeline, merge_streams
+
+def test_stages_run_in_order():
+    """Test that every item passes through the stages in order and dropped items are counted out"""
+    ingested = []
+    counts = StreamingPipeline(buffer_size=2).run(range(100), [
+        ('double', lambda n: n * 2),
+        ('classify', lambda n: n if n % 4 == 0 else None),
+        ('ingest', lambda n: ingested.append(n) or n),
+    ])
+    assert ingested == list(range(0, 200, 4))
+    assert counts == {'source': 100, 'double': 100, 'classify': 50, 'ingest': 50}, counts
+
+def test_stage_exception_drops_only_its_item():
+    """Test that an item whose stage raises is dropped while the rest keep flowing"""
+    def classify(n):
+        if n == 3:
+            raise ValueError("unparseable product")
+        return n
+
+    ingested = []
+    counts = StreamingPipeline(buffer_size=2).run(range(10), [
+        ('classify', classify),
+        ('ingest', lambda n: ingested.append(n) or True),
+    ])
+    assert ingested == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert counts == {'source': 10, 'classify': 9, 'ingest': 9}, counts
+
+def test_source_exception_ends_the_run():
+    """Test that a failing source ends the run with what it produced instead of hanging"""
+    def source():
+        yield from range(5)
+        raise ConnectionError("listing page gone")
+
+    ingested = []
+    counts = StreamingPipeline().run(source(), [('ingest', lambda n: ingested.append(n) or True)])
+    assert ingested == [0, 1, 2, 3, 4] and counts['source'] == 5
+
+def test_uneven_streams_are_merged():
+    """Test that long, short, empty and failing streams are all drained, each in its own order"""
+    def failing():
+        yield 'f0'
+        raise ConnectionError("site down")
+
+    finished = {}
+    merged = list(merge_streams({
+        'long': lambda: (f'l{n}' for n in range(200)),
+        'short': lambda: iter(['s0', 's1', 's2']),
+        'empty': lambda: iter([]),
+        'failing': failing,
+    }, buffer_size=4, on_done=finished.__setitem__))
+    assert sorted(merged) == sorted([f'l{n}' for n in range(200)] + ['s0', 's1', 's2', 'f0'])
+    assert [item for item in merged if item.startswith('l')] == [f'l{n}' for n in range(200)]
+    assert finished == {'long': 200, 'short': 3, 'empty': 0, 'failing': 1}, finished
+
+def test_early_stop_winds_down_streams():
+    """Test that a consumer stopping early closes the streams instead of leaving them blocked"""
+    closed = threading.Event()
+
+    def endless():
+        try:
+            for n in itertools.count():
+                yield n
+        finally:
+            closed.set()
+
+    merged = merge_streams({'endless': endless}, buffer_size=2)
+    assert list(itertools.islice(merged, 5)) == [0, 1, 2, 3, 4]
+    merged.close()
+    assert closed.wait(2), "stream was not closed"
+    deadline = time.monotonic() + 2
+    while any(thread.name == 'stream-endless' for thread in threading.enumerate()):
+        assert time.monotonic() < deadline, "stream thread still running"
+        time.sleep(0.01)
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("PIPELINE TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Stages Run In Order", test_stages_run_in_order),
+        ("Stage Exception Drops Only Its Item", test_stage_exception_drops_only_its_item),
+        ("Source Exception Ends The Run", test_source_exception_ends_the_run),
+        ("Uneven Streams Are Merged", test_uneven_streams_are_merged),
+        ("Early Stop Winds Down Streams", test_early_stop_winds_down_streams)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
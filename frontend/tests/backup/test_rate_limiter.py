@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-host token-bucket rate limiter
+Runs offline: no API, database or network access needed
+"""
+
+import sys
+import threading
+
+from rate_limiter import HostRateLimiter, TokenBucket, host_key, parse_host_rate
+
+def test_burst_is_immediate():
+    """Test that a full bucket serves its burst without waiting"""
+    bucket = TokenBucket(rate=1.0, burst=3)
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == [0.0, 0.0, 0.0], waits
+    assert bucket.reserve() > 0.9
+
+def test_concurrent_callers_share_rate():
+    """Test that concurrent callers each get a distinct slot at exactly the configured rate"""
+    # A stopped clock makes the reservations independent of how fast the threads are scheduled
+    bucket = TokenBucket(rate=20.0, burst=1, clock=lambda: 100.0)
+    waits = []
+    lock = threading.Lock()
+
+    def reserve():
+        wait = bucket.reserve()
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=reserve) for _ in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 1 token up front, then 10 more at 20/s
+    assert [round(wait, 6) for wait in sorted(waits)] == [i / 20 for i in range(11)], sorted(waits)
+
+def test_hosts_are_independent():
+    """Test that each host gets its own bucket and subdomains share their parent's"""
+    limiter = HostRateLimiter()
+    assert limiter.bucket_for('https://www.sephora.com/a') is limiter.bucket_for('https://sephora.com/b')
+    assert limiter.bucket_for('https://sephora.com/a') is not limiter.bucket_for('https://www.ulta.com/a')
+    assert limiter.bucket_for('https://m.sephora.com/a').rate == 0.5
+
+def test_parse_host_rate():
+    """Test parsing of --rate-limit values"""
+    assert parse_host_rate('www.ulta.com=0.25:4') == ('ulta.com', (0.25, 4))
+    assert parse_host_rate('incidecoder.com=2') == ('incidecoder.com', (2.0, 1))
+    assert host_key('http://localhost:8080/api') == 'localhost'
+    try:
+        parse_host_rate('incidecoder.com')
+    except ValueError:
+        return
+    raise AssertionError("a value without a rate was accepted")
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("RATE LIMITER TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Burst Is Immediate", test_burst_is_immediate),
+        ("Concurrent Callers Share Rate", test_concurrent_callers_share_rate),
+        ("Hosts Are Independent", test_hosts_are_independent),
+        ("Parse Host Rate", test_parse_host_rate)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
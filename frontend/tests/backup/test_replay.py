@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for offline replay of archived pages
+Runs offline; the session's network adapter fails any request that reaches it
+"""
+
+import sys
+import tempfile
+
+from requests.adapters import BaseAdapter
+
+from crawl_metrics import CrawlMetrics
+from page_archive import PageArchive
+from parse_pool import parse_incidecoder_product
+from scraper_session import ReplayError, ScraperSession
+from skincare_scraper import SkincareScraper
+
+PRODUCT_URL = 'https://incidecoder.com/products/hydrating-facial-cleanser'
+
+PAGE = b"""<html><body><h1>Hydrating Facial Cleanser</h1>
+<a href="/brands/cerave">CeraVe</a>
+<div id="ingredients"><a href="/ingredients/water">Water</a>, <a href="/ingredients/glycerin">Glycerin</a></div>
+</body></html>"""
+
+class OfflineAdapter(BaseAdapter):
+    """Adapter that fails every request, standing in for a machine without network access"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        raise AssertionError(f"request reached the network: {request.url}")
+
+    def close(self):
+        pass
+
+def replay_session(archive: PageArchive, metrics=None):
+    session = ScraperSession(replay=archive, metrics=metrics)
+    adapter = OfflineAdapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session, adapter
+
+def test_archived_page_is_replayed():
+    """Test that a GET is answered from the archive with the stored status, headers and body"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store(PRODUCT_URL, 200, {'Content-Type': 'text/html; charset=utf-8'}, PAGE)
+        session, adapter = replay_session(archive)
+        response = session.get(PRODUCT_URL)
+        assert response.status_code == 200 and response.reason == 'OK'
+        assert response.content == PAGE and response.encoding == 'utf-8'
+        assert response.headers['content-type'] == 'text/html; charset=utf-8'
+        assert response.from_archive
+        assert adapter.sent == 0
+        archive.close()
+
+def test_missing_page_is_404():
+    """Test that a page the archive does not hold is a 404 rather than a fetch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        metrics = CrawlMetrics()
+        session, adapter = replay_session(archive, metrics)
+        response = session.get('https://incidecoder.com/products/unknown')
+        assert response.status_code == 404 and not response.ok
+        assert adapter.sent == 0
+        assert metrics.counters['replay_misses'] == 1, metrics.counters
+        archive.close()
+
+def test_replayed_page_parses():
+    """Test that a replayed page goes through the product parser like a fetched one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store(PRODUCT_URL, 200, {'Content-Type': 'text/html'}, PAGE)
+        archive.store('https://www.sephora.com/product/serum-P1', 200, {'Content-Type': 'text/html'}, PAGE)
+        session, _ = replay_session(archive)
+        urls = list(archive.urls('/products/'))
+        assert urls == [PRODUCT_URL], urls
+        record = parse_incidecoder_product(session.get(urls[0]).content, 'html.parser', True)
+        assert record == {'name': 'Hydrating Facial Cleanser', 'brand': 'CeraVe',
+                          'ingredientsList': 'Water, Glycerin'}, record
+        archive.close()
+
+def test_replay_sends_nothing():
+    """Test that a replay session refuses every request that is not a GET"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        session, adapter = replay_session(archive)
+        for method in ('POST', 'PUT', 'HEAD'):
+            try:
+                session.request(method, 'http://localhost:8080/api/products', json={'name': 'Serum'})
+                raise AssertionError(f"expected {method} to be refused")
+            except ReplayError:
+                pass
+        assert adapter.sent == 0
+        archive.close()
+
+def test_replay_run_does_not_ingest():
+    """Test that a replay run parses the archive without sending products to the backend"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store(PRODUCT_URL, 200, {'Content-Type': 'text/html'}, PAGE)
+        archive.close()
+        scraper = SkincareScraper(replay_dir=tmp, parse_workers=0)
+        adapter = OfflineAdapter()
+        scraper.session.mount('http://', adapter)
+        scraper.session.mount('https://', adapter)
+        ingested = []
+        scraper.add_product_via_api = ingested.append
+        scraper.run_scraper(sources=['incidecoder'])
+        assert adapter.sent == 0 and ingested == []
+        assert scraper.metrics.counters['replay_hits'] == 1, scraper.metrics.counters
+        try:
+            scraper.run_scraper(sources=['incidecoder'], method='api')
+            raise AssertionError("expected a replay with method 'api' to be rejected")
+        except ValueError:
+            pass
+        scraper.replay.close()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("REPLAY TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Archived Page Is Replayed", test_archived_page_is_replayed),
+        ("Missing Page Is 404", test_missing_page_is_404),
+        ("Replayed Page Parses", test_replayed_page_parses),
+        ("Replay Sends Nothing", test_replay_sends_nothing),
+        ("Replay Run Does Not Ingest", test_replay_run_does_not_ingest)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
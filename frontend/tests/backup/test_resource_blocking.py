@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for headless Chrome resource blocking
+Runs without a browser; a fake driver records the DevTools commands it is sent
+"""
+
+import sys
+
+from resource_blocking import DEFAULT_BLOCKED_DOMAINS, ResourceBlocker, page_weight
+
+class FakeDriver:
+    """Records DevTools commands and answers execute_script with `result` or `error`"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+    def execute_script(self, script, *args):
+        if self.error:
+            raise self.error
+        return self.result
+
+def test_default_url_patterns():
+    """Test that images, fonts, media and trackers are blocked, with and without query strings"""
+    patterns = ResourceBlocker().url_patterns()
+    for pattern in ('*.png', '*.png?*', '*.woff2', '*.woff2?*', '*.mp4', '*://doubleclick.net/*',
+                    '*://*.doubleclick.net/*'):
+        assert pattern in patterns, pattern
+    assert '*.css' not in patterns, "stylesheets are needed for layout and stay allowed by default"
+    assert len(patterns) == len(set(patterns))
+
+def test_custom_types_and_domains():
+    """Test that blocked types and domains can be chosen and allowed domains are taken out"""
+    blocker = ResourceBlocker(blocked_types=['stylesheet'], allowed_domains=['bazaarvoice.com'])
+    patterns = blocker.url_patterns()
+    assert '*.css' in patterns and '*.png' not in patterns
+    assert '*://bazaarvoice.com/*' not in patterns and '*://*.bazaarvoice.com/*' not in patterns
+    assert len(blocker.blocked_domains) == len(DEFAULT_BLOCKED_DOMAINS) - 1
+    assert ResourceBlocker(blocked_types=[], blocked_domains=[]).url_patterns() == []
+
+def test_unknown_type_is_rejected():
+    """Test that a misspelled resource type fails loudly"""
+    try:
+        ResourceBlocker(blocked_types=['images'])
+    except ValueError:
+        return
+    raise AssertionError("expected an unknown resource type to be rejected")
+
+def test_chrome_prefs():
+    """Test that images are also switched off in Chrome's content settings"""
+    assert ResourceBlocker().chrome_prefs() == {'profile.managed_default_content_settings.images': 2}
+    assert ResourceBlocker(blocked_types=['font']).chrome_prefs() == {}
+
+def test_apply_sends_block_list():
+    """Test that the block list is installed through the DevTools protocol"""
+    blocker = ResourceBlocker()
+    driver = FakeDriver()
+    blocker.apply(driver)
+    assert driver.commands == [('Network.enable', {}),
+                               ('Network.setBlockedURLs', {'urls': blocker.url_patterns()})]
+
+def test_page_weight():
+    """Test that page weight is read from the page and is empty when it cannot be"""
+    weight = {'bytes': 51200, 'resources': 12, 'loadMs': 840.5}
+    assert page_weight(FakeDriver(weight)) == weight
+    assert page_weight(FakeDriver(error=RuntimeError("no such window"))) == {}
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("RESOURCE BLOCKING TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Default URL Patterns", test_default_url_patterns),
+        ("Custom Types And Domains", test_custom_types_and_domains),
+        ("Unknown Type Is Rejected", test_unknown_type_is_rejected),
+        ("Chrome Prefs", test_chrome_prefs),
+        ("Apply Sends Block List", test_apply_sends_block_list),
+        ("Page Weight", test_page_weight)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for sitemap discovery and bulk frontier seeding
+Runs offline against in-memory sitemaps and a temporary frontier database
+"""
+
+import gzip
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+
+from crawl_frontier import CrawlFrontier
+from sitemap import iter_sitemap, parse_lastmod
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://incidecoder.com/sitemap-products-1.xml.gz</loc><lastmod>2024-05-01</lastmod></sitemap>
+</sitemapindex>"""
+
+URL_SET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://incidecoder.com/products/cerave-pm-lotion</loc><lastmod>2024-05-01T10:00:00+00:00</lastmod></url>
+  <url><loc>https://incidecoder.com/products/the-ordinary-niacinamide</loc></url>
+  <url><loc>https://incidecoder.com/ingredients/glycerin</loc><lastmod>2024-04-01</lastmod></url>
+</urlset>"""
+
+def test_parse_lastmod():
+    """Test that date-only and full W3C datetimes are read as UTC timestamps"""
+    assert parse_lastmod('2024-05-01') == parse_lastmod('2024-05-01T00:00:00Z') == 1714521600.0
+    assert parse_lastmod('not a date') is None and parse_lastmod(None) is None
+
+def test_iter_sitemap():
+    """Test that index and URL set entries stream out with their lastmod, gzipped or not"""
+    assert list(iter_sitemap(io.BytesIO(SITEMAP_INDEX))) == [
+        ('sitemap', 'https://incidecoder.com/sitemap-products-1.xml.gz', 1714521600.0)]
+    entries = list(iter_sitemap(gzip.GzipFile(fileobj=io.BytesIO(gzip.compress(URL_SET)))))
+    assert [loc for _, loc, _ in entries if re.search(r'/products/', loc)] == [
+        'https://incidecoder.com/products/cerave-pm-lotion', 'https://incidecoder.com/products/the-ordinary-niacinamide']
+    assert entries[0][2] == 1714557600.0 and entries[1][2] is None
+
+def test_seed_schedules_changed_only():
+    """Test that seeding returns new URLs, then only those modified since their last fetch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        frontier = CrawlFrontier(os.path.join(tmp, 'frontier.sqlite'))
+        old, recent = time.time() - 86400 * 30, time.time() + 60
+        entries = [('https://a.com/p/1', old), ('https://a.com/p/2', old), ('https://a.com/p/3', None)]
+        assert frontier.seed(entries, 'a', batch_size=2) == ['https://a.com/p/1', 'https://a.com/p/2',
+                                                             'https://a.com/p/3']
+        for url, _ in entries:
+            frontier.mark_scraped(url, f'digest-{url}')
+            frontier.mark_ingested(f'digest-{url}')
+        assert frontier.seed(entries, 'a') == []
+        assert frontier.seed([('https://a.com/p/1', old), ('https://a.com/p/2', recent),
+                              ('https://a.com/p/4', None)], 'a') == ['https://a.com/p/4', 'https://a.com/p/2']
+        frontier.close()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("SITEMAP TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Parse Lastmod", test_parse_lastmod),
+        ("Iter Sitemap", test_iter_sitemap),
+        ("Seed Schedules Changed Only", test_seed_schedules_changed_only)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for source plugins and concurrent per-source crawling
+Runs offline against stub sources and sessions
+"""
+
+import sys
+import threading
+import time
+
+from pipeline import merge_streams
+from sources import ProductSource, SourceRegistry
+
+class StubResponse:
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+
+class StubScraper:
+    """Stands in for a scraper; its session serves pages from a dict"""
+
+    def __init__(self, pages):
+        self.session = self
+        self.pages = pages
+
+    def get(self, url):
+        if url not in self.pages:
+            return StubResponse(404, b'')
+        return StubResponse(200, self.pages[url])
+
+def test_registry():
+    """Test that sources register by name, in order, and are bound to the scraper they are created for"""
+    registry = SourceRegistry()
+
+    @registry.register
+    class First(ProductSource):
+        name = 'first'
+
+    @registry.register
+    class Second(ProductSource):
+        name = 'second'
+
+    assert registry.names() == ['first', 'second']
+    assert 'first' in registry and 'third' not in registry
+    scraper = StubScraper({})
+    sources = registry.create(scraper)
+    assert isinstance(sources['second'], Second) and sources['second'].scraper is scraper
+    try:
+        registry.register(type('Nameless', (ProductSource,), {}))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a source without a name was registered")
+
+def test_scrape_fetches_then_parses():
+    """Test that the default scrape parses fetched pages and skips missing ones"""
+    class Upper(ProductSource):
+        name = 'upper'
+
+        def parse(self, url, markup):
+            return {'name': markup.decode().upper()}
+
+    source = Upper(StubScraper({'https://a.com/product/1': b'serum'}))
+    assert source.scrape('https://a.com/product/1') == {'name': 'SERUM'}
+    assert source.scrape('https://a.com/product/2') is None
+
+def test_streams_run_concurrently():
+    """Test that merged streams take about as long as the slowest, not the sum"""
+    def slow_stream(name, items, delay):
+        def stream():
+            for i in range(items):
+                time.sleep(delay)
+                yield f'{name}-{i}'
+        return stream
+
+    done = {}
+    started = time.monotonic()
+    items = list(merge_streams({
+        'a': slow_stream('a', 5, 0.1),
+        'b': slow_stream('b', 5, 0.1),
+        'c': slow_stream('c', 3, 0.1),
+    }, on_done=lambda name, count: done.setdefault(name, count)))
+    elapsed = time.monotonic() - started
+    assert sorted(items) == sorted([f'a-{i}' for i in range(5)] + [f'b-{i}' for i in range(5)] +
+                                   [f'c-{i}' for i in range(3)]), items
+    assert done == {'a': 5, 'b': 5, 'c': 3}, done
+    assert elapsed < 1.0, f"took {elapsed:.2f}s, sequential would be 1.3s"
+
+def test_failing_stream_does_not_stop_others():
+    """Test that a stream raising an error ends on its own while the others complete"""
+    def broken():
+        yield 'x'
+        raise RuntimeError("listing page changed")
+
+    done = {}
+    items = list(merge_streams({'broken': broken, 'ok': lambda: iter(['y', 'z'])},
+                               on_done=lambda name, count: done.setdefault(name, count)))
+    assert sorted(items) == ['x', 'y', 'z'], items
+    assert done == {'broken': 1, 'ok': 2}, done
+
+def test_consumer_stops_early():
+    """Test that stopping the merged iterator winds every stream down"""
+    finished = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                yield 1
+        finally:
+            finished.set()
+
+    merged = merge_streams({'endless': endless}, buffer_size=2)
+    assert next(merged) == 1
+    merged.close()
+    assert finished.wait(2), "stream kept running after the consumer stopped"
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("SOURCES TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Registry", test_registry),
+        ("Scrape Fetches Then Parses", test_scrape_fetches_then_parses),
+        ("Streams Run Concurrently", test_streams_run_concurrently),
+        ("Failing Stream Does Not Stop Others", test_failing_stream_does_not_stop_others),
+        ("Consumer Stops Early", test_consumer_stops_early)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
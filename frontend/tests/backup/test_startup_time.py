@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the scraper modules and CLIs
+Checks that heavy optional dependencies stay unloaded until first use and that --help works.
+Wall-clock budgets for imports and --help depend on the machine, so they are only enforced
+with STARTUP_BUDGETS=1 (e.g. on the cron host); otherwise the timings are just printed
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Loaded only when a browser, random User-Agent or direct database insert is needed
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'fake_useragent', 'mysql')
+
+IMPORT_BUDGET_SECONDS = 1.0
+CLI_BUDGET_SECONDS = 1.5
+ENFORCE_BUDGETS = os.environ.get('STARTUP_BUDGETS') == '1'
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))
+print(elapsed, ','.join(loaded))
+"""
+
+def measure_import(module):
+    """Import a module in a fresh interpreter; returns (seconds, heavy modules it loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(' ')
+    return float(elapsed), [name for name in loaded.split(',') if name]
+
+def measure_cli(script):
+    """Wall time of `python script --help` in a fresh interpreter"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script, '--help'], cwd=HERE, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def test_imports_are_lazy():
+    """Test that importing the scrapers does not load heavy dependencies"""
+    for module in ('skincare_scraper', 'enhanced_scraper', 'example_usage'):
+        elapsed, loaded = measure_import(module)
+        print(f"  import {module}: {elapsed * 1000:.0f} ms")
+        assert not loaded, f"{module} loaded {loaded} at import"
+        if ENFORCE_BUDGETS:
+            assert elapsed < IMPORT_BUDGET_SECONDS, f"{module} took {elapsed:.2f}s to import"
+
+def test_cli_startup():
+    """Test that the scraper CLIs answer --help (within budget with STARTUP_BUDGETS=1)"""
+    for script in ('skincare_scraper.py', 'enhanced_scraper.py'):
+        elapsed = measure_cli(script)
+        print(f"  {script} --help: {elapsed * 1000:.0f} ms")
+        if ENFORCE_BUDGETS:
+            assert elapsed < CLI_BUDGET_SECONDS, f"{script} --help took {elapsed:.2f}s"
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("STARTUP TIME TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Imports Are Lazy", test_imports_are_lazy),
+        ("CLI Startup", test_cli_startup)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except (AssertionError, subprocess.CalledProcessError) as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled transport layer
+Runs against a local keep-alive HTTP server, no network access needed
+"""
+
+import http.server
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from transport import configure_transport, connection_stats, parse_pool_size
+
+class KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+def test_parse_pool_size():
+    """Test that HOST=SIZE values are parsed and hosts normalized"""
+    assert parse_pool_size('www.Sephora.com=4') == ('sephora.com', 4)
+    for bad in ('sephora.com', 'sephora.com=0', '=3'):
+        try:
+            parse_pool_size(bad)
+            assert False, f"expected {bad!r} to be rejected"
+        except ValueError:
+            pass
+
+def test_connections_are_reused():
+    """Test that concurrent requests share a bounded set of keep-alive connections"""
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = requests.Session()
+        configure_transport(session, pool_size=4)
+        url = f'http://127.0.0.1:{server.server_address[1]}/'
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(executor.map(lambda _: session.get(url).text, range(40)))
+        assert bodies == ['ok'] * 40
+        stats = connection_stats(session)
+        assert stats['requests_sent'] == 40 and stats['connections_opened'] <= 4, stats
+        assert stats['connections_reused'] >= 36, stats
+    finally:
+        server.shutdown()
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("TRANSPORT TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Parse Pool Size", test_parse_pool_size),
+        ("Connections Are Reused", test_connections_are_reused)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for URL canonicalization and the run-wide seen-set
+Runs offline, no network access needed
+"""
+
+import sys
+
+from url_dedup import BloomFilter, SeenSet, canonicalize_url, dedupe_urls
+
+def test_canonicalize():
+    """Test that query strings, fragments, trailing slashes and host case are normalized"""
+    assert canonicalize_url('https://WWW.Sephora.com/product/water-cream-P123/?skuId=1#reviews') == \
+        'https://www.sephora.com/product/water-cream-P123'
+    assert canonicalize_url('https://incidecoder.com:443/products/a') == 'https://incidecoder.com/products/a'
+    assert canonicalize_url('http://localhost:8080/') == 'http://localhost:8080/'
+
+def test_dedupe_keeps_order():
+    """Test that repeated links on one page collapse to their first occurrence"""
+    urls = ['https://a.com/p/1?ref=img', 'https://a.com/p/2', 'https://a.com/p/1/', 'https://a.com/p/3#x']
+    assert dedupe_urls(urls) == ['https://a.com/p/1', 'https://a.com/p/2', 'https://a.com/p/3']
+
+def test_seen_set_across_sources():
+    """Test that a URL claimed once is never handed out again, before and after the Bloom switch"""
+    seen = SeenSet(exact_limit=3, capacity=1000, error_rate=0.001)
+    assert seen.claim(['https://a.com/p/1', 'https://a.com/p/2', 'https://a.com/p/1?x=1']) == \
+        ['https://a.com/p/1', 'https://a.com/p/2']
+    assert seen.claim([f'https://a.com/p/{i}' for i in range(1, 6)]) == \
+        ['https://a.com/p/3', 'https://a.com/p/4', 'https://a.com/p/5']
+    assert seen.claim(['https://a.com/p/4/', 'https://a.com/p/2#top']) == []
+    assert len(seen) == 5, "the count must survive the switch to the Bloom filter"
+
+def test_bloom_false_positive_rate():
+    """Test that the Bloom filter stays near its configured error rate at capacity"""
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    for i in range(10000):
+        bloom.add(f'https://a.com/p/{i}')
+    assert all(f'https://a.com/p/{i}' in bloom for i in range(10000))
+    false_positives = sum(f'https://b.com/p/{i}' in bloom for i in range(10000))
+    assert false_positives < 200, false_positives
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("URL DEDUP TEST")
+    print("=" * 50)
+
+    tests = [
+        ("Canonicalize", test_canonicalize),
+        ("Dedupe Keeps Order", test_dedupe_keeps_order),
+        ("Seen Set Across Sources", test_seen_set_across_sources),
+        ("Bloom False Positive Rate", test_bloom_false_positive_rate)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            print(f"✗ {test_name}: {e}")
+            result = False
+        print(f"{test_name}: {'✓ PASS' if result else '✗ FAIL'}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
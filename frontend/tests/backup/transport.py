@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Connection pooling and content decoding for the scraper session
+Mounts keep-alive connection pools sized for the crawl's concurrency (optionally per host),
+advertises brotli when a decoder is installed, and counts how often connections were reused
+"""
+
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import host_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+# Host pools kept open at once; more hosts than this evicts (and closes) the least recently used
+DEFAULT_POOL_HOSTS = 32
+
+
+def brotli_available() -> bool:
+    """Whether urllib3 can decode brotli responses (needs the brotli or brotlicffi package)"""
+    return any(importlib.util.find_spec(name) for name in ('brotli', 'brotlicffi'))
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding for the encodings the session can actually decode"""
+    return 'gzip, deflate, br' if brotli_available() else 'gzip, deflate'
+
+
+def parse_pool_size(spec: str):
+    """Parse a HOST=SIZE command line value"""
+    host, sep, size = spec.partition('=')
+    if not sep or not host or not size.isdigit() or int(size) < 1:
+        raise ValueError(f"Invalid pool size '{spec}', expected HOST=SIZE")
+    return host_key(host), int(size)
+
+
+def configure_transport(session, pool_size: int = DEFAULT_POOL_SIZE,
+                        host_pool_sizes: Optional[Dict[str, int]] = None,
+                        pool_hosts: int = DEFAULT_POOL_HOSTS) -> None:
+    """Mount connection pools on a session: `pool_size` keep-alive connections per host, or the
+    size given for a host in `host_pool_sizes`. Requests wait for a free connection instead of
+    opening throwaway ones, so every request reuses a warm connection once the pool is full."""
+    default = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, pool_block=True)
+    session.mount('https://', default)
+    session.mount('http://', default)
+    for host, size in (host_pool_sizes or {}).items():
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size, pool_block=True)
+        for scheme in ('https', 'http'):
+            for prefix in ('', 'www.'):
+                session.mount(f'{scheme}://{prefix}{host}/', adapter)
+    session.headers['Accept-Encoding'] = accept_encoding()
+    session.headers['Connection'] = 'keep-alive'
+
+
+def connection_stats(session) -> Dict[str, int]:
+    """Requests sent, new connections (handshakes) opened and connection reuses so far"""
+    opened = sent = 0
+    for adapter in set(session.adapters.values()):
+        pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+        if pools is None:
+            continue
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+    return {'requests_sent': sent, 'connections_opened': opened, 'connections_reused': max(0, sent - opened)}
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+URL canonicalization and de-duplication for discovered product links
+Listing pages link the same product several times (image link, title link, tracking variants);
+canonical URLs plus a run-wide seen-set make sure each product is fetched once per run
+"""
+
+import hashlib
+import math
+import threading
+from typing import Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Lowercase scheme and host, drop default ports, query string, fragment and trailing slash"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, '', ''))
+
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """Canonicalize URLs and drop repeats, keeping first-seen order"""
+    return list(dict.fromkeys(canonicalize_url(url) for url in urls))
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, about `error_rate` false positives at capacity"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns whether it was (probably) not present before"""
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class SeenSet:
+    """Thread-safe set of canonical URLs already scheduled in this run. Exact up to `exact_limit`
+    URLs, then folded into a Bloom filter so memory stays flat on large crawls."""
+
+    def __init__(self, exact_limit: int = 100_000, capacity: int = 5_000_000, error_rate: float = 0.0001):
+        self.exact_limit = exact_limit
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._exact = set()
+        self._bloom = None
+        # Counted separately, since the Bloom filter cannot tell how many URLs it holds
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def add(self, url: str) -> bool:
+        """Record a URL; returns True the first time its canonical form is seen"""
+        key = canonicalize_url(url)
+        with self._lock:
+            if self._bloom is not None:
+                added = self._bloom.add(key)
+                self._count += added
+                return added
+            if key in self._exact:
+                return False
+            self._exact.add(key)
+            self._count += 1
+            if len(self._exact) > self.exact_limit:
+                self._bloom = BloomFilter(self.capacity, self.error_rate)
+                for seen in self._exact:
+                    self._bloom.add(seen)
+                self._exact = set()
+            return True
+
+    def claim(self, urls: Iterable[str]) -> List[str]:
+        """Canonical forms of the URLs not seen before, recording them as seen"""
+        return [canonicalize_url(url) for url in urls if self.add(url)]
+
+    def __len__(self) -> int:
+        """URLs recorded so far; after the Bloom switch, false positives are not counted"""
+        return self._count